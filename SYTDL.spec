@@ -6,7 +6,9 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('settings.json', '.'), ('download_history.json', '.')],
-    hiddenimports=[],
+    # Imported lazily by main.py, so PyInstaller's import scan can't see them
+    hiddenimports=['pytubefix', 'pytubefix.innertube', 'pytube', 'youtubesearchpython',
+                   'requests', 'humanize', 'numpy'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
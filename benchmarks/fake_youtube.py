@@ -0,0 +1,240 @@
+"""Fake metadata layer: synthetic player responses that point at the local stream server.
+
+The responses are written in StreamManifestCache's on-disk format, so the
+real VideoDownloader, ManifestPrefetcher and SmartQueueManager resolve them
+with their normal code paths and then download from the local server.
+Only the player response is faked; stream selection, range requests and
+progress callbacks are pytubefix's own.
+
+respond() answers player, search and playlist page requests with the same
+synthetic data, for building replay fixtures without network access.
+"""
+import json
+import os
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+# A client that does not need the JS player, so no signature deciphering is involved
+CLIENT = 'ANDROID_VR'
+
+
+def video_id(index: int) -> str:
+    """A valid-looking 11 character video ID, unique per index"""
+    return f"bench{index:06d}"[:11]
+
+
+def stream_url(base_url: str, name: str, size: int, latency_ms: float = 0, rate: float = 0,
+               error_rate: float = 0, error_codes: str = '429,503', seed: int = 0) -> str:
+    params = {'size': size, 'latency_ms': latency_ms, 'rate': rate, 'seed': seed}
+    if error_rate:
+        params.update(error_rate=error_rate, error_codes=error_codes)
+    return f"{base_url}/stream/{name}?{urlencode(params)}"
+
+
+def player_response(vid: str, base_url: str, title: str = None, length_seconds: int = 600,
+                    progressive_size: int = 20 * 1024 * 1024, video_size: int = 40 * 1024 * 1024,
+                    audio_size: int = 8 * 1024 * 1024, **server_options) -> Dict:
+    """Player response with one progressive 720p, one adaptive 1080p video and one audio stream"""
+    common = {
+        'lastModified': '1700000000000000',
+        'approxDurationMs': str(length_seconds * 1000),
+        'xtags': ''
+    }
+
+    def url(name, size):
+        return stream_url(base_url, f"{vid}-{name}", size, **server_options)
+
+    return {
+        'playabilityStatus': {'status': 'OK'},
+        'videoDetails': {
+            'videoId': vid,
+            'title': title or f"Benchmark video {vid}",
+            'lengthSeconds': str(length_seconds),
+            'author': 'SYTDL benchmarks',
+            'channelId': 'UCbenchmark',
+            'shortDescription': '',
+            'viewCount': '0',
+            'keywords': [],
+            'thumbnail': {'thumbnails': [{'url': f"{base_url}/thumb/{vid}.jpg", 'width': 120, 'height': 90}]}
+        },
+        'playerConfig': {
+            'mediaCommonConfig': {
+                'mediaUstreamerRequestConfig': {'videoPlaybackUstreamerConfig': ''}
+            }
+        },
+        'streamingData': {
+            'expiresInSeconds': '21540',
+            'formats': [{
+                **common,
+                'itag': 22,
+                'url': url('progressive-video', progressive_size),
+                'mimeType': 'video/mp4; codecs="avc1.64001F, mp4a.40.2"',
+                'bitrate': 2000000,
+                'width': 1280,
+                'height': 720,
+                'contentLength': str(progressive_size),
+                'quality': 'hd720',
+                'qualityLabel': '720p',
+                'fps': 30,
+                'audioQuality': 'AUDIO_QUALITY_MEDIUM',
+                'audioSampleRate': '44100',
+                'audioChannels': 2
+            }],
+            'adaptiveFormats': [{
+                **common,
+                'itag': 137,
+                'url': url('adaptive-video', video_size),
+                'mimeType': 'video/mp4; codecs="avc1.640028"',
+                'bitrate': 4000000,
+                'width': 1920,
+                'height': 1080,
+                'contentLength': str(video_size),
+                'quality': 'hd1080',
+                'qualityLabel': '1080p',
+                'fps': 30
+            }, {
+                **common,
+                'itag': 140,
+                'url': url('adaptive-audio', audio_size),
+                'mimeType': 'audio/mp4; codecs="mp4a.40.2"',
+                'bitrate': 130000,
+                'contentLength': str(audio_size),
+                'quality': 'tiny',
+                'audioQuality': 'AUDIO_QUALITY_MEDIUM',
+                'audioSampleRate': '44100',
+                'audioChannels': 2,
+                'averageBitrate': 128000
+            }]
+        }
+    }
+
+
+def seed_manifest_cache(cache_directory: str, responses: List[Dict], ttl_seconds: float = 3600):
+    """Write responses where StreamManifestCache looks for them on a cold start"""
+    os.makedirs(os.path.join(cache_directory, 'players'), exist_ok=True)
+    for response in responses:
+        entry = {
+            'client': CLIENT,
+            'vid_info': response,
+            'js_url': None,
+            'expires_at': time.time() + ttl_seconds
+        }
+        path = os.path.join(cache_directory, f"{response['videoDetails']['videoId']}.json")
+        with open(path, 'w') as f:
+            json.dump(entry, f)
+
+
+def watch_url(vid: str) -> str:
+    return f"https://www.youtube.com/watch?v={vid}"
+
+
+def build_catalog(base_url: str, count: int, cache_directory: Optional[str] = None,
+                  **response_options) -> List[str]:
+    """Create count synthetic videos, seed them into the cache and return their watch URLs"""
+    responses = [player_response(video_id(index), base_url, **response_options) for index in range(count)]
+    if cache_directory:
+        seed_manifest_cache(cache_directory, responses)
+    return [watch_url(response['videoDetails']['videoId']) for response in responses]
+
+
+def search_result(index: int, base_url: str, query: str = 'benchmark') -> Dict:
+    """A result as YouTubeSearchManager._parse_results returns it, before normalization"""
+    vid = video_id(index)
+    minutes, seconds = divmod(60 + index * 37 % 3600, 60)
+    return {
+        'title': f"{query.title()} result {index}",
+        'url': watch_url(vid),
+        'video_id': vid,
+        'duration': f"{minutes}:{seconds:02d}",
+        'views': f"{(index * 7919) % 5000000:,} views",
+        'thumbnail_url': f"{base_url}/thumb/{vid}.jpg",
+        'channel': f"Channel {index % 40}",
+        'publish_date': f"{index % 11 + 1} days ago"
+    }
+
+
+def playlist_entry(index: int, base_url: str, playlist_title: str = 'Benchmark playlist') -> Dict:
+    """An entry as PlaylistDownloader._resolve_video returns it"""
+    vid = video_id(index)
+    length = 60 + index * 37 % 3600
+    return {
+        'url': watch_url(vid),
+        'video_id': vid,
+        'title': f"{playlist_title} #{index + 1}",
+        'channel': f"Channel {index % 40}",
+        'duration': str(timedelta(seconds=length)),
+        'length': length,
+        'thumbnail_url': f"{base_url}/thumb/{vid}.jpg",
+        'playlist_index': index,
+        'playlist_title': playlist_title
+    }
+
+
+def search_response(query: str, base_url: str, page: int, per_page: int = 20, pages: int = 3) -> Dict:
+    """Innertube search response for one page, as VideosSearch parses it"""
+    videos = []
+    for index in range(page * per_page, (page + 1) * per_page):
+        result = search_result(index, base_url, query)
+        videos.append({'videoRenderer': {
+            'videoId': result['video_id'],
+            'title': {'runs': [{'text': result['title']}]},
+            'publishedTimeText': {'simpleText': result['publish_date']},
+            'lengthText': {'simpleText': result['duration']},
+            'viewCountText': {'simpleText': result['views']},
+            'thumbnail': {'thumbnails': [{'url': result['thumbnail_url'], 'width': 360, 'height': 202}]},
+            'ownerText': {'runs': [{'text': result['channel'], 'navigationEndpoint': {
+                'browseEndpoint': {'browseId': f"UCbench{index % 40:02d}"}
+            }}]}
+        }})
+    sections = [{'itemSectionRenderer': {'contents': videos}}]
+    if page + 1 < pages:
+        sections.append({'continuationItemRenderer': {'continuationEndpoint': {
+            'continuationCommand': {'token': f"{query}:{page + 1}"}
+        }}})
+    if page == 0:
+        return {'contents': {'twoColumnSearchResultsRenderer': {'primaryContents': {
+            'sectionListRenderer': {'contents': sections}
+        }}}}
+    return {'onResponseReceivedCommands': [{'appendContinuationItemsAction': {'continuationItems': sections}}]}
+
+
+def playlist_page(list_id: str, count: int, title: str = 'Benchmark playlist') -> str:
+    """Playlist page HTML carrying ytInitialData with count entries, as Playlist parses it"""
+    initial_data = {
+        'contents': {'twoColumnBrowseResultsRenderer': {'tabs': [{'tabRenderer': {'content': {
+            'sectionListRenderer': {'contents': [{'itemSectionRenderer': {'contents': [{
+                'playlistVideoListRenderer': {'contents': [
+                    {'playlistVideoRenderer': {'videoId': video_id(index)}} for index in range(count)
+                ]}
+            }]}}]}
+        }}}]}},
+        'sidebar': {'playlistSidebarRenderer': {'items': [{'playlistSidebarPrimaryInfoRenderer': {
+            'title': {'runs': [{'text': title}]}
+        }}]}}
+    }
+    return f"<html><script>var ytInitialData = {json.dumps(initial_data)};</script></html>"
+
+
+def respond(base_url: str, playlist_size: int = 12):
+    """An answer(method, url, body) for replay.Recorder that serves the responses above instead of YouTube"""
+    def answer(method: str, url: str, body: Optional[bytes]):
+        parts = urlparse(url)
+        request = json.loads(body) if body else {}
+        if parts.path == '/youtubei/v1/player':
+            vid = request['videoId']
+            index = int(vid[5:]) if vid[5:].isdigit() else 0
+            content = json.dumps({**player_response(vid, base_url, length_seconds=60 + index * 37 % 3600),
+                                  # pytubefix reads visitorData from the first response
+                                  'responseContext': {'visitorData': 'CgtiZW5jaG1hcms'}})
+        elif parts.path == '/youtubei/v1/search':
+            query, _, page = request.get('continuation', f"{request['query']}:0").rpartition(':')
+            content = json.dumps(search_response(query, base_url, int(page)))
+        elif parts.path == '/playlist':
+            content = playlist_page(parse_qs(parts.query)['list'][0], playlist_size)
+            return 200, [('Content-Type', 'text/html; charset=utf-8')], content.encode()
+        else:
+            return 404, [('Content-Type', 'text/plain')], b'Not found'
+        return 200, [('Content-Type', 'application/json')], content.encode()
+    return answer
@@ -0,0 +1,342 @@
+"""GUI responsiveness under synthetic load, on the offscreen Qt platform.
+
+Drives a real MainWindow through phases and measures, per phase:
+
+- event-loop latency: a precise timer fires every --probe-ms; how late each
+  tick runs is the time the loop was busy elsewhere
+- frame times: how long each top-level window repaint (UpdateRequest) takes
+- memory: RSS at the end of the phase and the process peak
+
+Phases:
+  idle      nothing but the probes, as a baseline
+  search    search result pages appended every 100 ms, a new search every 10 pages
+  playlist  a playlist dialog filled out of order at --playlist-rate entries/s
+  progress  --progress-rate progress signals/s from a download thread, delivered
+            like VideoDownloader.progress and fanned out by
+            SmartQueueManager._notify_listeners, spread over --active items
+
+    python benchmarks/gui_bench.py
+    python benchmarks/gui_bench.py --phase progress --progress-rate 1000 --seconds 10
+
+Thumbnails come from the local stream server. Results go to
+benchmarks/results/gui-<timestamp>.json.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import main  # noqa: E402
+import fake_youtube  # noqa: E402
+from run import environment, start_stream_server  # noqa: E402
+from PyQt6.QtCore import QEvent, QEventLoop, QObject, Qt, QTimer, pyqtSignal  # noqa: E402
+
+PHASES = ('idle', 'search', 'playlist', 'progress')
+
+
+def percentiles(samples: list) -> dict:
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+
+    def at(fraction):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
+
+    return {
+        'count': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'p50_ms': at(0.50),
+        'p95_ms': at(0.95),
+        'p99_ms': at(0.99),
+        'max_ms': round(ordered[-1] * 1000, 3)
+    }
+
+
+def rss_mb() -> float:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+class FrameTimer(QObject):
+    """Application event filter that times every top-level window repaint"""
+
+    def __init__(self):
+        super().__init__()
+        self.frame_times = []
+
+    def eventFilter(self, obj, event):
+        if event.type() != QEvent.Type.UpdateRequest or not obj.isWidgetType() or not obj.isWindow():
+            return False
+        # Deliver the repaint here so its duration can be measured, then swallow it
+        started = time.perf_counter()
+        obj.event(event)
+        self.frame_times.append(time.perf_counter() - started)
+        return True
+
+
+class LoopProbe:
+    """Precise timer whose lateness is the event loop's latency"""
+
+    def __init__(self, interval_ms: int):
+        self.interval = interval_ms / 1000
+        self.lateness = []
+        self._timer = QTimer()
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+        self._last = None
+
+    def start(self):
+        self.lateness = []
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.lateness.append(max(0.0, now - self._last - self.interval))
+        self._last = now
+
+
+def show_tab(window, title: str):
+    """Bring a tab to the front so its repaints are part of the measurement"""
+    for index in range(window.tabs.count()):
+        if window.tabs.tabText(index) == title:
+            window.tabs.setCurrentIndex(index)
+
+
+class SearchLoad:
+    def __init__(self, window, base_url: str, page_size: int = 20, pages_per_search: int = 10):
+        self.window = window
+        self.base_url = base_url
+        self.page_size = page_size
+        self.pages_per_search = pages_per_search
+        self.page = 0
+        self.timer = QTimer()
+        self.timer.setInterval(100)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        show_tab(self.window, 'Search')
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        first = self.page * self.page_size
+        batch = [fake_youtube.search_result(index, self.base_url)
+                 for index in range(first, first + self.page_size)]
+        if self.page % self.pages_per_search == 0:
+            self.window.display_search_results(batch)
+        else:
+            self.window.results_model.append_results(batch, self.window.default_quality_combo.currentText())
+        self.page += 1
+
+
+class PlaylistLoad:
+    def __init__(self, window, base_url: str, size: int, rate: int, seed: int):
+        self.window = window
+        self.base_url = base_url
+        # Resolution finishes out of order, like PlaylistResolver's pool
+        self.order = list(range(size))
+        random.Random(seed).shuffle(self.order)
+        self.per_tick = max(1, rate // 100)
+        self.timer = QTimer()
+        self.timer.setInterval(10)
+        self.timer.timeout.connect(self.tick)
+        self.dialog = None
+
+    def start(self):
+        self.dialog = main.PlaylistSelectionDialog(
+            {'title': 'Loading...', 'videos': [], 'total_videos': 0, 'total_duration': 0}, self.window
+        )
+        self.dialog.show()
+        self.dialog.set_playlist_header({'title': 'Benchmark playlist', 'total_videos': len(self.order)})
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.dialog.close()
+
+    def tick(self):
+        for _ in range(self.per_tick):
+            if not self.order:
+                self.timer.stop()
+                return
+            self.dialog.add_video(fake_youtube.playlist_entry(self.order.pop(), self.base_url))
+
+
+class ProgressLoad(QObject):
+    """Progress signals from a download thread, connected the way _start_download connects them"""
+    progress = pyqtSignal(object, int, str)
+
+    def __init__(self, window, base_url: str, active: int, rate: int):
+        super().__init__()
+        self.window = window
+        self.queue = window.smart_queue
+        self.rate = rate
+        self.items = []
+        for index in range(active):
+            result = fake_youtube.search_result(index, base_url)
+            item = main.VideoQueueItem(url=result['url'], title=result['title'], duration=result['duration'],
+                                       quality='720p', thumbnail_url=result['thumbnail_url'])
+            item.status = main.DownloadState.ACTIVE
+            item.download_id = f"B{index:05d}"
+            self.items.append(item)
+        # Emitted from the load thread, so delivery is queued to the GUI thread
+        self.progress.connect(lambda item, percent, status: self.queue._update_progress(item, percent, status))
+        self._stop = threading.Event()
+        self._thread = None
+        self.sent = 0
+
+    def start(self):
+        show_tab(self.window, 'Downloads')
+        with self.queue._lock:
+            for item in self.items:
+                self.queue.active_downloads[item.download_id] = item
+        for item in self.items:
+            self.queue._notify_listeners('queue_updated', item)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='ProgressLoad', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        interval = 1 / self.rate
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            item = self.items[self.sent % len(self.items)]
+            percent = (item.progress + 1) % 100
+            self.progress.emit(item, percent, f"Speed: {1 + self.sent % 50}.0MB/s | ETA: 0:01:00")
+            self.sent += 1
+            next_at += interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def run_phase(frame_timer: FrameTimer, probe: LoopProbe, load, seconds: float) -> dict:
+    frame_timer.frame_times.clear()
+    loop = QEventLoop()
+    probe.start()
+    if load is not None:
+        load.start()
+    started = time.perf_counter()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+    elapsed = time.perf_counter() - started
+    if load is not None:
+        load.stop()
+    probe.stop()
+    frames = list(frame_timer.frame_times)
+    result = {
+        'seconds': round(elapsed, 3),
+        'loop_latency': percentiles(probe.lateness),
+        'stalls_over_50ms': sum(lateness > 0.05 for lateness in probe.lateness),
+        'frame_time': percentiles(frames),
+        'frames_per_second': round(len(frames) / elapsed, 1),
+        'frames_over_16ms': sum(frame > 0.016 for frame in frames),
+        'rss_mb': round(rss_mb(), 1),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+    if isinstance(load, ProgressLoad):
+        result['events_sent'] = load.sent
+        result['events_per_second'] = round(load.sent / elapsed, 1)
+    return result
+
+
+def make_load(phase: str, window, base_url: str, args):
+    if phase == 'search':
+        return SearchLoad(window, base_url)
+    if phase == 'playlist':
+        return PlaylistLoad(window, base_url, args.playlist_size, args.playlist_rate, args.seed)
+    if phase == 'progress':
+        return ProgressLoad(window, base_url, args.active, args.progress_rate)
+    return None
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="GUI responsiveness under synthetic load (offscreen)")
+    parser.add_argument('--phase', action='append', choices=PHASES, help="Phase to run (repeatable; default: all)")
+    parser.add_argument('--seconds', type=float, default=5, help="Duration of each phase")
+    parser.add_argument('--probe-ms', type=int, default=5, help="Event-loop probe interval")
+    parser.add_argument('--playlist-size', type=int, default=2000)
+    parser.add_argument('--playlist-rate', type=int, default=500, help="Playlist entries added per second")
+    parser.add_argument('--progress-rate', type=int, default=500, help="Progress events per second")
+    parser.add_argument('--active', type=int, default=20, help="Active downloads the progress events cover")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Result file (default: benchmarks/results/gui-<timestamp>.json)")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output or os.path.join(
+        BENCHMARK_DIR, 'results', f"gui-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    ))
+    server, base_url = start_stream_server()
+    # MainWindow keeps its settings, history, index and caches in the working directory
+    work_dir = tempfile.mkdtemp(prefix='sytdl-gui-bench-')
+    os.chdir(work_dir)
+    with open('settings.json', 'w') as f:
+        json.dump({
+            'default_quality': '720p',
+            'download_path': os.path.join(work_dir, 'downloads'),
+            'prefer_audio': False,
+            'metrics_port': 0
+        }, f)
+    main.configure_logging(console_level='ERROR', log_dir=work_dir)
+
+    app = main.QApplication(sys.argv[:1])
+    frame_timer = FrameTimer()
+    app.installEventFilter(frame_timer)
+    window = main.MainWindow()
+    window.show()
+    # Let the deferred tabs and history load settle before measuring
+    settle = QEventLoop()
+    QTimer.singleShot(1000, settle.quit)
+    settle.exec()
+
+    probe = LoopProbe(args.probe_ms)
+    results = {}
+    try:
+        for phase in args.phase or PHASES:
+            results[phase] = run_phase(frame_timer, probe, make_load(phase, window, base_url, args), args.seconds)
+            print(json.dumps({'phase': phase, **results[phase]}), flush=True)
+    finally:
+        server.terminate()
+        server.wait()
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'schema': 1,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'environment': {**environment(), 'qt_platform': app.platformName()},
+            'config': {key: value for key, value in vars(args).items() if key not in ('output', 'phase')},
+            'phases': results
+        }, f, indent=2)
+    print(f"Results written to {output}", flush=True)
+    main.shutdown_logging()
+    # Closing the window would prompt about active downloads
+    os._exit(0)
+
+
+if __name__ == '__main__':
+    main_cli()
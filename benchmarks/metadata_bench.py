@@ -0,0 +1,208 @@
+"""Metadata, playlist and search benchmarks over recorded responses.
+
+Record once, with network access:
+
+    python benchmarks/metadata_bench.py record benchmarks/fixtures/sample.json.gz \\
+        --video https://youtu.be/<id> --playlist "https://www.youtube.com/playlist?list=<id>" \\
+        --search "lofi beats"
+
+Then replay offline, as often as needed:
+
+    python benchmarks/metadata_bench.py run benchmarks/fixtures/sample.json.gz --repeat 20
+    python benchmarks/metadata_bench.py run benchmarks/fixtures/sample.json.gz --time-scale 1
+
+--time-scale 0 (the default) measures parsing and filtering alone; 1
+replays the recorded response times as well. Results go to
+benchmarks/results/metadata-<timestamp>.json.
+
+benchmarks/fixtures/synthetic.json.gz is committed so this runs without
+network access. It is built from fake_youtube's responses rather than
+recorded from YouTube, so it checks the parsing and selection code paths
+but not YouTube's current response shapes, and its response times are 0.
+Rebuild it with `synthesize`; `run --check` replays it strictly and fails
+when a request is missing or an operation comes back empty, for CI:
+
+    python benchmarks/metadata_bench.py synthesize benchmarks/fixtures/synthetic.json.gz
+    python benchmarks/metadata_bench.py run benchmarks/fixtures/synthetic.json.gz --repeat 1 --check
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import main  # noqa: E402
+import fake_youtube  # noqa: E402
+from replay import Recorder, Replayer  # noqa: E402
+from run import environment  # noqa: E402
+
+SEARCH_FILTERS = {'duration': 'Medium', 'date': 'This Year', 'min_views': 1000}
+# What `synthesize` records; the stream URLs point at a server that is never contacted
+SYNTHETIC_BASE_URL = 'http://127.0.0.1:9'
+SYNTHETIC_OPERATIONS = [
+    {'kind': 'video', 'target': fake_youtube.watch_url(fake_youtube.video_id(0))},
+    {'kind': 'playlist', 'target': 'https://www.youtube.com/playlist?list=PLbenchmark0000000000000000000000'},
+    {'kind': 'search', 'target': 'lofi beats', 'target_count': 50}
+]
+
+
+def resolve_video(url: str):
+    """Player response and stream list, as ManifestPrefetcher.resolve does"""
+    yt = main.YouTube(main.VideoURL.canonical(url))
+    yt.title
+    return yt.streams
+
+
+def select_streams(streams) -> int:
+    """The stream queries VideoDownloader makes, for every quality option"""
+    return sum(len(main.VideoDownloader.planned_streams(streams, quality)) for quality in main.QUALITY_OPTIONS)
+
+
+def fetch_playlist(url: str, unthrottled: bool):
+    rate_limiter = main.HostRateLimiter(rate_per_second=1e9, burst=10 ** 9) if unthrottled else None
+    return main.PlaylistDownloader(url, None, rate_limiter=rate_limiter).fetch_playlist_info()
+
+
+def search(query: str, target_count: int):
+    return main.YouTubeSearchManager(cache_path=None).search_videos(query, SEARCH_FILTERS, target_count)
+
+
+def run_operation(operation: dict, unthrottled: bool = True) -> dict:
+    """Run one recorded operation; return its timings in seconds and a size measure"""
+    kind, target = operation['kind'], operation['target']
+    if kind == 'video':
+        started = time.perf_counter()
+        streams = resolve_video(target)
+        resolved = time.perf_counter()
+        selected = select_streams(streams)
+        return {'resolve': resolved - started, 'select_streams': time.perf_counter() - resolved,
+                'streams': len(streams), 'selected': selected}
+    if kind == 'playlist':
+        started = time.perf_counter()
+        info = fetch_playlist(target, unthrottled)
+        return {'fetch_playlist_info': time.perf_counter() - started, 'videos': info['total_videos']}
+    if kind == 'search':
+        started = time.perf_counter()
+        results = search(target, operation.get('target_count', 50))
+        return {'search_videos': time.perf_counter() - started, 'results': len(results)}
+    raise ValueError(f"Unknown operation: {kind}")
+
+
+def summarize(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        'count': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'p50_ms': round(ordered[len(ordered) // 2] * 1000, 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        'min_ms': round(ordered[0] * 1000, 3)
+    }
+
+
+def record(args) -> int:
+    if args.command == 'synthesize':
+        operations = SYNTHETIC_OPERATIONS
+        answer = fake_youtube.respond(SYNTHETIC_BASE_URL)
+    else:
+        operations = ([{'kind': 'video', 'target': url} for url in args.video] +
+                      [{'kind': 'playlist', 'target': url} for url in args.playlist] +
+                      [{'kind': 'search', 'target': query, 'target_count': args.target_count}
+                       for query in args.search])
+        answer = None
+    if not operations:
+        print("Nothing to record; pass --video, --playlist or --search", file=sys.stderr)
+        return 2
+    os.makedirs(os.path.dirname(os.path.abspath(args.cassette)), exist_ok=True)
+    with Recorder(args.cassette, answer) as recorder:
+        recorder.cassette.operations = operations
+        for operation in operations:
+            # Recording talks to YouTube, so keep the app's own rate limits
+            run_operation(operation, unthrottled=answer is not None)
+    print(f"Recorded {len(recorder.cassette.exchanges)} exchanges to {args.cassette}")
+    return 0
+
+
+def replay(args) -> int:
+    results = []
+    with Replayer(args.cassette, time_scale=args.time_scale) as replayer:
+        for operation in replayer.cassette.operations:
+            samples = {}
+            sizes = {}
+            for _ in range(args.repeat):
+                replayer.reset()
+                for name, value in run_operation(operation).items():
+                    if isinstance(value, float):
+                        samples.setdefault(name, []).append(value)
+                    else:
+                        sizes[name] = value
+            result = {**operation, **sizes,
+                      'timings': {name: summarize(values) for name, values in samples.items()}}
+            results.append(result)
+            print(json.dumps(result), flush=True)
+        misses = sorted(set(replayer.misses))
+
+    if args.check:
+        empty = [f"{result['kind']} {result['target']}" for result in results
+                 if not all(value for name, value in result.items() if name in ('streams', 'selected', 'videos', 'results'))]
+        for operation in empty:
+            print(f"Empty result: {operation}", file=sys.stderr)
+        return 1 if empty or misses or not results else 0
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, 'results', f"metadata-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'schema': 1,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'environment': environment(),
+            'config': {'cassette': os.path.basename(args.cassette), 'repeat': args.repeat,
+                       'time_scale': args.time_scale},
+            'operations': results,
+            'replay_misses': misses
+        }, f, indent=2)
+    print(f"Results written to {output}")
+    return 0
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Metadata benchmarks over recorded responses")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help="Run operations online and save their responses")
+    record_parser.add_argument('cassette', help="Fixture archive to write (.json.gz)")
+    record_parser.add_argument('--video', action='append', default=[], help="Video URL (repeatable)")
+    record_parser.add_argument('--playlist', action='append', default=[], help="Playlist URL (repeatable)")
+    record_parser.add_argument('--search', action='append', default=[], help="Search query (repeatable)")
+    record_parser.add_argument('--target-count', type=int, default=50, help="Results wanted per search")
+
+    run_parser = commands.add_parser('run', help="Replay a fixture archive and time each operation")
+    run_parser.add_argument('cassette', help="Fixture archive to replay (.json.gz)")
+    run_parser.add_argument('--repeat', type=int, default=10)
+    run_parser.add_argument('--time-scale', type=float, default=0,
+                            help="Multiplier for recorded response times (0: no delay)")
+    run_parser.add_argument('--output', help="Result file (default: benchmarks/results/metadata-<timestamp>.json)")
+    run_parser.add_argument('--check', action='store_true',
+                            help="Only verify the replay: exit 1 on a missing request or an empty result")
+
+    synthesize_parser = commands.add_parser('synthesize', help="Build a fixture archive from fake_youtube, offline")
+    synthesize_parser.add_argument('cassette', help="Fixture archive to write (.json.gz)")
+
+    args = parser.parse_args()
+    main.configure_logging(console_level='ERROR', log_dir=tempfile.gettempdir())
+    try:
+        return replay(args) if args.command == 'run' else record(args)
+    finally:
+        main.shutdown_logging()
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -0,0 +1,388 @@
+"""SmartQueueManager on a simulated clock, with synthetic downloads.
+
+The queue's own code runs unchanged: prioritisation, _process_queue,
+success, error and retry handling, and listener fan-out. Only its two
+seams are replaced:
+- _schedule posts callbacks on a simulated clock instead of QTimer
+- _launch_download starts a simulated transfer instead of a
+  VideoDownloader thread
+
+Transfers share a link. Each download runs at its own sampled speed or
+its fair share of the link, whichever is lower, with the remaining
+capacity going to the others. Attempts can fail part-way. Simulated hours
+run in seconds of wall time.
+
+Two things are reported:
+- Per-operation wall-clock overhead of the queue methods. Times are
+  inclusive: _process_queue includes the _start_download calls it makes.
+- Per-item wait (arrival to first start) and completion (arrival to
+  success) percentiles in simulated seconds.
+
+    python benchmarks/queue_sim.py --items 1000 --concurrency 3
+    python benchmarks/queue_sim.py --arrival-rate 0.5 --failure-rate 0.2 --link-mbps 100
+
+Results go to benchmarks/results/queue-<timestamp>.json.
+"""
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import main  # noqa: E402
+import fake_youtube  # noqa: E402
+from run import environment  # noqa: E402
+
+TIMED_OPERATIONS = ('add_download', '_process_queue', '_start_download', '_update_progress',
+                    '_handle_download_success', '_handle_download_error', '_retry_download',
+                    '_cleanup_download')
+# Rough bytes per second of video for each quality, for deriving durations from sizes
+QUALITY_BITRATES = {
+    'High Quality Pro Plus': 1_000_000,
+    '720p': 350_000,
+    '480p': 180_000,
+    '360p': 90_000,
+    'Audio Only': 16_000
+}
+
+
+class SimClock:
+    """Discrete-event clock: callbacks run in time order, ties in scheduling order"""
+
+    def __init__(self):
+        self.now = 0.0
+        self._events = []
+        self._sequence = itertools.count()
+
+    def call_at(self, when: float, callback):
+        heapq.heappush(self._events, (when, next(self._sequence), callback))
+
+    def call_later(self, delay: float, callback):
+        self.call_at(self.now + delay, callback)
+
+    def run(self, until: float = math.inf):
+        while self._events and self._events[0][0] <= until:
+            self.now, _, callback = heapq.heappop(self._events)
+            callback()
+
+
+class Transfer:
+    def __init__(self, item, download_id: str, total_bytes: float, speed: float, fail_after: float):
+        self.item = item
+        self.download_id = download_id
+        self.total_bytes = total_bytes
+        self.speed = speed
+        # Bytes this attempt moves before it ends, in failure or success
+        self.target_bytes = total_bytes * fail_after if fail_after < 1 else total_bytes
+        self.fails = fail_after < 1
+        self.done_bytes = 0.0
+        self.rate = 0.0
+
+
+class SimLink:
+    """Bandwidth shared by the active transfers, recomputed whenever the set changes"""
+
+    def __init__(self, clock: SimClock, capacity: float, on_finished):
+        self.clock = clock
+        self.capacity = capacity
+        self.on_finished = on_finished
+        self.transfers = {}
+        self._updated = 0.0
+        self._generation = 0
+
+    def add(self, transfer: Transfer):
+        self._advance()
+        self.transfers[transfer.download_id] = transfer
+        self._reschedule()
+
+    def _advance(self):
+        elapsed = self.clock.now - self._updated
+        for transfer in self.transfers.values():
+            transfer.done_bytes = min(transfer.target_bytes, transfer.done_bytes + transfer.rate * elapsed)
+        self._updated = self.clock.now
+
+    def _reschedule(self):
+        # Max-min fair share: slow transfers keep their own speed, the rest split what is left
+        remaining = self.capacity
+        pending = sorted(self.transfers.values(), key=lambda t: t.speed)
+        for position, transfer in enumerate(pending):
+            transfer.rate = min(transfer.speed, remaining / (len(pending) - position))
+            remaining -= transfer.rate
+
+        self._generation += 1
+        generation = self._generation
+        soonest = min(
+            ((t.target_bytes - t.done_bytes) / t.rate for t in self.transfers.values() if t.rate > 0),
+            default=None
+        )
+        if soonest is not None:
+            self.clock.call_later(max(soonest, 0.0), lambda: self._complete(generation))
+
+    def _complete(self, generation: int):
+        if generation != self._generation:
+            return
+        self._advance()
+        finished = [t for t in self.transfers.values() if t.target_bytes - t.done_bytes < 1]
+        for transfer in finished:
+            del self.transfers[transfer.download_id]
+        self._reschedule()
+        for transfer in finished:
+            self.on_finished(transfer)
+
+    def progress(self, download_id: str):
+        transfer = self.transfers.get(download_id)
+        if transfer is None:
+            return None
+        self._advance()
+        return transfer
+
+
+class SimulatedQueueManager(main.SmartQueueManager):
+    """SmartQueueManager whose timers and downloads run on a SimClock"""
+
+    def __init__(self, clock: SimClock, workload: 'Workload', link_capacity: float,
+                 startup_seconds: float, progress_interval: float):
+        super().__init__()
+        self.clock = clock
+        self.workload = workload
+        self.startup_seconds = startup_seconds
+        self.progress_interval = progress_interval
+        self.link = SimLink(clock, link_capacity, self._transfer_finished)
+        # Simulated transfers never touch a disk; admitting against the host's free space
+        # would make results depend on the machine
+        self.disk_space = None
+        self._download_ids = (f"S{number:06d}" for number in itertools.count())
+
+    def _schedule(self, delay_ms: int, callback):
+        self.clock.call_later(delay_ms / 1000, callback)
+
+    def _launch_download(self, video_item):
+        download_id = next(self._download_ids)
+        profile = self.workload.profiles[id(video_item)]
+
+        def start():
+            self.workload.record_start(video_item, self.clock.now)
+            transfer = Transfer(video_item, download_id, profile['bytes'], self.workload.sample_speed(),
+                                self.workload.sample_failure())
+            # Metadata and stream resolution come before the first byte
+            self.clock.call_later(self.startup_seconds, lambda: self._begin_transfer(transfer))
+
+        return download_id, start
+
+    def _begin_transfer(self, transfer: Transfer):
+        self.link.add(transfer)
+        if self.progress_interval:
+            self.clock.call_later(self.progress_interval, lambda: self._report_progress(transfer))
+
+    def _report_progress(self, transfer: Transfer):
+        if self.link.progress(transfer.download_id) is None:
+            return
+        percent = int(transfer.done_bytes / transfer.total_bytes * 100)
+        self._update_progress(transfer.item, percent,
+                              f"Speed: {transfer.rate / 1024 / 1024:.1f}MB/s | ETA: 0:00:00")
+        self.clock.call_later(self.progress_interval, lambda: self._report_progress(transfer))
+
+    def _transfer_finished(self, transfer: Transfer):
+        # Same order as the finished/error signal connections in _launch_download
+        if transfer.fails:
+            self._handle_download_error(transfer.item, "HTTP Error 503: Service Unavailable")
+        else:
+            self.workload.record_completion(transfer.item, self.clock.now)
+            self._handle_download_success(transfer.item, '', transfer.download_id)
+        self._cleanup_download(transfer.item)
+
+
+class Workload:
+    """Synthetic items with lognormal sizes and speeds and a per-attempt failure chance"""
+
+    def __init__(self, args):
+        self.rng = random.Random(args.seed)
+        self.args = args
+        self.profiles = {}
+        self.arrivals = {}
+        self.starts = {}
+        self.completions = {}
+        self.attempts = {}
+
+    def make_items(self):
+        args = self.args
+        arrival = 0.0
+        for index in range(args.items):
+            quality = self.rng.choice(main.QUALITY_OPTIONS)
+            size = self.rng.lognormvariate(math.log(args.size_median_mb * 1024 * 1024), args.size_sigma)
+            in_playlist = self.rng.random() < args.playlist_fraction
+            item = main.VideoQueueItem(
+                url=fake_youtube.watch_url(fake_youtube.video_id(index)),
+                title=f"Simulated {index}",
+                duration=str(timedelta(seconds=int(size / QUALITY_BITRATES[quality]))),
+                quality=quality,
+                thumbnail_url='',
+                playlist_index=index if in_playlist else None
+            )
+            self.profiles[id(item)] = {'bytes': size, 'index': index}
+            if args.arrival_rate:
+                arrival += self.rng.expovariate(args.arrival_rate)
+            yield arrival, item
+
+    def sample_speed(self) -> float:
+        return self.rng.lognormvariate(math.log(self.args.speed_median_mbps * 1e6 / 8), self.args.speed_sigma)
+
+    def sample_failure(self) -> float:
+        """Fraction of the transfer done when this attempt fails, or 1 when it succeeds"""
+        return self.rng.random() if self.rng.random() < self.args.failure_rate else 1.0
+
+    def record_arrival(self, item, now: float):
+        self.arrivals[id(item)] = now
+
+    def record_start(self, item, now: float):
+        self.starts.setdefault(id(item), now)
+        self.attempts[id(item)] = self.attempts.get(id(item), 0) + 1
+
+    def record_completion(self, item, now: float):
+        self.completions[id(item)] = now
+
+
+def timed(function, samples: list):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+    return wrapper
+
+
+def percentiles(samples, scale: float = 1.0, digits: int = 3) -> dict:
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+
+    def at(fraction):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * scale, digits)
+
+    return {
+        'count': len(ordered),
+        'mean': round(statistics.fmean(ordered) * scale, digits),
+        'p50': at(0.50),
+        'p90': at(0.90),
+        'p99': at(0.99),
+        'max': round(ordered[-1] * scale, digits)
+    }
+
+
+def simulate(args) -> dict:
+    clock = SimClock()
+    workload = Workload(args)
+    manager = SimulatedQueueManager(
+        clock, workload,
+        link_capacity=args.link_mbps * 1e6 / 8 if args.link_mbps else math.inf,
+        startup_seconds=args.startup_ms / 1000,
+        progress_interval=1 / args.progress_hz if args.progress_hz else 0
+    )
+    manager.max_concurrent_downloads = args.concurrency
+    manager.max_retry_attempts = args.max_retries
+    manager.retry_delay_base = args.retry_delay
+
+    overhead = {name: [] for name in TIMED_OPERATIONS}
+    for name in TIMED_OPERATIONS:
+        # Instance attributes shadow the methods, so the queue's internal calls are timed too
+        setattr(manager, name, timed(getattr(manager, name), overhead[name]))
+
+    items = []
+    for arrival, item in workload.make_items():
+        items.append(item)
+
+        def arrive(item=item):
+            workload.record_arrival(item, clock.now)
+            manager.add_download(item)
+        clock.call_at(arrival, arrive)
+
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    clock.run(until=args.max_sim_hours * 3600)
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+
+    waits = [workload.starts[key] - workload.arrivals[key] for key in workload.starts]
+    completions = [workload.completions[key] - workload.arrivals[key] for key in workload.completions]
+    total_bytes = sum(workload.profiles[key]['bytes'] for key in workload.completions)
+    return {
+        'simulated': {
+            'makespan_seconds': round(clock.now, 3),
+            'completed': len(manager.completed_downloads),
+            'failed': len(manager.failed_downloads),
+            'unfinished': args.items - len(manager.completed_downloads) - len(manager.failed_downloads),
+            'attempts': sum(workload.attempts.values()),
+            'goodput_mbps': round(total_bytes * 8 / clock.now / 1e6, 2) if clock.now else 0,
+            'wait_seconds': percentiles(waits),
+            'completion_seconds': percentiles(completions)
+        },
+        'overhead_us': {name: percentiles(samples, scale=1e6, digits=2)
+                        for name, samples in overhead.items() if samples},
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4)
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="SmartQueueManager on a simulated clock")
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=3, help="max_concurrent_downloads")
+    parser.add_argument('--arrival-rate', type=float, default=0,
+                        help="Poisson arrivals per simulated second (0: all queued at once)")
+    parser.add_argument('--size-median-mb', type=float, default=60)
+    parser.add_argument('--size-sigma', type=float, default=1.0, help="Lognormal sigma of sizes")
+    parser.add_argument('--speed-median-mbps', type=float, default=40, help="Per-download speed")
+    parser.add_argument('--speed-sigma', type=float, default=0.6, help="Lognormal sigma of speeds")
+    parser.add_argument('--link-mbps', type=float, default=200, help="Shared link capacity (0: unlimited)")
+    parser.add_argument('--startup-ms', type=float, default=800, help="Metadata time before the first byte")
+    parser.add_argument('--failure-rate', type=float, default=0.05, help="Chance an attempt fails part-way")
+    parser.add_argument('--max-retries', type=int, default=3)
+    parser.add_argument('--retry-delay', type=int, default=5, help="retry_delay_base in seconds")
+    parser.add_argument('--playlist-fraction', type=float, default=0.3,
+                        help="Share of items that carry a playlist index")
+    parser.add_argument('--progress-hz', type=float, default=1, help="Progress updates per download per second")
+    parser.add_argument('--max-sim-hours', type=float, default=240)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Result file (default: benchmarks/results/queue-<timestamp>.json)")
+    args = parser.parse_args()
+
+    # Failed downloads are part of the workload, not errors worth printing
+    main.configure_logging(console_level='CRITICAL', log_dir=tempfile.gettempdir())
+    try:
+        result = simulate(args)
+    finally:
+        main.shutdown_logging()
+    print(json.dumps(result['simulated']))
+    print(json.dumps({'overhead_us': {name: stats['mean'] for name, stats in result['overhead_us'].items()},
+                      'wall_seconds': result['wall_seconds']}))
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, 'results', f"queue-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'schema': 1,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'environment': environment(),
+            'config': {key: value for key, value in vars(args).items() if key != 'output'},
+            **result
+        }, f, indent=2)
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
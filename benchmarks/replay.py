@@ -0,0 +1,287 @@
+"""Record and replay the HTTP exchanges behind YouTube, Playlist and VideosSearch.
+
+pytubefix sends every request through ``pytubefix.request.urlopen``, the
+app's Playlist (from pytube) through ``pytube.request.urlopen`` and
+youtubesearchpython through ``httpx.get``/``httpx.post``; all are swapped
+for the duration of a ``Recorder`` or ``Replayer`` block:
+
+    with Recorder('benchmarks/fixtures/lofi.json.gz'):
+        YouTubeSearchManager(cache_path=None).search_videos('lofi', {})
+
+    with Replayer('benchmarks/fixtures/lofi.json.gz', time_scale=0):
+        YouTubeSearchManager(cache_path=None).search_videos('lofi', {})
+
+A fixture archive is gzipped JSON with one entry per exchange: request
+method, URL and body, response status, headers and body, and how long the
+response took. Requests are matched on method, URL and body, minus values
+that change from run to run. Repeated requests get the recorded responses
+in order, and then the last one again.
+
+Media transfers (googlevideo.com) are not recorded; the stream server in
+this directory covers those.
+"""
+import base64
+import email.message
+import gzip
+import hashlib
+import io
+import json
+import threading
+import time
+import urllib.error
+from http import HTTPStatus
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# Query parameters and JSON body fields that differ between otherwise identical requests
+VOLATILE_QUERY_PARAMS = frozenset({'cpn', 'rn', 'rbuf', 't', 'expire', 'ei', 'sig', 'lsig'})
+VOLATILE_BODY_FIELDS = frozenset({'visitorData', 'cpn', 'poToken', 'clickTrackingParams'})
+MEDIA_HOSTS = ('googlevideo.com',)
+
+
+class ReplayMissError(LookupError):
+    """A request had no recorded exchange"""
+
+
+def _strip_volatile(value):
+    if isinstance(value, dict):
+        return {key: _strip_volatile(item) for key, item in sorted(value.items())
+                if key not in VOLATILE_BODY_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def request_key(method: str, url: str, body: Optional[bytes]) -> str:
+    """Stable identity of a request for matching a replay against a recording"""
+    parts = urlparse(url)
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if key not in VOLATILE_QUERY_PARAMS))
+    normalized_url = urlunparse(parts._replace(query=query, fragment=''))
+    normalized_body = b''
+    if body:
+        try:
+            normalized_body = json.dumps(_strip_volatile(json.loads(body)), sort_keys=True).encode()
+        except ValueError:
+            normalized_body = body
+    digest = hashlib.sha1(normalized_body).hexdigest()[:12]
+    return f"{method.upper()} {normalized_url} {digest}"
+
+
+def is_media(url: str) -> bool:
+    return (urlparse(url).hostname or '').endswith(MEDIA_HOSTS)
+
+
+class Cassette:
+    """Fixture archive of recorded exchanges"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.exchanges: List[Dict] = []
+        # What was run while recording, so a replay can run the same thing
+        self.operations: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def load(self) -> 'Cassette':
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            archive = json.load(f)
+        self.exchanges = archive['exchanges']
+        self.operations = archive.get('operations', [])
+        return self
+
+    def save(self):
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            json.dump({'version': 1, 'operations': self.operations, 'exchanges': self.exchanges}, f)
+
+    def add(self, method: str, url: str, body: Optional[bytes], status: int, reason: str,
+            headers: List, content: bytes, elapsed: float):
+        with self._lock:
+            self.exchanges.append({
+                'key': request_key(method, url, body),
+                'method': method.upper(),
+                'url': url,
+                'request_body': base64.b64encode(body).decode() if body else None,
+                'status': status,
+                'reason': reason,
+                'headers': headers,
+                'body': base64.b64encode(content).decode(),
+                'elapsed': elapsed
+            })
+
+
+class _Patches:
+    """Swap urlopen and httpx.get/post for the duration of a with block"""
+
+    def __enter__(self):
+        import httpx
+        import pytube.request
+        import pytubefix.request
+        self._httpx = httpx
+        self._request_modules = (pytubefix.request, pytube.request)
+        # Both modules import urllib's urlopen, so one original serves both
+        self._original = {
+            'urlopen': pytubefix.request.urlopen,
+            'GET': httpx.get,
+            'POST': httpx.post
+        }
+        for module in self._request_modules:
+            module.urlopen = self.urlopen
+        httpx.get = lambda url, **kwargs: self.httpx_request('GET', url, **kwargs)
+        httpx.post = lambda url, **kwargs: self.httpx_request('POST', url, **kwargs)
+        return self
+
+    def __exit__(self, *exc_info):
+        for module in self._request_modules:
+            module.urlopen = self._original['urlopen']
+        self._httpx.get = self._original['GET']
+        self._httpx.post = self._original['POST']
+        return False
+
+
+class UrllibResponse(io.BytesIO):
+    """Stands in for the object urlopen returns; pytubefix uses read() and info()"""
+
+    def __init__(self, url: str, status: int, reason: str, headers: List, content: bytes):
+        super().__init__(content)
+        self.url = url
+        self.status = self.code = status
+        self.reason = self.msg = reason
+        self.headers = email.message.Message()
+        for name, value in headers:
+            self.headers[name] = value
+
+    def info(self):
+        return self.headers
+
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+
+class Recorder(_Patches):
+    """Pass requests through to the network and save every non-media exchange.
+
+    With an answer(method, url, body) -> (status, headers, content) callable,
+    non-media requests are answered by it instead of the network, which is
+    how the synthetic fixtures are built from fake_youtube.respond().
+    """
+
+    def __init__(self, path: str, answer: Optional[Callable] = None):
+        self.cassette = Cassette(path)
+        self.answer = answer
+
+    def __exit__(self, *exc_info):
+        super().__exit__(*exc_info)
+        self.cassette.save()
+        return False
+
+    def urlopen(self, request, *args, **kwargs):
+        url = request.full_url
+        if is_media(url):
+            return self._original['urlopen'](request, *args, **kwargs)
+        if self.answer is not None:
+            status, headers, content = self.answer(request.get_method(), url, request.data)
+            reason = HTTPStatus(status).phrase
+            self.cassette.add(request.get_method(), url, request.data, status, reason, headers, content, 0.0)
+            response = UrllibResponse(url, status, reason, headers, content)
+            if status >= 400:
+                raise urllib.error.HTTPError(url, status, reason, response.headers, io.BytesIO(content))
+            return response
+        started = time.perf_counter()
+        try:
+            response = self._original['urlopen'](request, *args, **kwargs)
+        except urllib.error.HTTPError as e:
+            content = e.read()
+            self.cassette.add(request.get_method(), url, request.data, e.code, e.reason,
+                              list(e.headers.items()), content, time.perf_counter() - started)
+            raise urllib.error.HTTPError(url, e.code, e.reason, e.headers, io.BytesIO(content))
+        with response:
+            content = response.read()
+            status, reason, headers = response.status, response.reason, list(response.headers.items())
+        self.cassette.add(request.get_method(), url, request.data, status, reason, headers, content,
+                          time.perf_counter() - started)
+        return UrllibResponse(url, status, reason, headers, content)
+
+    def httpx_request(self, method: str, url: str, **kwargs):
+        if self.answer is not None:
+            request = self._httpx.Request(method, url, params=kwargs.get('params'), json=kwargs.get('json'),
+                                          headers=kwargs.get('headers'))
+            status, headers, content = self.answer(method, url, request.content)
+            self.cassette.add(method, url, request.content, status, HTTPStatus(status).phrase, headers, content, 0.0)
+            return self._httpx.Response(status, headers=headers, content=content, request=request)
+        started = time.perf_counter()
+        response = self._original[method](url, **kwargs)
+        body = response.request.content if response.request is not None else None
+        self.cassette.add(method, url, body, response.status_code, response.reason_phrase,
+                          list(response.headers.items()), response.content, time.perf_counter() - started)
+        return response
+
+
+class Replayer(_Patches):
+    """Serve recorded exchanges without touching the network.
+
+    time_scale multiplies the recorded response times: 1 replays them as
+    recorded, 0 answers immediately. With strict=False, requests missing from
+    the archive go to the network instead of raising ReplayMissError.
+    """
+
+    def __init__(self, path: str, time_scale: float = 1.0, strict: bool = True):
+        self.cassette = Cassette(path).load()
+        self.time_scale = time_scale
+        self.strict = strict
+        self.misses: List[str] = []
+        self._by_key: Dict[str, List[Dict]] = {}
+        for exchange in self.cassette.exchanges:
+            self._by_key.setdefault(exchange['key'], []).append(exchange)
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Start every request sequence from its first recorded response again"""
+        with self._lock:
+            self._served.clear()
+
+    def _next(self, method: str, url: str, body: Optional[bytes]) -> Optional[Dict]:
+        key = request_key(method, url, body)
+        with self._lock:
+            exchanges = self._by_key.get(key)
+            if not exchanges:
+                self.misses.append(key)
+                return None
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            exchange = exchanges[min(index, len(exchanges) - 1)]
+        if self.time_scale:
+            time.sleep(exchange['elapsed'] * self.time_scale)
+        return exchange
+
+    def urlopen(self, request, *args, **kwargs):
+        url = request.full_url
+        exchange = self._next(request.get_method(), url, request.data)
+        if exchange is None:
+            if self.strict:
+                raise ReplayMissError(f"No recorded exchange for {request.get_method()} {url}")
+            return self._original['urlopen'](request, *args, **kwargs)
+        content = base64.b64decode(exchange['body'])
+        response = UrllibResponse(url, exchange['status'], exchange['reason'], exchange['headers'], content)
+        if exchange['status'] >= 400:
+            raise urllib.error.HTTPError(url, exchange['status'], exchange['reason'], response.headers,
+                                         io.BytesIO(content))
+        return response
+
+    def httpx_request(self, method: str, url: str, **kwargs):
+        httpx = self._httpx
+        request = httpx.Request(method, url, params=kwargs.get('params'), json=kwargs.get('json'),
+                                headers=kwargs.get('headers'))
+        exchange = self._next(method, url, request.content)
+        if exchange is None:
+            if self.strict:
+                raise ReplayMissError(f"No recorded exchange for {method} {url}")
+            return self._original[method](url, **kwargs)
+        # Content-Encoding would make httpx try to decode the already-decoded body
+        headers = [(name, value) for name, value in exchange['headers']
+                   if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')]
+        return httpx.Response(exchange['status'], headers=headers,
+                              content=base64.b64decode(exchange['body']), request=request)
@@ -0,0 +1,269 @@
+"""Download benchmarks against the local stream server.
+
+Runs the real VideoDownloader and SmartQueueManager against synthetic
+videos served from benchmarks/stream_server.py, with metadata from
+benchmarks/fake_youtube.py, and writes one machine-readable JSON result
+per run:
+
+    python benchmarks/run.py                       # all scenarios
+    python benchmarks/run.py --scenario queue --size-mb 64 --bandwidth-mbps 200
+    python benchmarks/run.py --output results.json
+
+Each scenario runs in its own process so CPU time and peak RSS belong to
+that scenario alone. The server runs in another process so its work is
+not counted against the client.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from types import SimpleNamespace
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+RESULT_SCHEMA = 1
+
+# name -> (quality, videos, queue concurrency or None for a direct VideoDownloader.run)
+SCENARIOS = {
+    'progressive': ('720p', 1, None),
+    'adaptive': ('High Quality Pro Plus', 1, None),
+    'queue': ('720p', 6, 3),
+    'errors': ('720p', 4, 2),
+}
+
+
+def start_stream_server():
+    """Start stream_server.py in a subprocess; return (process, base_url)"""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BENCHMARK_DIR, 'stream_server.py'), '--port', '0'],
+        stdout=subprocess.PIPE, text=True
+    )
+    port = int(process.stdout.readline())
+    return process, f"http://127.0.0.1:{port}"
+
+
+def probe_ttfb(url: str) -> float:
+    """Time to the first body byte of a plain request, as a reference for the client's TTFB"""
+    started = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        response.read(1)
+        return time.perf_counter() - started
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def environment() -> dict:
+    try:
+        from importlib.metadata import version
+        pytubefix_version = version('pytubefix')
+    except Exception:
+        pytubefix_version = 'unknown'
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pytubefix': pytubefix_version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def histogram_totals(histogram) -> tuple:
+    """(count, sum) across all label series of a METRICS histogram"""
+    series = histogram.snapshot().values()
+    return sum(s['count'] for s in series), sum(s['sum'] for s in series)
+
+
+def counter_total(counter) -> float:
+    return sum(counter.snapshot().values())
+
+
+def run_scenario(name: str, config: dict) -> dict:
+    """Run one scenario in this process and return its measurements"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    sys.path.insert(0, REPO_DIR)
+    sys.path.insert(0, BENCHMARK_DIR)
+    import fake_youtube
+    import main
+    from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+    quality, videos, concurrency = SCENARIOS[name]
+    videos = config.get('videos') or videos
+    work_dir = tempfile.mkdtemp(prefix=f"sytdl-bench-{name}-")
+    download_path = os.path.join(work_dir, 'downloads')
+    os.makedirs(download_path)
+    main.configure_logging(console_level='ERROR', log_dir=work_dir)
+
+    size = int(config['size_mb'] * 1024 * 1024)
+    server_options = {
+        'latency_ms': config['latency_ms'],
+        'rate': config['bandwidth_mbps'] * 1e6 / 8,
+        'error_rate': config['error_rate'] if name == 'errors' else 0,
+        'seed': config['seed']
+    }
+    manifest_directory = os.path.join(work_dir, 'manifest_cache')
+    urls = fake_youtube.build_catalog(
+        config['base_url'], videos, manifest_directory,
+        progressive_size=size, video_size=size, audio_size=max(size // 8, 1), **server_options
+    )
+    prefetcher = main.ManifestPrefetcher(main.StreamManifestCache(manifest_directory))
+    probe = fake_youtube.stream_url(config['base_url'], 'probe-video', size,
+                                    latency_ms=config['latency_ms'])
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    # SmartQueueManager reads the download folder from the main window's settings
+    main.MainWindow._instance = SimpleNamespace(
+        download_manager=SimpleNamespace(settings={'download_path': download_path})
+    )
+
+    ttfb_before = histogram_totals(main.DOWNLOAD_TTFB)
+    retries_before = counter_total(main.DOWNLOAD_RETRIES)
+    bytes_before = counter_total(main.DOWNLOAD_BYTES)
+    outcomes = {'completed': 0, 'failed': 0}
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+
+    if concurrency is None:
+        for url in urls:
+            downloader = main.VideoDownloader(url, quality, download_path, prefetcher)
+            downloader.finished.connect(lambda *_: outcomes.__setitem__('completed', outcomes['completed'] + 1))
+            downloader.error.connect(lambda *_: outcomes.__setitem__('failed', outcomes['failed'] + 1))
+            downloader.run()
+    else:
+        queue_manager = main.SmartQueueManager()
+        queue_manager.max_concurrent_downloads = concurrency
+        queue_manager.retry_delay_base = 1
+        queue_manager.manifest_prefetcher = prefetcher
+        loop = QEventLoop()
+
+        def on_event(event_type, item):
+            if event_type in ('download_completed', 'download_failed'):
+                outcomes[event_type.split('_')[1]] += 1
+                if sum(outcomes.values()) == len(urls):
+                    QTimer.singleShot(0, loop.quit)
+
+        queue_manager.add_listener(on_event)
+        for index, url in enumerate(urls):
+            queue_manager.add_download(main.VideoQueueItem(
+                url=url, title=f"Benchmark {index}", duration='10:00', quality=quality, thumbnail_url=''
+            ))
+        QTimer.singleShot(int(config['timeout'] * 1000), loop.quit)
+        loop.exec()
+        for thread in list(queue_manager.download_threads.values()):
+            thread.quit()
+            thread.wait()
+
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_before
+    received = counter_total(main.DOWNLOAD_BYTES) - bytes_before
+    ttfb_count, ttfb_sum = (after - before for after, before in
+                            zip(histogram_totals(main.DOWNLOAD_TTFB), ttfb_before))
+    prefetcher.shutdown()
+    main.shutdown_logging()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    del app
+
+    return {
+        'scenario': name,
+        'quality': quality,
+        'videos': len(urls),
+        'concurrency': concurrency or 1,
+        'completed': outcomes['completed'],
+        'failed': outcomes['failed'],
+        'retries': counter_total(main.DOWNLOAD_RETRIES) - retries_before,
+        'bytes': received,
+        'wall_seconds': round(wall, 4),
+        'throughput_mbps': round(received * 8 / wall / 1e6, 2) if wall else 0,
+        'ttfb_mean_seconds': round(ttfb_sum / ttfb_count, 4) if ttfb_count else None,
+        'ttfb_probe_seconds': round(probe_ttfb(probe), 4),
+        'cpu_seconds': round(cpu, 4),
+        'cpu_percent': round(cpu / wall * 100, 1) if wall else 0,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+def run_in_subprocess(name: str, config: dict) -> dict:
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', name, '--config', json.dumps(config)],
+        capture_output=True, text=True, timeout=config['timeout'] + 60
+    )
+    if completed.returncode != 0:
+        return {'scenario': name, 'error': completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download benchmarks against a local stream server")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument('--size-mb', type=float, default=32, help="Size of each stream")
+    parser.add_argument('--videos', type=int, help="Override the number of videos per scenario")
+    parser.add_argument('--latency-ms', type=float, default=20, help="Server latency before each response")
+    parser.add_argument('--bandwidth-mbps', type=float, default=0, help="Per-connection cap (0: uncapped)")
+    parser.add_argument('--error-rate', type=float, default=0.1,
+                        help="Fraction of requests answered with 429/503 in the errors scenario")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300, help="Per-scenario timeout in seconds")
+    parser.add_argument('--output', help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--config', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_scenario(args.worker, json.loads(args.config))
+        print(json.dumps(result), flush=True)
+        # Pending Qt and executor threads must not hold up the result
+        os._exit(0)
+
+    server, base_url = start_stream_server()
+    config = {
+        'base_url': base_url,
+        'size_mb': args.size_mb,
+        'videos': args.videos,
+        'latency_ms': args.latency_ms,
+        'bandwidth_mbps': args.bandwidth_mbps,
+        'error_rate': args.error_rate,
+        'seed': args.seed,
+        'timeout': args.timeout
+    }
+    results = []
+    try:
+        for name in args.scenario or list(SCENARIOS):
+            result = run_in_subprocess(name, config)
+            results.append(result)
+            print(json.dumps(result), flush=True)
+    finally:
+        server.terminate()
+        server.wait()
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, 'results', f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'schema': RESULT_SCHEMA,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'environment': environment(),
+            'config': {key: value for key, value in config.items() if key != 'base_url'},
+            'scenarios': results
+        }, f, indent=2)
+    print(f"Results written to {output}")
+    return 0 if all('error' not in result for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
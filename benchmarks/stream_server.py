@@ -0,0 +1,182 @@
+"""Local HTTP server serving synthetic video/audio streams for benchmarks.
+
+Every stream is described by its URL, so one server handles any mix of
+scenarios:
+
+    /stream/<name>?size=<bytes>&latency_ms=<ms>&rate=<bytes/s>
+                   &error_rate=<0..1>&error_codes=429,503&seed=<int>
+    /thumb/<name>?latency_ms=<ms>       small PNG, colour derived from the name
+
+Ranges are honoured both as an HTTP Range header and as YouTube's
+``range=<start>-<end>`` query parameter, which is what pytubefix sends.
+Content is a deterministic byte pattern, so nothing is held in memory.
+
+Run standalone with ``python benchmarks/stream_server.py --port 8765``; the
+chosen port is printed on the first line of stdout.
+"""
+import argparse
+import random
+import struct
+import sys
+import threading
+import time
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BLOCK = bytes(range(256)) * 256  # 64 KiB pattern
+WRITE_SIZE = len(BLOCK)
+
+
+@lru_cache(maxsize=256)
+def thumbnail_png(name: str, width: int = 120, height: int = 90) -> bytes:
+    """Solid-colour PNG, so thumbnails are real images without shipping any"""
+    rgb = bytes(zlib.crc32(name.encode()).to_bytes(4, 'big')[:3])
+    raw = (b'\x00' + rgb * width) * height
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw))
+            + chunk(b'IEND', b''))
+
+
+class StreamRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    request_counter = 0
+    counter_lock = threading.Lock()
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path.startswith('/thumb/'):
+            self._serve_thumbnail(url.path, params, send_body)
+            return
+        if not url.path.startswith('/stream/'):
+            self.send_error(404)
+            return
+        size = int(params.get('size', 10 * 1024 * 1024))
+        latency = float(params.get('latency_ms', 0)) / 1000
+        rate = float(params.get('rate', 0))
+
+        with self.counter_lock:
+            StreamRequestHandler.request_counter += 1
+            request_number = StreamRequestHandler.request_counter
+        if latency:
+            time.sleep(latency)
+
+        error_rate = float(params.get('error_rate', 0))
+        if error_rate:
+            rng = random.Random(f"{params.get('seed', 0)}:{url.path}:{request_number}")
+            if rng.random() < error_rate:
+                codes = [int(code) for code in params.get('error_codes', '503').split(',')]
+                self.send_error(rng.choice(codes))
+                return
+
+        start, end = self._requested_range(params, size)
+        if start is None:
+            start, end, status = 0, size - 1, 200
+        else:
+            if start >= size:
+                self.send_response(416)
+                self.send_header('Content-Range', f"bytes */{size}")
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            end, status = min(end, size - 1), 206
+
+        length = end - start + 1
+        self.send_response(status)
+        self.send_header('Content-Type', 'video/mp4' if 'video' in url.path else 'audio/mp4')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(length))
+        if status == 206:
+            self.send_header('Content-Range', f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if send_body:
+            self._write_body(start, length, rate)
+
+    def _serve_thumbnail(self, path: str, params, send_body: bool):
+        latency = float(params.get('latency_ms', 0)) / 1000
+        if latency:
+            time.sleep(latency)
+        body = thumbnail_png(path)
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _requested_range(self, params, size):
+        spec = params.get('range')
+        if spec is None:
+            header = self.headers.get('Range', '')
+            if not header.startswith('bytes='):
+                return None, None
+            spec = header[len('bytes='):].split(',')[0]
+        first, _, last = spec.partition('-')
+        if not first:
+            # Suffix range: the last N bytes
+            return max(size - int(last), 0), size - 1
+        return int(first), int(last) if last else size - 1
+
+    def _write_body(self, start: int, length: int, rate: float):
+        offset = start % WRITE_SIZE
+        sent = 0
+        started = time.perf_counter()
+        try:
+            while sent < length:
+                piece = BLOCK[offset:offset + min(WRITE_SIZE - offset, length - sent)]
+                self.wfile.write(piece)
+                sent += len(piece)
+                offset = 0
+                if rate:
+                    # Stay at or under the bandwidth cap
+                    ahead = sent / rate - (time.perf_counter() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            # pytubefix opens a full-length request just to read Content-Length
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """Start the server on a daemon thread and return it (server_address has the port)"""
+    server = ThreadingHTTPServer((host, port), StreamRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='StreamServer', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), StreamRequestHandler)
+    server.daemon_threads = True
+    print(server.server_address[1], flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
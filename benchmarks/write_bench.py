@@ -0,0 +1,176 @@
+"""Inline versus write-behind disk writes against a throttled filesystem.
+
+Streams synthetic media from the local stream server through pytubefix's
+own read loop (request.stream, as Stream.stream_to_buffer uses it) into a
+preallocated file on a throttled filesystem, once with chunks written
+inline by the read loop and once through main.WriteBehindFile:
+
+    python benchmarks/write_bench.py
+    python benchmarks/write_bench.py --disk network-share --size-mb 128 --range-mb 1
+    python benchmarks/write_bench.py --fsync close --buffer-mb 16
+
+The throttle wraps the real file: every write sleeps for a fixed latency
+plus its size over the disk bandwidth, which is how a busy disk or a
+network share looks to the writing thread. --range-mb sets pytubefix's
+request range, i.e. the chunk size the read loop hands over. Results go to
+benchmarks/results/write-<timestamp>.json.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import main  # noqa: E402
+import fake_youtube  # noqa: E402
+from run import environment, start_stream_server  # noqa: E402
+
+MB = 1024 * 1024
+
+# name -> (bandwidth in MB/s or 0 for unthrottled, latency per write in ms)
+DISK_PROFILES = {
+    'local': (0, 0),
+    'slow-disk': (60, 4),
+    'network-share': (100, 25),
+}
+MODES = ('inline', 'write-behind')
+
+
+class ThrottledFile:
+    """Real file whose writes take latency plus size over bandwidth"""
+
+    def __init__(self, file, bandwidth: float, latency: float):
+        self.file = file
+        self.bandwidth = bandwidth
+        self.latency = latency
+        self.writes = 0
+        self.bytes = 0
+
+    def write(self, data) -> int:
+        started = time.perf_counter()
+        written = self.file.write(data)
+        self.writes += 1
+        self.bytes += len(data)
+        delay = self.latency + (len(data) / self.bandwidth if self.bandwidth else 0)
+        remaining = delay - (time.perf_counter() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+        return written
+
+    def flush(self):
+        self.file.flush()
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+
+def run_once(url: str, size: int, path: str, mode: str, disk: str, args) -> dict:
+    import pytubefix.request
+    bandwidth, latency_ms = DISK_PROFILES[disk]
+    read_wait = write_wait = 0.0
+    writer = None
+    started = time.perf_counter()
+    with main.preallocated_file(path, size) as (file, _):
+        sink = throttled = ThrottledFile(file, bandwidth * MB, latency_ms / 1000)
+        if mode == 'write-behind':
+            sink = writer = main.WriteBehindFile(throttled, block_size=args.block_kb * 1024,
+                                                 high_water=args.buffer_mb * MB, fsync=args.fsync)
+        chunks = pytubefix.request.stream(url)
+        while True:
+            before_read = time.perf_counter()
+            chunk = next(chunks, None)
+            after_read = time.perf_counter()
+            read_wait += after_read - before_read
+            if chunk is None:
+                break
+            sink.write(chunk)
+            write_wait += time.perf_counter() - after_read
+        if writer is not None:
+            closing = time.perf_counter()
+            writer.close()
+            write_wait += time.perf_counter() - closing
+        elif args.fsync != 'never':
+            file.flush()
+            os.fsync(file.fileno())
+    elapsed = time.perf_counter() - started
+    if os.path.getsize(path) != size:
+        raise RuntimeError(f"Wrote {os.path.getsize(path)} bytes, expected {size}")
+    result = {
+        'wall_seconds': elapsed,
+        'throughput_mbps': size / MB / elapsed,
+        # Time the read loop spent writing is time the socket sat unread
+        'read_loop_write_seconds': write_wait,
+        'read_loop_network_seconds': read_wait,
+        'disk_writes': throttled.writes,
+        'mean_write_kb': throttled.bytes / max(1, throttled.writes) / 1024
+    }
+    if writer is not None:
+        result['backpressure_seconds'] = writer.stalled_seconds
+        result['peak_buffered_mb'] = writer.peak_buffered / MB
+    return result
+
+
+def summarize(samples: list) -> dict:
+    return {name: round(statistics.median(sample[name] for sample in samples), 4) for name in samples[0]}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Inline versus write-behind writes on a throttled filesystem")
+    parser.add_argument('--disk', action='append', choices=DISK_PROFILES, help="Disk profile (repeatable; default: all)")
+    parser.add_argument('--size-mb', type=int, default=64)
+    parser.add_argument('--bandwidth-mbps', type=float, default=800, help="Stream server rate in megabits/s")
+    parser.add_argument('--range-mb', type=float, default=9, help="pytubefix request range (default: its own 9 MB)")
+    parser.add_argument('--buffer-mb', type=int, default=32, help="Write-behind high-water mark")
+    parser.add_argument('--block-kb', type=int, default=1024, help="Write-behind write alignment")
+    parser.add_argument('--fsync', choices=main.WriteBehindFile.FSYNC_POLICIES, default='never')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Result file (default: benchmarks/results/write-<timestamp>.json)")
+    args = parser.parse_args()
+
+    import pytubefix.request
+    pytubefix.request.default_range_size = int(args.range_mb * MB)
+    output = os.path.abspath(args.output or os.path.join(
+        BENCHMARK_DIR, 'results', f"write-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    ))
+    size = args.size_mb * MB
+    server, base_url = start_stream_server()
+    work_dir = tempfile.mkdtemp(prefix='sytdl-write-bench-')
+    results = {}
+    try:
+        url = fake_youtube.stream_url(base_url, 'write-bench', size, rate=args.bandwidth_mbps * 1e6 / 8)
+        for disk in args.disk or DISK_PROFILES:
+            for mode in MODES:
+                samples = [run_once(url, size, os.path.join(work_dir, f"{disk}-{mode}.bin"), mode, disk, args)
+                           for _ in range(args.repeat)]
+                results.setdefault(disk, {})[mode] = summarize(samples)
+                print(json.dumps({'disk': disk, 'mode': mode, **results[disk][mode]}), flush=True)
+    finally:
+        server.terminate()
+        server.wait()
+        for name in os.listdir(work_dir):
+            os.remove(os.path.join(work_dir, name))
+        os.rmdir(work_dir)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'schema': 1,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'environment': environment(),
+            'config': {key: value for key, value in vars(args).items() if key not in ('output', 'disk')},
+            'disk_profiles': {name: {'bandwidth_mb_per_s': bandwidth, 'latency_ms': latency}
+                              for name, (bandwidth, latency) in DISK_PROFILES.items()},
+            'results': results
+        }, f, indent=2)
+    print(f"Results written to {output}", flush=True)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -26,6 +26,11 @@ def bundle_application():
         "--add-data", "download_history.json;." if system == "windows" else "download_history.json:."
     ]
 
+    # Modules main.py imports lazily are invisible to PyInstaller's import scan
+    for module in ("pytubefix", "pytubefix.innertube", "pytube", "youtubesearchpython",
+                   "requests", "humanize", "numpy"):
+        cmd.extend(["--hidden-import", module])
+
     # Platform specific options
     if system == "windows":
         cmd.extend([
@@ -1,36 +1,820 @@
-import asyncio
 import time
+STARTUP_STARTED = time.perf_counter()
 from PyQt6.QtWidgets import *
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QUrl, QTimer
-from PyQt6.QtGui import QIcon, QPixmap, QPalette, QColor, QCloseEvent
-from pytubefix import YouTube
+from PyQt6.QtCore import (Qt, QThread, pyqtSignal, QSize, QUrl, QTimer, QObject,
+                          QAbstractListModel, QModelIndex, QSortFilterProxyModel)
+from PyQt6.QtGui import (QIcon, QPixmap, QPalette, QColor, QCloseEvent, QFont, QFontMetrics,
+                         QShortcut, QKeySequence)
 import sys
 import os
 
-import requests
 import json
 from datetime import timedelta
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple
 import uuid
-
-from youtubesearchpython import VideosSearch
-from pytube import Playlist
-from concurrent.futures import ThreadPoolExecutor
+import bisect
+import copy
+import queue
+import sqlite3
+import itertools
+import functools
+import importlib
+import importlib.util
+import argparse
+import atexit
+import re
+from collections import OrderedDict, deque
+import contextlib
+import errno
+import hmac
+import secrets
+import shutil
+import signal
+import socket
+import tracemalloc
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 import threading
 from datetime import datetime
 import logging
-from typing import Optional, List, Tuple
+import logging.handlers
 from dataclasses import dataclass
-import humanize
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('youtube_downloader_debug.log'),
-        logging.StreamHandler()
-    ]
+
+
+class StartupProfiler:
+    """Collects import and init timings per component for --startup-profile"""
+
+    def __init__(self, budget_ms: float = 1000):
+        self.budget_ms = budget_ms
+        self.enabled = False
+        self.timings: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def record(self, component: str, seconds: float):
+        with self._lock:
+            self.timings.append((component, seconds * 1000))
+
+    def measure(self, component: str):
+        """Context manager timing the enclosed block under component"""
+        profiler = self
+
+        class _Measure:
+            def __enter__(self):
+                self.started = time.perf_counter()
+
+            def __exit__(self, *exc_info):
+                profiler.record(component, time.perf_counter() - self.started)
+                return False
+
+        return _Measure()
+
+    def report(self, window_shown_ms: float) -> str:
+        lines = ["Startup profile (ms):"]
+        with self._lock:
+            timings = list(self.timings)
+        for component, elapsed_ms in timings:
+            lines.append(f"  {elapsed_ms:9.1f}  {component}")
+        verdict = "within" if window_shown_ms <= self.budget_ms else "OVER"
+        lines.append(
+            f"  {window_shown_ms:9.1f}  window shown ({verdict} {self.budget_ms:.0f} ms budget)"
+        )
+        return "\n".join(lines)
+
+
+STARTUP_PROFILE = StartupProfiler()
+
+
+class LazyImport:
+    """Stand-in for a module, or an attribute of one, imported on first use.
+
+    Keeps pytubefix, requests and friends off the startup path; the first
+    attribute access or call does the real import.
+    """
+
+    def __init__(self, module_name: str, attribute: Optional[str] = None):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    started = time.perf_counter()
+                    target = importlib.import_module(self._module_name)
+                    if self._attribute:
+                        target = getattr(target, self._attribute)
+                    STARTUP_PROFILE.record(f"import {self._module_name}", time.perf_counter() - started)
+                    self._target = target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        name = f"{self._module_name}.{self._attribute}" if self._attribute else self._module_name
+        return f"<lazy {name}>"
+
+
+YouTube = LazyImport('pytubefix', 'YouTube')
+InnerTube = LazyImport('pytubefix.innertube', 'InnerTube')
+VideosSearch = LazyImport('youtubesearchpython', 'VideosSearch')
+Playlist = LazyImport('pytube', 'Playlist')
+requests = LazyImport('requests')
+asyncio = LazyImport('asyncio')
+humanize = LazyImport('humanize')
+np = LazyImport('numpy') if importlib.util.find_spec('numpy') else None
+
+# Imported in the background once the window is up, so first use doesn't pay for them
+WARM_IMPORTS = (YouTube, InnerTube, VideosSearch, requests)
+
+STARTUP_PROFILE.record("import main (eager modules)", time.perf_counter() - STARTUP_STARTED)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, for grep- and jq-friendly logs"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+LOG_SUBSYSTEMS = ('queue', 'download', 'search', 'cache', 'index', 'playlist', 'ui')
+DEFAULT_LOG_LEVEL = 'INFO'
+LOG_LEVELS_ENV = 'SYTDL_LOG_LEVELS'
+
+queue_log = logging.getLogger('sytdl.queue')
+download_log = logging.getLogger('sytdl.download')
+search_log = logging.getLogger('sytdl.search')
+cache_log = logging.getLogger('sytdl.cache')
+index_log = logging.getLogger('sytdl.index')
+playlist_log = logging.getLogger('sytdl.playlist')
+ui_log = logging.getLogger('sytdl.ui')
+
+_log_listener = None
+_log_level_overrides: Dict[str, str] = {}
+
+
+def parse_log_levels(spec: str) -> Dict[str, str]:
+    """Parse 'queue=DEBUG,search=WARNING'; a bare level applies to every subsystem"""
+    levels = {}
+    for part in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, level = part.rpartition('=')
+        levels[name.strip() or 'sytdl'] = level.strip().upper()
+    return levels
+
+
+def apply_log_levels(levels: Dict[str, str]):
+    """Set per-subsystem levels; keys are subsystem names ('queue') or 'sytdl' for all.
+
+    Levels given on the command line or in SYTDL_LOG_LEVELS take precedence.
+    """
+    levels = {**levels, **_log_level_overrides}
+    for name, level in sorted(levels.items(), key=lambda item: item[0] != 'sytdl'):
+        logger_name = name if name == 'sytdl' or name.startswith('sytdl.') else f"sytdl.{name}"
+        logging.getLogger(logger_name).setLevel(level)
+
+
+def configure_logging(levels: Optional[Dict[str, str]] = None, console_level: str = 'WARNING',
+                      log_dir: str = '.'):
+    """Route all records through a queue to a background thread that does the I/O.
+
+    Callers only pay for a level check, plus a queue put for enabled records.
+    The listener writes a rotating JSON-lines debug log, the rotating queue
+    log and the console.
+    """
+    global _log_listener, _log_level_overrides
+
+    if _log_listener is not None:
+        _log_listener.stop()
+
+    debug_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, 'youtube_downloader_debug.jsonl'),
+        maxBytes=5 * 1024 * 1024, backupCount=3, encoding='utf-8', delay=True
+    )
+    debug_handler.setFormatter(JsonLinesFormatter())
+
+    text_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    queue_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, 'download_queue.log'),
+        maxBytes=2 * 1024 * 1024, backupCount=2, encoding='utf-8', delay=True
+    )
+    queue_handler.setFormatter(text_formatter)
+    queue_handler.addFilter(logging.Filter('sytdl.queue'))
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(text_formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(queue.SimpleQueue()))
+    root.setLevel(logging.WARNING)
+
+    logging.getLogger('sytdl').setLevel(DEFAULT_LOG_LEVEL)
+    _log_level_overrides = dict(levels or {})
+    apply_log_levels({})
+
+    _log_listener = logging.handlers.QueueListener(
+        root.handlers[0].queue, debug_handler, queue_handler, console_handler,
+        respect_handler_level=True
+    )
+    _log_listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+class _Metric:
+    """Base for labeled metrics; values are keyed by the tuple of label values"""
+    TYPE = 'untyped'
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _label_text(self, key: Tuple, extra: str = '') -> str:
+        pairs = [f'{name}="{self._escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+    def samples(self) -> Dict[Tuple, object]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Counter(_Metric):
+    TYPE = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{self._label_text(key)} {value}" for key, value in self.samples().items()]
+
+    def snapshot(self):
+        return {','.join(key) or 'total': value for key, value in self.samples().items()}
+
+
+class Gauge(Counter):
+    """Settable value; set_function makes it computed at collection time instead"""
+    TYPE = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._function = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def remove(self, **labels):
+        with self._lock:
+            self._values.pop(self._key(labels), None)
+
+    def set_function(self, function):
+        """function returns a number, or a dict of label-value tuple -> number"""
+        self._function = function
+
+    def samples(self) -> Dict[Tuple, object]:
+        if self._function is None:
+            return super().samples()
+        try:
+            value = self._function()
+        except Exception as e:
+            ui_log.debug("Metric %s collection failed: %s", self.name, e)
+            return {}
+        return value if isinstance(value, dict) else {(): value}
+
+
+class Histogram(_Metric):
+    TYPE = 'histogram'
+    DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            series['counts'][bucket] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def samples(self) -> Dict[Tuple, object]:
+        with self._lock:
+            return {key: {**series, 'counts': list(series['counts'])} for key, series in self._values.items()}
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, series in self.samples().items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                labels = self._label_text(key, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {series['sum']}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {series['count']}")
+        return lines
+
+    def snapshot(self):
+        return {
+            ','.join(key) or 'total': {
+                'count': series['count'],
+                'sum': series['sum'],
+                'buckets': {str(bound): count for bound, count in zip(self.buckets, series['counts'])}
+            }
+            for key, series in self.samples().items()
+        }
+
+
+class MetricsRegistry:
+    """Process-wide metrics, exposed in Prometheus text format and as JSON snapshots"""
+    # POST actions need this header carrying the token the server writes to TOKEN_PATH
+    TOKEN_HEADER = 'X-SYTDL-Token'
+    TOKEN_PATH = 'control_token'
+    LOCAL_HOSTS = ('127.0.0.1', 'localhost')
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._server = None
+        self._actions: Dict[str, object] = {}
+        self._token = None
+
+    def _register(self, metric_class, name: str, help_text: str, labelnames=(), **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = metric_class(name, help_text, tuple(labelnames), **kwargs)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames=()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames=()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames=(), **kwargs) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, **kwargs)
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict:
+        return {
+            'timestamp': time.time(),
+            'metrics': {name: metric.snapshot() for name, metric in self._metrics.items()}
+        }
+
+    def write_snapshot(self, path: str):
+        """Write a JSON snapshot atomically, so readers never see a partial file"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temp_path, path)
+
+    def add_action(self, path: str, function):
+        """Expose function (returning a text reply) as POST path on the local endpoint"""
+        self._actions[path] = function
+
+    def _write_token(self):
+        """Create this session's action token, readable by the current user only"""
+        self._token = secrets.token_urlsafe(32)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.TOKEN_PATH)
+        fd = os.open(self.TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(self._token)
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """Serve /metrics on a daemon thread; localhost only by default"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self._reply(body, 'text/plain; version=0.0.4; charset=utf-8')
+
+            def do_POST(self):
+                action = registry._actions.get(self.path.split('?')[0])
+                if action is None:
+                    self.send_error(404)
+                    return
+                if not self._authorized():
+                    self.send_error(403)
+                    return
+                try:
+                    body = str(action()).encode('utf-8')
+                except Exception as e:
+                    self.send_error(500, str(e))
+                    return
+                self._reply(body, 'text/plain; charset=utf-8')
+
+            def _authorized(self) -> bool:
+                """Reject browser requests (cross-origin POSTs, DNS rebinding) and callers without the token"""
+                if self.headers.get('Origin') is not None:
+                    return False
+                host = (self.headers.get('Host') or '').rsplit(':', 1)[0]
+                if host not in registry.LOCAL_HOSTS:
+                    return False
+                token = self.headers.get(registry.TOKEN_HEADER) or ''
+                return registry._token is not None and hmac.compare_digest(token, registry._token)
+
+            def _reply(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                ui_log.debug("Metrics request: " + format, *args)
+
+        # Bind before touching the token file: an instance that cannot bind must not
+        # replace (and later delete) the token of the instance that owns the port
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._server.daemon_threads = True
+        try:
+            self._write_token()
+        except OSError as e:
+            # Without a token file no client could authenticate, so actions stay off
+            self._token = None
+            ui_log.warning("Control actions disabled, token not written: %s", e)
+        threading.Thread(target=self._server.serve_forever, name='MetricsServer', daemon=True).start()
+        return self._server.server_address
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._token is not None:
+            self._token = None
+            with contextlib.suppress(OSError):
+                os.remove(self.TOKEN_PATH)
+
+
+METRICS = MetricsRegistry()
+
+DOWNLOAD_BYTES = METRICS.counter('sytdl_download_bytes_total', "Bytes received by downloads", ('quality',))
+DOWNLOAD_RATE = METRICS.gauge(
+    'sytdl_download_bytes_per_second', "Current rate of each active download", ('download_id',)
+)
+DOWNLOAD_RATE_TOTAL = METRICS.gauge('sytdl_download_total_bytes_per_second', "Sum of active download rates")
+DOWNLOAD_RATE_TOTAL.set_function(lambda: sum(DOWNLOAD_RATE.samples().values()))
+DOWNLOAD_TTFB = METRICS.histogram(
+    'sytdl_download_ttfb_seconds',
+    "Time from a stream request to its first received chunk (chunk-granular)", ('quality',)
+)
+DOWNLOAD_OUTCOMES = METRICS.counter('sytdl_downloads_total', "Finished downloads by outcome", ('outcome',))
+DOWNLOAD_RETRIES = METRICS.counter('sytdl_download_retries_total', "Download retries by error class", ('error_class',))
+METADATA_LATENCY = METRICS.histogram(
+    'sytdl_metadata_resolve_seconds', "Time to resolve a video's metadata and stream manifest", ('source',)
+)
+QUEUE_DEPTH = METRICS.gauge('sytdl_queue_depth', "Queue items per state", ('state',))
+SEARCH_LATENCY = METRICS.histogram('sytdl_search_page_seconds', "Time to fetch one page of search results")
+THUMBNAIL_LATENCY = METRICS.histogram('sytdl_thumbnail_fetch_seconds', "Time to fetch one thumbnail")
+DOWNLOAD_WRITE_STALL = METRICS.counter(
+    'sytdl_download_write_stall_seconds_total', "Time downloads waited on a full write-behind buffer"
+)
+DISK_WRITE_LATENCY = METRICS.histogram('sytdl_disk_write_seconds', "Time per coalesced write to a download file")
+CACHE_REQUESTS = METRICS.counter(
+    'sytdl_cache_requests_total', "Cache lookups by cache and result", ('cache', 'result')
 )
 
+
+def classify_error(error: str) -> str:
+    """Coarse error class for metrics labels; keeps label cardinality bounded"""
+    text = str(error).lower()
+    if 'no space left' in text or 'disk quota' in text:
+        return 'disk_full'
+    if '403' in text or 'forbidden' in text:
+        return 'http_403'
+    if '429' in text or 'too many requests' in text:
+        return 'rate_limited'
+    if 'timed out' in text or 'timeout' in text:
+        return 'timeout'
+    if 'connection' in text or 'network' in text or 'resolve' in text or 'urlopen' in text:
+        return 'network'
+    if 'unavailable' in text or 'private' in text or 'members' in text or re.search(r'\bage\b|age.restricted', text):
+        return 'unavailable'
+    if 'no suitable' in text or 'no stream' in text:
+        return 'no_stream'
+    return 'other'
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'category', 'args', 'started')
+
+    def __init__(self, tracer, name: str, category: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.started = self.tracer.now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        event = {
+            'name': self.name, 'cat': self.category, 'ph': 'X',
+            'ts': self.started, 'dur': self.tracer.now_us() - self.started
+        }
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        if self.args:
+            event['args'] = self.args
+        self.tracer.emit(event)
+        return False
+
+
+class Tracer:
+    """Records spans in the Chrome trace event format (chrome://tracing, Perfetto).
+
+    Disabled by default: span() then hands back one shared no-op context
+    manager, so instrumented code pays a flag check and nothing else.
+    """
+    _NULL_SPAN = contextlib.nullcontext()
+
+    def __init__(self, max_events: int = 500000):
+        self.enabled = False
+        self.path = None
+        self._events = deque(maxlen=max_events)
+        self._named_threads = set()
+        self._pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    def start(self, path: str):
+        self.path = path
+        self.enabled = True
+        atexit.register(self.export)
+
+    def now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def span(self, name: str, category: str = 'sytdl', **args):
+        if not self.enabled:
+            return self._NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def traced(self, category: str = 'sytdl', name: Optional[str] = None):
+        """Decorator form of span(), named after the function by default"""
+        def decorator(function):
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Span(self, span_name, category, {}):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def begin_async(self, name: str, span_id, category: str = 'sytdl', **args):
+        """Start a span that ends on another thread or call, e.g. time spent queued"""
+        if self.enabled:
+            self.emit({'name': name, 'cat': category, 'ph': 'b', 'id': str(span_id),
+                       'ts': self.now_us(), 'args': args})
+
+    def end_async(self, name: str, span_id, category: str = 'sytdl'):
+        if self.enabled:
+            self.emit({'name': name, 'cat': category, 'ph': 'e', 'id': str(span_id), 'ts': self.now_us()})
+
+    def instant(self, name: str, category: str = 'sytdl', **args):
+        if self.enabled:
+            self.emit({'name': name, 'cat': category, 'ph': 'i', 's': 't', 'ts': self.now_us(), 'args': args})
+
+    def emit(self, event: Dict):
+        tid = threading.get_ident()
+        if tid not in self._named_threads:
+            self._named_threads.add(tid)
+            self._events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                'args': {'name': threading.current_thread().name}
+            })
+        event['pid'] = self._pid
+        event['tid'] = tid
+        self._events.append(event)
+
+    def export(self, path: Optional[str] = None):
+        """Write everything recorded so far as a trace JSON file"""
+        path = path or self.path
+        if not path:
+            return
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': list(self._events), 'displayTimeUnit': 'ms'}, f)
+
+
+TRACER = Tracer()
+
+
+class SamplingProfiler:
+    """Start/stop stack sampling of every thread in a running instance.
+
+    A daemon thread snapshots sys._current_frames() on an interval, so the
+    GUI thread and download workers are covered without restarting under a
+    profiler. Stopping writes per-thread reports, collapsed stacks (for
+    flame graph tools) and a tracemalloc diff to a timestamped folder.
+    """
+
+    def __init__(self, output_dir: str = 'profiles', interval: float = 0.005):
+        self.output_dir = output_dir
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._stacks: Dict[int, Dict[Tuple, int]] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._started_at = None
+        self._tracemalloc_start = None
+        self._owns_tracemalloc = False
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> str:
+        with self._lock:
+            if self._thread is not None:
+                return "Profiling already running"
+            self._stacks = {}
+            self._thread_names = {}
+            self._started_at = datetime.now()
+            self._owns_tracemalloc = not tracemalloc.is_tracing()
+            if self._owns_tracemalloc:
+                tracemalloc.start()
+            self._tracemalloc_start = tracemalloc.take_snapshot()
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._sample_loop, name='SamplingProfiler', daemon=True)
+            self._thread.start()
+        ui_log.info("Profiling started")
+        return "Profiling started"
+
+    def stop(self) -> str:
+        """Stop sampling and write the reports; returns the report folder"""
+        with self._lock:
+            if self._thread is None:
+                return "Profiling not running"
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+            tracemalloc_end = tracemalloc.take_snapshot()
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+            folder = os.path.join(self.output_dir, self._started_at.strftime('%Y%m%d-%H%M%S'))
+            self._write_reports(folder, tracemalloc_end)
+        ui_log.info("Profiling stopped; reports in %s", folder)
+        return folder
+
+    def toggle(self) -> str:
+        return self.stop() if self.active else self.start()
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread in threading.enumerate():
+                self._thread_names.setdefault(thread.ident, thread.name)
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, os.path.basename(code.co_filename), code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                samples = self._stacks.setdefault(thread_id, {})
+                key = tuple(stack)
+                samples[key] = samples.get(key, 0) + 1
+
+    def _write_reports(self, folder: str, tracemalloc_end):
+        os.makedirs(folder, exist_ok=True)
+        duration = (datetime.now() - self._started_at).total_seconds()
+        summary = [f"Duration: {duration:.1f} s, interval: {self.interval * 1000:.0f} ms"]
+        collapsed = []
+
+        for thread_id, stacks in self._stacks.items():
+            name = self._thread_names.get(thread_id, 'thread')
+            total = sum(stacks.values())
+            own, inclusive = {}, {}
+            for stack, count in stacks.items():
+                frame_names = [f"{function} ({filename}:{line})" for function, filename, line in stack]
+                own[frame_names[-1]] = own.get(frame_names[-1], 0) + count
+                for frame_name in set(frame_names):
+                    inclusive[frame_name] = inclusive.get(frame_name, 0) + count
+                collapsed.append(f"{name};{';'.join(frame_names)} {count}")
+
+            lines = [f"Thread {name} ({thread_id}): {total} samples", "", "Self samples:"]
+            for frame_name, count in sorted(own.items(), key=lambda item: -item[1])[:40]:
+                lines.append(f"  {count:7d} {count / total:6.1%}  {frame_name}")
+            lines += ["", "Inclusive samples:"]
+            for frame_name, count in sorted(inclusive.items(), key=lambda item: -item[1])[:40]:
+                lines.append(f"  {count:7d} {count / total:6.1%}  {frame_name}")
+            safe_name = re.sub(r'[^\w.-]+', '_', name)
+            with open(os.path.join(folder, f"thread-{safe_name}-{thread_id}.txt"), 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+            summary.append(f"{total:7d} samples  {name} ({thread_id})")
+
+        with open(os.path.join(folder, 'collapsed-stacks.txt'), 'w') as f:
+            f.write('\n'.join(collapsed) + '\n')
+        with open(os.path.join(folder, 'summary.txt'), 'w') as f:
+            f.write('\n'.join(summary) + '\n')
+
+        diff = tracemalloc_end.compare_to(self._tracemalloc_start, 'lineno')
+        with open(os.path.join(folder, 'tracemalloc-diff.txt'), 'w') as f:
+            f.write(f"Top allocation changes over {duration:.1f} s\n")
+            for stat in diff[:50]:
+                f.write(f"{stat}\n")
+
+
+PROFILER = SamplingProfiler()
+METRICS.add_action('/profile/start', PROFILER.start)
+METRICS.add_action('/profile/stop', PROFILER.stop)
+METRICS.add_action('/profile/toggle', PROFILER.toggle)
+
+
+def install_profile_signal(callback):
+    """Call callback on the GUI thread when SIGUSR2 arrives (POSIX only).
+
+    Python runs signal handlers only between bytecodes, which may not
+    happen while Qt sits in its event loop; the wakeup fd plus a socket
+    notifier gets the event loop to react immediately.
+    """
+    if not hasattr(signal, 'SIGUSR2'):
+        return None
+    from PyQt6.QtCore import QSocketNotifier
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    writer.setblocking(False)
+    signal.set_wakeup_fd(writer.fileno())
+    signal.signal(signal.SIGUSR2, lambda signum, frame: None)
+
+    def on_wakeup():
+        try:
+            received = reader.recv(64)
+        except OSError:
+            return
+        if signal.SIGUSR2 in received:
+            callback()
+
+    notifier = QSocketNotifier(reader.fileno(), QSocketNotifier.Type.Read)
+    notifier.activated.connect(on_wakeup)
+    # Keep the sockets alive with the notifier
+    notifier.sockets = (reader, writer)
+    return notifier
+
+
 @dataclass
 class VideoQueueItem:
     url: str
@@ -47,6 +831,266 @@ class VideoQueueItem:
     download_speed: str = ''
     eta: str = ''
     download_id: Optional[str] = None
+    expected_bytes: int = 0  # disk space to reserve; estimated once when queued
+
+
+QUALITY_OPTIONS = [
+    'High Quality Pro Plus',
+    '720p',
+    '480p',
+    '360p',
+    'Audio Only'
+]
+
+
+class VideoURL:
+    """Canonical forms of YouTube video and playlist URLs.
+
+    youtu.be/<id>, watch?v=<id>&t=10, shorts/<id> and embed/<id> all name the
+    same video; queue, cache, index and history lookups key on the canonical
+    form so they agree on what counts as the same video.
+    """
+    HOST_PATTERN = re.compile(r'(?:^|[/.])(?:youtube\.com|youtube-nocookie\.com|youtu\.be)(?:[/:?#]|$)', re.I)
+    VIDEO_ID_PATTERN = re.compile(
+        r'(?:[?&#]v=|youtu\.be/|/(?:shorts|embed|live|v|e)/)([\w-]{11})(?![\w-])'
+    )
+    PLAYLIST_ID_PATTERN = re.compile(r'[?&#]list=([\w-]+)')
+    URL_PATTERN = re.compile(
+        r'(?:https?://)?(?:[\w-]+\.)*(?:youtube\.com|youtube-nocookie\.com|youtu\.be)/[^\s<>"\',]+',
+        re.I
+    )
+    WATCH_URL = 'https://www.youtube.com/watch?v={}'
+    PLAYLIST_URL = 'https://www.youtube.com/playlist?list={}'
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def parse(url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (video_id, playlist_id) for a YouTube URL; either may be None"""
+        if not url or not VideoURL.HOST_PATTERN.search(url):
+            return None, None
+        video_match = VideoURL.VIDEO_ID_PATTERN.search(url)
+        playlist_match = VideoURL.PLAYLIST_ID_PATTERN.search(url)
+        return (
+            video_match.group(1) if video_match else None,
+            playlist_match.group(1) if playlist_match else None
+        )
+
+    @staticmethod
+    def is_youtube(text: str) -> bool:
+        return bool(VideoURL.URL_PATTERN.search(text))
+
+    @staticmethod
+    def video_id(url: str) -> Optional[str]:
+        return VideoURL.parse(url)[0]
+
+    @staticmethod
+    def playlist_id(url: str) -> Optional[str]:
+        return VideoURL.parse(url)[1]
+
+    @staticmethod
+    def is_playlist(url: str) -> bool:
+        """True for playlist-only URLs; watch?v=<id>&list=... is treated as the video"""
+        video_id, playlist_id = VideoURL.parse(url)
+        return video_id is None and playlist_id is not None
+
+    @staticmethod
+    def canonical(url: str) -> str:
+        """Canonical watch or playlist URL; non-YouTube input is returned stripped"""
+        video_id, playlist_id = VideoURL.parse(url.strip())
+        if video_id:
+            return VideoURL.WATCH_URL.format(video_id)
+        if playlist_id:
+            return VideoURL.PLAYLIST_URL.format(playlist_id)
+        return url.strip()
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Cache and dedupe key: the video ID when there is one"""
+        video_id, playlist_id = VideoURL.parse(url.strip())
+        return video_id or (f"list:{playlist_id}" if playlist_id else url.strip())
+
+    @staticmethod
+    def canonical_many(text: str) -> List[str]:
+        """Extract every YouTube URL from pasted text, canonicalized and deduplicated in order"""
+        seen = set()
+        urls = []
+        for match in VideoURL.URL_PATTERN.finditer(text):
+            url = VideoURL.canonical(match.group(0))
+            if url not in seen and VideoURL.parse(url) != (None, None):
+                seen.add(url)
+                urls.append(url)
+        return urls
+
+
+class ThumbnailLoader(QObject):
+    """Fetches thumbnails on a small shared pool and keeps a bounded least-recently-used pixmap cache"""
+    thumbnail_ready = pyqtSignal(str)
+    _data_loaded = pyqtSignal(str, bytes)
+
+    def __init__(self, size: QSize = QSize(120, 68), max_workers: int = 4,
+                 max_cached: int = 500, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.max_cached = max_cached
+        self._cache: OrderedDict = OrderedDict()
+        self._pending = set()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._data_loaded.connect(self._store_thumbnail)
+
+    def get(self, url: str) -> Optional[QPixmap]:
+        """Return the cached thumbnail, scheduling a fetch on a miss"""
+        if not url:
+            return None
+        pixmap = self._cache.get(url)
+        if pixmap is not None:
+            self._cache.move_to_end(url)
+            CACHE_REQUESTS.inc(cache='thumbnail', result='hit')
+            return pixmap
+        if url not in self._pending and not self._closed:
+            CACHE_REQUESTS.inc(cache='thumbnail', result='miss')
+            self._pending.add(url)
+            self._executor.submit(self._fetch, url)
+        return None
+
+    def shutdown(self):
+        """Drop queued fetches; fetches already running finish without emitting"""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch(self, url: str):
+        started = time.perf_counter()
+        try:
+            data = requests.get(url, timeout=10).content
+            THUMBNAIL_LATENCY.observe(time.perf_counter() - started)
+        except Exception as e:
+            ui_log.error("Thumbnail load error: %s", e)
+            data = b''
+        if not self._closed:
+            self._data_loaded.emit(url, data)
+
+    def _store_thumbnail(self, url: str, data: bytes):
+        # Pixmaps must be created on the GUI thread
+        self._pending.discard(url)
+        if self._closed:
+            return
+        pixmap = QPixmap()
+        if data:
+            pixmap.loadFromData(data)
+            pixmap = pixmap.scaled(
+                self.size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        if len(self._cache) >= self.max_cached:
+            self._cache.popitem(last=False)
+        self._cache[url] = pixmap
+        self.thumbnail_ready.emit(url)
+
+
+class PlaylistVideoModel(QAbstractListModel):
+    """List model over resolved playlist entries with a per-row check state"""
+    VideoRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, thumbnail_loader: Optional[ThumbnailLoader] = None, parent=None):
+        super().__init__(parent)
+        self._videos: List[Dict] = []
+        self._indices: List[int] = []
+        self._checked: List[bool] = []
+        # thumbnail url -> playlist indices; rows shift on insert, playlist indices do not
+        self._thumbnail_indices: Dict[str, List[int]] = {}
+        self.thumbnail_loader = thumbnail_loader
+        if thumbnail_loader:
+            thumbnail_loader.thumbnail_ready.connect(self._thumbnail_ready)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._videos)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        video = self._videos[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{video['playlist_index'] + 1}. {video['title']} ({video['duration']})"
+        elif role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if self._checked[index.row()] else Qt.CheckState.Unchecked
+        elif role == Qt.ItemDataRole.DecorationRole and self.thumbnail_loader:
+            # Only requested for rows the view actually paints
+            return self.thumbnail_loader.get(video.get('thumbnail_url', ''))
+        elif role == self.VideoRole:
+            return video
+        return None
+
+    def setData(self, index: QModelIndex, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        self._checked[index.row()] = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return (Qt.ItemFlag.ItemIsEnabled |
+                Qt.ItemFlag.ItemIsSelectable |
+                Qt.ItemFlag.ItemIsUserCheckable)
+
+    def add_video(self, video: Dict, checked: bool = True):
+        """Insert a video in playlist order (entries may arrive out of order)"""
+        row = bisect.bisect(self._indices, video['playlist_index'])
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._indices.insert(row, video['playlist_index'])
+        self._videos.insert(row, video)
+        self._checked.insert(row, checked)
+        self._thumbnail_indices.setdefault(video.get('thumbnail_url'), []).append(video['playlist_index'])
+        self.endInsertRows()
+
+    def set_videos(self, videos: List[Dict], checked: bool = True):
+        """Replace the model contents in a single reset"""
+        self.beginResetModel()
+        self._videos = sorted(videos, key=lambda v: v['playlist_index'])
+        self._indices = [video['playlist_index'] for video in self._videos]
+        self._checked = [checked] * len(self._videos)
+        self._thumbnail_indices = {}
+        for video in self._videos:
+            self._thumbnail_indices.setdefault(video.get('thumbnail_url'), []).append(video['playlist_index'])
+        self.endResetModel()
+
+    def set_range_checked(self, first: int, last: int, checked: bool):
+        """Check or uncheck rows first..last inclusive with a single change signal"""
+        if first > last or not self._videos:
+            return
+        self._checked[first:last + 1] = [checked] * (last - first + 1)
+        self._emit_checked_changed(first, last)
+
+    def set_all_checked(self, checked: bool):
+        self.set_range_checked(0, len(self._checked) - 1, checked)
+
+    def invert_checked(self):
+        if not self._checked:
+            return
+        self._checked = [not checked for checked in self._checked]
+        self._emit_checked_changed(0, len(self._checked) - 1)
+
+    def checked_count(self) -> int:
+        return self._checked.count(True)
+
+    def checked_videos(self) -> List[Dict]:
+        return [video for video, checked in zip(self._videos, self._checked) if checked]
+
+    def total_length(self) -> int:
+        return sum(video.get('length', 0) for video in self._videos)
+
+    def _emit_checked_changed(self, first: int, last: int):
+        self.dataChanged.emit(
+            self.index(first), self.index(last), [Qt.ItemDataRole.CheckStateRole]
+        )
+
+    def _thumbnail_ready(self, url: str):
+        for playlist_index in self._thumbnail_indices.get(url, ()):
+            index = self.index(bisect.bisect_left(self._indices, playlist_index))
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
 
 
 class PlaylistSelectionDialog(QDialog):
@@ -54,6 +1098,9 @@ class PlaylistSelectionDialog(QDialog):
         super().__init__(parent)
         self.playlist_info = playlist_info
         self.selected_videos = []
+        self._loaded_duration = 0
+        self.thumbnail_loader = ThumbnailLoader(QSize(64, 36), parent=self)
+        self.video_model = PlaylistVideoModel(self.thumbnail_loader, self)
         self.setup_ui()
 
     def setup_ui(self):
@@ -63,44 +1110,43 @@ class PlaylistSelectionDialog(QDialog):
 
         # Info header
         info_layout = QHBoxLayout()
-        total_videos = self.playlist_info['total_videos']
-        total_duration = timedelta(seconds=self.playlist_info['total_duration'])
-
-        info_label = QLabel(
-            f"Total Videos: {total_videos}\n"
-            f"Total Duration: {str(total_duration)}\n"
-            f"Playlist: {self.playlist_info['title']}"
-        )
-        info_layout.addWidget(info_label)
+        self.info_label = QLabel()
+        info_layout.addWidget(self.info_label)
         layout.addLayout(info_layout)
 
-        # Video list
-        self.video_list = QListWidget()
-        self.video_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        # Video list, only visible rows are ever painted
+        self.video_model.set_videos(self.playlist_info['videos'])
+        self._loaded_duration = self.video_model.total_length()
 
-        for video in self.playlist_info['videos']:
-            item = QListWidgetItem(
-                f"{video['playlist_index'] + 1}. {video['title']} ({video['duration']})"
-            )
-            item.setData(Qt.ItemDataRole.UserRole, video)
-            self.video_list.addItem(item)
-            item.setSelected(True)  # Select all by default
+        self.video_view = QListView()
+        self.video_view.setUniformItemSizes(True)
+        self.video_view.setIconSize(QSize(64, 36))
+        self.video_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.video_view.setModel(self.video_model)
+        self.video_model.dataChanged.connect(self._update_info)
+        self._update_info()
 
-        layout.addWidget(self.video_list)
+        layout.addWidget(self.video_view)
 
         # Selection controls
         controls_layout = QHBoxLayout()
         select_all_btn = QPushButton("Select All")
         deselect_all_btn = QPushButton("Deselect All")
         invert_selection_btn = QPushButton("Invert Selection")
+        check_highlighted_btn = QPushButton("Check Highlighted")
+        uncheck_highlighted_btn = QPushButton("Uncheck Highlighted")
 
         select_all_btn.clicked.connect(self.select_all)
         deselect_all_btn.clicked.connect(self.deselect_all)
         invert_selection_btn.clicked.connect(self.invert_selection)
+        check_highlighted_btn.clicked.connect(lambda: self.set_highlighted_checked(True))
+        uncheck_highlighted_btn.clicked.connect(lambda: self.set_highlighted_checked(False))
 
         controls_layout.addWidget(select_all_btn)
         controls_layout.addWidget(deselect_all_btn)
         controls_layout.addWidget(invert_selection_btn)
+        controls_layout.addWidget(check_highlighted_btn)
+        controls_layout.addWidget(uncheck_highlighted_btn)
         layout.addLayout(controls_layout)
 
         # Quality selection
@@ -127,25 +1173,57 @@ class PlaylistSelectionDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
 
+    def done(self, result: int):
+        # Every way of closing the dialog ends here; stop thumbnail fetches before it is deleted
+        self.thumbnail_loader.shutdown()
+        super().done(result)
+
+    def set_playlist_header(self, header: Dict):
+        """Update title and expected video count once the playlist page is parsed"""
+        self.playlist_info['title'] = header['title']
+        self.playlist_info['total_videos'] = header['total_videos']
+        self.setWindowTitle(f"Playlist: {header['title']}")
+        self._update_info()
+
+    def add_video(self, video: Dict):
+        """Add a resolved video, checked by default"""
+        self._loaded_duration += video.get('length', 0)
+        self.video_model.add_video(video)
+        self._update_info()
+
+    def _update_info(self):
+        total_videos = max(self.playlist_info['total_videos'], self.video_model.rowCount())
+        loaded = self.video_model.rowCount()
+        progress = f" (loaded {loaded})" if loaded < total_videos else ""
+        total_duration = timedelta(seconds=self._loaded_duration)
+
+        self.info_label.setText(
+            f"Total Videos: {total_videos}{progress} | Selected: {self.video_model.checked_count()}\n"
+            f"Total Duration: {str(total_duration)}\n"
+            f"Playlist: {self.playlist_info['title']}"
+        )
+
     def select_all(self):
-        for i in range(self.video_list.count()):
-            self.video_list.item(i).setSelected(True)
+        self.video_model.set_all_checked(True)
 
     def deselect_all(self):
-        for i in range(self.video_list.count()):
-            self.video_list.item(i).setSelected(False)
+        self.video_model.set_all_checked(False)
 
     def invert_selection(self):
-        for i in range(self.video_list.count()):
-            item = self.video_list.item(i)
-            item.setSelected(not item.isSelected())
+        self.video_model.invert_checked()
+
+    def set_highlighted_checked(self, checked: bool):
+        """Apply the check state to every highlighted range in one pass per range"""
+        for selection_range in self.video_view.selectionModel().selection():
+            self.video_model.set_range_checked(
+                selection_range.top(), selection_range.bottom(), checked
+            )
 
     def get_selected_videos(self) -> List[VideoQueueItem]:
         selected_videos = []
         quality = self.quality_combo.currentText()
 
-        for item in self.video_list.selectedItems():
-            video_data = item.data(Qt.ItemDataRole.UserRole)
+        for video_data in self.video_model.checked_videos():
             video_item = VideoQueueItem(
                 url=video_data['url'],
                 title=video_data['title'],
@@ -167,11 +1245,272 @@ class DownloadState:
     COMPLETED = 'completed'
     FAILED = 'failed'
     RETRYING = 'retrying'
+    WAITING = 'waiting'  # pending, but short of disk space
+
+
+class DiskSpaceReservations:
+    """Bytes promised to running downloads, so new ones only start if they fit.
+
+    Free space alone is not enough: three downloads admitted at once would each
+    see the whole disk free. Reservations are counted per device and shrink as
+    downloads preallocate their files.
+    """
+
+    def __init__(self, margin_bytes: int = 256 * 1024 * 1024):
+        self.margin_bytes = margin_bytes
+        self._reserved: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, quality: str) -> str:
+        return f"{VideoURL.key(url)}|{quality}"
+
+    @staticmethod
+    def _existing(path: str) -> str:
+        """Nearest existing ancestor of path; the download folder may not exist yet"""
+        path = os.path.abspath(path)
+        while not os.path.exists(path) and os.path.dirname(path) != path:
+            path = os.path.dirname(path)
+        return path
+
+    def available(self, path: str) -> Tuple[int, int]:
+        """(device, free bytes less outstanding reservations and the margin) for path"""
+        path = self._existing(path)
+        device = os.stat(path).st_dev
+        with self._lock:
+            reserved = sum(nbytes for dev, nbytes in self._reserved.values() if dev == device)
+        return device, shutil.disk_usage(path).free - reserved - self.margin_bytes
+
+    def hold(self, key: str, device: int, nbytes: int):
+        """Reserve nbytes on device under key; the caller has checked they fit"""
+        with self._lock:
+            self._reserved[key] = (device, nbytes)
+
+    def reserve(self, key: str, path: str, nbytes: int) -> bool:
+        """Reserve nbytes on path's device under key; False if they do not fit"""
+        self.release(key)
+        device, available = self.available(path)
+        if nbytes > available:
+            return False
+        self.hold(key, device, nbytes)
+        return True
+
+    def consume(self, key: str, nbytes: int):
+        """Shrink a reservation by bytes now allocated on disk, which free space already reflects"""
+        with self._lock:
+            if key in self._reserved:
+                device, reserved = self._reserved[key]
+                self._reserved[key] = (device, max(0, reserved - nbytes))
+
+    def release(self, key: str):
+        with self._lock:
+            self._reserved.pop(key, None)
+
+    def reserved(self) -> int:
+        with self._lock:
+            return sum(nbytes for _, nbytes in self._reserved.values())
+
+
+@functools.lru_cache(maxsize=None)
+def _native_fallocate():
+    """libc's fallocate(2) wrapper, or None off Linux.
+
+    os.posix_fallocate is not used: where the filesystem lacks fallocate, glibc
+    emulates it by writing every block, a full extra pass over NFS, SMB or FUSE.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    import ctypes
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        function = getattr(libc, 'fallocate64', None) or libc.fallocate
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64)
+    function.restype = ctypes.c_int
+    return function
+
+
+def fallocate(fd: int, size: int) -> bool:
+    """Allocate size bytes for fd natively; False where the platform or filesystem cannot"""
+    function = _native_fallocate()
+    if function is None:
+        return False
+    import ctypes
+    if function(fd, 0, 0, size) == 0:
+        return True
+    error = ctypes.get_errno()
+    if error in (errno.EOPNOTSUPP, errno.ENOSYS, errno.EINVAL):
+        return False
+    raise OSError(error, os.strerror(error))
+
+
+@contextlib.contextmanager
+def preallocated_file(path: str, size: int):
+    """Open path for writing with size bytes allocated up front; yields the file and the bytes allocated.
+
+    A full disk fails here, before anything is fetched, and the filesystem can
+    lay the file out contiguously. size 0 skips allocation. The file is cut to
+    what was written on close.
+    """
+    file = open(path, 'wb')
+    allocated = 0
+    try:
+        if size > 0:
+            try:
+                if fallocate(file.fileno(), size):
+                    allocated = size
+                else:
+                    # No native fallocate here (some network and FUSE filesystems); write without it
+                    download_log.debug("Preallocation not supported for %s", path)
+            except OSError:
+                file.close()
+                os.remove(path)
+                raise
+        yield file, allocated
+    finally:
+        if not file.closed:
+            file.truncate(file.tell())
+            file.close()
+
+
+class WriteBehindFile:
+    """Write-only file wrapper that moves disk writes off the network read loop.
+
+    write() queues the chunk and returns; a writer thread joins queued chunks
+    into block_size-aligned writes. Once high_water bytes are waiting, write()
+    blocks until the writer has drained half of them, so a slow disk slows the
+    download instead of growing memory. Writer errors are raised from the next
+    write() or from close().
+
+    fsync is 'never', 'close' (once the last write is done) or 'interval'
+    (every fsync_interval bytes, and at close).
+    """
+    FSYNC_POLICIES = ('never', 'close', 'interval')
+
+    def __init__(self, file, block_size: int = 1024 * 1024, high_water: int = 32 * 1024 * 1024,
+                 fsync: str = 'never', fsync_interval: int = 64 * 1024 * 1024):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.file = file
+        self.block_size = block_size
+        # Backpressure waits for the writer, which only writes whole blocks
+        self.high_water = max(high_water, 2 * block_size)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.stalled_seconds = 0.0
+        self.peak_buffered = 0
+        self._chunks = deque()
+        self._buffered = 0
+        self._closed = False
+        self._error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='WriteBehind', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+            return False
+        # Keep the exception that is already propagating; a writer error is only logged
+        try:
+            self.close()
+        except Exception as close_error:
+            if close_error is not exc:
+                download_log.warning("Write-behind close failed during %s: %s", exc_type.__name__, close_error)
+        return False
+
+    def write(self, chunk) -> int:
+        with self._condition:
+            if self._buffered >= self.high_water and self._error is None:
+                started = time.perf_counter()
+                while self._buffered > self.high_water // 2 and self._error is None:
+                    self._condition.wait()
+                stalled = time.perf_counter() - started
+                self.stalled_seconds += stalled
+                DOWNLOAD_WRITE_STALL.inc(stalled)
+            if self._error is not None:
+                raise self._error
+            self._chunks.append(chunk)
+            self._buffered += len(chunk)
+            self.peak_buffered = max(self.peak_buffered, self._buffered)
+            self._condition.notify_all()
+        return len(chunk)
+
+    def close(self):
+        """Write everything queued, fsync per policy and stop the writer"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _write(self, data, unsynced: int) -> int:
+        started = time.perf_counter()
+        self.file.write(data)
+        DISK_WRITE_LATENCY.observe(time.perf_counter() - started)
+        unsynced += len(data)
+        if self.fsync == 'interval' and unsynced >= self.fsync_interval:
+            self._sync()
+            unsynced = 0
+        return unsynced
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def _run(self):
+        pending = bytearray()
+        unsynced = 0
+        try:
+            while True:
+                with self._condition:
+                    while not self._chunks and not self._closed:
+                        self._condition.wait()
+                    if not self._chunks:
+                        break
+                    chunks = list(self._chunks)
+                    self._chunks.clear()
+                for chunk in chunks:
+                    pending += chunk
+                # Whole blocks only; the remainder waits for more data so every write stays aligned
+                aligned = len(pending) - len(pending) % self.block_size
+                if aligned:
+                    with memoryview(pending)[:aligned] as block:
+                        unsynced = self._write(block, unsynced)
+                    del pending[:aligned]
+                with self._condition:
+                    self._buffered -= aligned
+                    self._condition.notify_all()
+            if pending:
+                self._write(pending, unsynced)
+            if self.fsync != 'never':
+                self._sync()
+        except BaseException as e:
+            with self._condition:
+                self._error = e
+                self._condition.notify_all()
 
 
 class SmartQueueManager:
+    # Rough media rates for sizing a download whose manifest is not resolved yet
+    EXPECTED_BYTES_PER_SECOND = {
+        'High Quality Pro Plus': 1_000_000,
+        '720p': 250_000,
+        '480p': 150_000,
+        '360p': 100_000,
+        'Audio Only': 20_000
+    }
+    UNKNOWN_DURATION_SECONDS = 600
+
     def __init__(self):
-        print("DEBUG: Initializing SmartQueueManager")
+        queue_log.debug("Initializing SmartQueueManager")
         self.active_downloads: Dict[str, VideoQueueItem] = {}
         self.pending_downloads: List[VideoQueueItem] = []
         self.paused_downloads: List[VideoQueueItem] = []
@@ -183,44 +1522,84 @@ class SmartQueueManager:
         self.retry_delay_base = 5
 
         self.download_progress = {}
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()  # _process_queue is re-entered from retry and failure handling
         self.event_callbacks = []
 
-        # Initialize logging
-        self.logger = logging.getLogger('SmartQueue')
-        self.setup_logging()
+        # Manifests for the next few pending items are resolved ahead of time
+        self.manifest_prefetcher = None
+        self.prefetch_depth = 3
+
+        # Downloads start only when their expected size fits on the download disk
+        self.disk_space: Optional[DiskSpaceReservations] = DiskSpaceReservations()
+        self.disk_recheck_ms = 30000
+        self._disk_recheck_pending = False
+        # Lower bound on the expected size of any pending item; below it no pending item can fit
+        self._smallest_pending = 0
+        self._processing = False
+        # (video key, quality) -> item for everything not yet completed, failed or cancelled
+        self._queued_index: Dict[Tuple[str, str], VideoQueueItem] = {}
+        # id(item) -> item for items waiting on a retry timer
+        self._scheduled_retries: Dict[int, VideoQueueItem] = {}
+
+        # Handlers (including download_queue.log) are installed once by configure_logging
+        self.logger = queue_log
         self.download_threads = {}
+        QUEUE_DEPTH.set_function(self._queue_depths)
+
+    def _queue_depths(self) -> Dict[Tuple, int]:
+        return {
+            (DownloadState.PENDING,): len(self.pending_downloads),
+            # Items between attempts (retry backoff or a disk-space wait) sit in no list
+            (DownloadState.RETRYING,): len(self._scheduled_retries),
+            (DownloadState.ACTIVE,): len(self.active_downloads),
+            (DownloadState.PAUSED,): len(self.paused_downloads),
+            (DownloadState.COMPLETED,): len(self.completed_downloads),
+            (DownloadState.FAILED,): len(self.failed_downloads)
+        }
 
-
-    def setup_logging(self):
-        self.logger.setLevel(logging.DEBUG)
-        handler = logging.FileHandler('download_queue.log')
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-
-    def add_download(self, video_item: VideoQueueItem):
-        """Add a new download to the queue with smart prioritization"""
-        print(f"DEBUG: Adding download for {video_item.title}")
+    @TRACER.traced('queue')
+    def add_download(self, video_item: VideoQueueItem) -> bool:
+        """Add a new download to the queue with smart prioritization; False if it is already queued"""
+        self.logger.debug("Adding download for %s", video_item.title)
         try:
+            video_item.url = VideoURL.canonical(video_item.url)
             with self._lock:
+                existing = self.find_download(video_item.url, video_item.quality)
+                if existing is not None:
+                    self.logger.info("Already queued: %s (%s)", video_item.title, existing.status)
+                    return False
                 video_item.priority = self._calculate_priority(video_item)
-                self.pending_downloads.append(video_item)
-                self._sort_queue()
-                self.logger.info(f"Added new download: {video_item.title}")
+                self._index_add(video_item)
+                self._add_pending(video_item)
+                TRACER.begin_async('queued', id(video_item), 'queue', title=video_item.title)
+                self.logger.info("Added new download: %s", video_item.title)
 
             # Process queue in a separate thread to avoid blocking
-            QTimer.singleShot(0, self._process_queue)
+            self._schedule(0, self._process_queue)
             self._notify_listeners('queue_updated', video_item)
-            print(f"DEBUG: Successfully added download for {video_item.title}")
+            self.logger.debug("Successfully added download for %s", video_item.title)
+            return True
 
         except Exception as e:
-            print(f"DEBUG: Error adding download: {str(e)}")
-            self.logger.error(f"Error adding download: {str(e)}")
+            self.logger.error("Error adding download: %s", e)
             raise
 
+    def find_download(self, url: str, quality: Optional[str] = None) -> Optional[VideoQueueItem]:
+        """Return the queued, active, paused or retrying item for the same video, if any"""
+        key = VideoURL.key(url)
+        if quality is not None:
+            return self._queued_index.get((key, quality))
+        return next((item for (item_key, _), item in self._queued_index.items() if item_key == key), None)
+
+    def _index_add(self, video_item: VideoQueueItem):
+        self._queued_index[(VideoURL.key(video_item.url), video_item.quality)] = video_item
+
+    def _index_remove(self, video_item: VideoQueueItem):
+        """Forget an item that reached a final state, so the same video can be queued again"""
+        index_key = (VideoURL.key(video_item.url), video_item.quality)
+        if self._queued_index.get(index_key) is video_item:
+            del self._queued_index[index_key]
+
     def _calculate_priority(self, video_item: VideoQueueItem) -> int:
         """Calculate download priority using multiple factors"""
         priority = 0
@@ -264,84 +1643,218 @@ class SmartQueueManager:
         """Sort the pending downloads based on priority"""
         self.pending_downloads.sort(key=lambda x: x.priority, reverse=True)
 
+    @TRACER.traced('queue')
     def _process_queue(self):
         """Process the download queue intelligently"""
-        print("DEBUG: Processing queue")
+        self.logger.debug("Processing queue")
         try:
             with self._lock:
-                while (len(self.active_downloads) < self.max_concurrent_downloads and
-                       len(self.pending_downloads) > 0):
-                    next_download = self.pending_downloads.pop(0)
-                    print(f"DEBUG: Starting download for {next_download.title}")
-                    self._start_download(next_download)
+                if self._processing:
+                    # A failed start re-enters through the error handler; the list is mid-scan
+                    self._schedule(0, self._process_queue)
+                    return
+                self._processing = True
+                try:
+                    self._admit_pending()
+                finally:
+                    self._processing = False
 
+                if self.manifest_prefetcher and self.pending_downloads:
+                    self.manifest_prefetcher.prefetch(
+                        [item.url for item in self.pending_downloads[:self.prefetch_depth]]
+                    )
+
+        except Exception as e:
+            self.logger.error("Error processing queue: %s", e)
+
+    def _admit_pending(self):
+        """Start pending items in order while slots are free and their expected size fits on disk"""
+        # One free-space reading per pass; each start is taken off it locally
+        device, available = self._available_disk_space()
+        waiting = []
+        scanned = 0
+        for next_download in self.pending_downloads:
+            if (len(self.active_downloads) >= self.max_concurrent_downloads or
+                    available < self._smallest_pending):
+                break
+            scanned += 1
+            if device is not None and not next_download.expected_bytes:
+                next_download.expected_bytes = self._expected_bytes(next_download)
+            needed = next_download.expected_bytes
+            if needed > available:
+                # Smaller items further down may still fit
+                waiting.append(next_download)
+                self._mark_waiting(next_download)
+                continue
+            if device is not None:
+                self.disk_space.hold(DiskSpaceReservations.key(next_download.url, next_download.quality),
+                                     device, needed)
+                available -= needed
+            self.logger.debug("Starting download for %s", next_download.title)
+            self._start_download(next_download)
+        if scanned == len(self.pending_downloads):
+            # Every pending item was looked at, so the bound can be exact again
+            self._smallest_pending = min((item.expected_bytes for item in waiting), default=0)
+        # Waiting items keep their place at the front of the queue
+        self.pending_downloads[:scanned] = waiting
+        if self.pending_downloads and len(self.active_downloads) < self.max_concurrent_downloads:
+            self._schedule_disk_recheck()
+
+    def _schedule(self, delay_ms: int, callback):
+        """Run callback on the event loop after delay_ms"""
+        QTimer.singleShot(delay_ms, callback)
+
+    def _download_settings(self) -> Dict:
+        main_window = MainWindow.instance()
+        if not main_window:
+            raise Exception("Main window instance not found")
+        return main_window.download_manager.settings
+
+    def _download_path(self) -> str:
+        return self._download_settings()['download_path']
+
+    def _write_options(self) -> Dict:
+        """WriteBehindFile options from settings: write_buffer_mb and fsync_policy"""
+        settings = self._download_settings()
+        buffer_mb = settings.get('write_buffer_mb', 32)
+        if isinstance(buffer_mb, bool) or not isinstance(buffer_mb, (int, float)) or buffer_mb <= 0:
+            self.logger.warning("Invalid write_buffer_mb %r, using 32", buffer_mb)
+            buffer_mb = 32
+        fsync = settings.get('fsync_policy', 'never')
+        if fsync not in WriteBehindFile.FSYNC_POLICIES:
+            self.logger.warning("Invalid fsync_policy %r, using 'never'", fsync)
+            fsync = 'never'
+        return {'high_water': int(buffer_mb * 1024 * 1024), 'fsync': fsync}
+
+    def _expected_bytes(self, video_item: VideoQueueItem) -> int:
+        """Stream sizes from a prefetched manifest, else an estimate from duration and quality"""
+        yt = self.manifest_prefetcher.peek(video_item.url) if self.manifest_prefetcher else None
+        if yt is not None:
+            try:
+                # _filesize, not filesize: the property sends a HEAD request when the size is unknown
+                sizes = [stream._filesize for stream in VideoDownloader.planned_streams(yt.streams, video_item.quality)]
+                if sizes and all(sizes):
+                    return sum(sizes)
+            except Exception as e:
+                self.logger.debug("No stream sizes for %s: %s", video_item.title, e)
+        seconds = self._parse_duration(video_item.duration) or self.UNKNOWN_DURATION_SECONDS
+        rate = self.EXPECTED_BYTES_PER_SECOND.get(video_item.quality, self.EXPECTED_BYTES_PER_SECOND['720p'])
+        return seconds * rate
+
+    def _add_pending(self, video_item: VideoQueueItem):
+        """Insert into pending_downloads by priority, after equal ones, sizing the item for admission"""
+        if self.disk_space is not None:
+            if not video_item.expected_bytes:
+                video_item.expected_bytes = self._expected_bytes(video_item)
+            self._smallest_pending = min(self._smallest_pending or video_item.expected_bytes,
+                                         video_item.expected_bytes)
+        # Binary insertion instead of a full sort per add keeps bulk adds linear
+        bisect.insort_right(self.pending_downloads, video_item, key=lambda queued: -queued.priority)
+
+    def _available_disk_space(self) -> Tuple[Optional[int], float]:
+        """(device, bytes available for new downloads); unlimited when admission is off or the check fails"""
+        if self.disk_space is None:
+            return None, float('inf')
+        try:
+            return self.disk_space.available(self._download_path())
         except Exception as e:
-            print(f"DEBUG: Error processing queue: {str(e)}")
-            self.logger.error(f"Error processing queue: {str(e)}")
+            # Let downloads run and report their own errors rather than hold them back
+            self.logger.warning("Disk space check failed: %s", e)
+            return None, float('inf')
+
+    def _mark_waiting(self, video_item: VideoQueueItem):
+        if video_item.status != DownloadState.WAITING:
+            video_item.status = DownloadState.WAITING
+            self.logger.warning("Waiting for disk space: %s needs about %.0f MB",
+                                video_item.title, video_item.expected_bytes / 1024 / 1024)
+            self._notify_listeners('download_waiting', video_item)
+
+    def _release_disk_space(self, video_item: VideoQueueItem):
+        if self.disk_space is not None:
+            self.disk_space.release(DiskSpaceReservations.key(video_item.url, video_item.quality))
+
+    def _schedule_disk_recheck(self):
+        """Try waiting items again later; finishing downloads and deleted files free space without telling us"""
+        if not self._disk_recheck_pending:
+            self._disk_recheck_pending = True
+            self._schedule(self.disk_recheck_ms, self._disk_recheck)
+
+    def _disk_recheck(self):
+        self._disk_recheck_pending = False
+        self._process_queue()
 
+    @TRACER.traced('queue')
     def _start_download(self, video_item: VideoQueueItem):
-        print(f"DEBUG: Starting download process for {video_item.title}")
+        self.logger.debug("Starting download process for %s", video_item.title)
+        TRACER.end_async('queued', id(video_item), 'queue')
         try:
-            main_window = MainWindow.instance()
-            if not main_window:
-                raise Exception("Main window instance not found")
-
-            download_path = main_window.download_manager.settings['download_path']
-            print(f"DEBUG: Download path: {download_path}")
-
-            # Create downloader
-            downloader = VideoDownloader(
-                video_item.url,
-                video_item.quality,
-                download_path
-            )
-
-            # Store downloader reference
-            video_item.downloader = downloader
-
-            # Create new thread for the downloader
-            thread = QThread()
-            self.download_threads[video_item.title] = thread
-            downloader.moveToThread(thread)
-
-            # Connect thread cleanup
-            thread.finished.connect(thread.deleteLater)
-
-            # Connect signals with explicit connections
-            downloader.progress.connect(
-                lambda p, s: self._update_progress(video_item, p, s)
-            )
-            downloader.finished.connect(
-                lambda f, d: self._handle_download_success(video_item, f, d)
-            )
-            downloader.error.connect(
-                lambda e: self._handle_download_error(video_item, e)
-            )
-
-            # Connect cleanup handlers
-            downloader.finished.connect(lambda: self._cleanup_download(video_item))
-            downloader.error.connect(lambda: self._cleanup_download(video_item))
+            download_id, start = self._launch_download(video_item)
 
             # Start the download
             video_item.status = DownloadState.ACTIVE
-            video_item.download_id = downloader.download_id
+            video_item.download_id = download_id
             self.active_downloads[video_item.download_id] = video_item
+            start()
 
-            # Start thread
-            thread.started.connect(downloader.run)
-            thread.start()
-
-            print(f"DEBUG: Download thread started for {video_item.title}")
+            self.logger.debug("Download thread started for %s", video_item.title)
             self._notify_listeners('download_started', video_item)
 
         except Exception as e:
-            print(f"DEBUG: Error starting download: {str(e)}")
-            self.logger.error(f"Failed to start download: {str(e)}")
+            self.logger.error("Failed to start download: %s", e)
             self._handle_download_error(video_item, str(e))
 
+    def _launch_download(self, video_item: VideoQueueItem) -> Tuple[str, Callable[[], None]]:
+        """Create the downloader and its thread; return the download ID and a function that starts it"""
+        download_path = self._download_path()
+        self.logger.debug("Download path: %s", download_path)
+
+        # Create downloader
+        downloader = VideoDownloader(
+            video_item.url,
+            video_item.quality,
+            download_path,
+            self.manifest_prefetcher,
+            self.disk_space,
+            self._write_options(),
+            # Retries continue in the same folder, so completed streams are not fetched again
+            video_item.download_id if video_item.status in (DownloadState.RETRYING, DownloadState.WAITING) else None,
+            preallocate=bool(self._download_settings().get('preallocate', True))
+        )
+
+        # Store downloader reference
+        video_item.downloader = downloader
+
+        # Create new thread for the downloader
+        thread = QThread()
+        self.download_threads[video_item.title] = thread
+        downloader.moveToThread(thread)
+
+        # Connect thread cleanup
+        thread.finished.connect(thread.deleteLater)
+
+        # Connect signals with explicit connections
+        downloader.progress.connect(
+            lambda p, s: self._update_progress(video_item, p, s)
+        )
+        downloader.finished.connect(
+            lambda f, d: self._handle_download_success(video_item, f, d)
+        )
+        downloader.error.connect(
+            lambda e: self._handle_download_error(video_item, e)
+        )
+
+        # Connect cleanup handlers
+        downloader.finished.connect(lambda: self._cleanup_download(video_item))
+        downloader.error.connect(lambda: self._cleanup_download(video_item))
+        downloader.cancelled.connect(lambda: self._cleanup_download(video_item))
+
+        thread.started.connect(downloader.run)
+        return downloader.download_id, thread.start
+
+    @TRACER.traced('queue')
     def _cleanup_download(self, video_item: VideoQueueItem):
         """Clean up thread and resources after download"""
-        print(f"DEBUG: Cleaning up download for {video_item.title}")
+        self.logger.debug("Cleaning up download for %s", video_item.title)
         try:
             if video_item.title in self.download_threads:
                 thread = self.download_threads[video_item.title]
@@ -349,13 +1862,13 @@ class SmartQueueManager:
                     thread.quit()
                     thread.wait()
                 del self.download_threads[video_item.title]
-                print(f"DEBUG: Thread cleaned up for {video_item.title}")
+                self.logger.debug("Thread cleaned up for %s", video_item.title)
 
             # Process next download if any
-            QTimer.singleShot(0, self._process_queue)
+            self._schedule(0, self._process_queue)
 
         except Exception as e:
-            print(f"DEBUG: Cleanup error: {str(e)}")
+            self.logger.error("Cleanup error: %s", e)
 
     def _update_progress(self, video_item: VideoQueueItem, progress: int, status: str):
         """Update download progress and status"""
@@ -374,42 +1887,66 @@ class SmartQueueManager:
         except:
             return '', ''
 
+    @TRACER.traced('queue')
     def _handle_download_success(self, video_item: VideoQueueItem, folder_path: str, download_id: str):
         """Handle successful download completion"""
-        print(f"DEBUG: Handling successful download for {video_item.title}")
+        self.logger.debug("Handling successful download for %s", video_item.title)
         try:
             with self._lock:
+                if video_item.status == DownloadState.FAILED:
+                    # Cancelled while the downloader was finishing
+                    return
                 if download_id in self.active_downloads:
                     del self.active_downloads[download_id]
+                self._release_disk_space(video_item)
 
                 video_item.status = DownloadState.COMPLETED
                 self.completed_downloads.append(video_item)
+                self._index_remove(video_item)
+                DOWNLOAD_OUTCOMES.inc(outcome='completed')
 
-                self.logger.info(f"Download completed: {video_item.title}")
+                self.logger.info("Download completed: %s", video_item.title)
                 self._notify_listeners('download_completed', video_item)
 
-            print(f"DEBUG: Success handled for {video_item.title}")
+            self.logger.debug("Success handled for %s", video_item.title)
 
         except Exception as e:
-            print(f"DEBUG: Error handling success: {str(e)}")
-            self.logger.error(f"Error handling download success: {str(e)}")
+            self.logger.error("Error handling download success: %s", e)
 
 
+    @TRACER.traced('queue')
     def _handle_download_error(self, video_item: VideoQueueItem, error: str):
         """Handle download errors with retry logic"""
         with self._lock:
-            if video_item.retry_count < self.max_retry_attempts:
+            if video_item.status == DownloadState.FAILED:
+                # Cancelled items must not come back through a retry
+                return
+            self._release_disk_space(video_item)
+            if classify_error(error) == 'disk_full':
+                # A full disk is not the download's fault: wait for space without spending a retry
+                video_item.status = DownloadState.WAITING
+                self.active_downloads.pop(video_item.download_id, None)
+                self.logger.warning("Out of disk space, waiting to retry: %s", video_item.title)
+                self._notify_listeners('download_waiting', video_item)
+                self._scheduled_retries[id(video_item)] = video_item
+                self._schedule(self.disk_recheck_ms, lambda: self._scheduled_retry(video_item))
+            elif video_item.retry_count < self.max_retry_attempts:
                 video_item.retry_count += 1
                 video_item.status = DownloadState.RETRYING
+                # Free the slot while waiting; _retry_download queues the item again
+                self.active_downloads.pop(video_item.download_id, None)
+                DOWNLOAD_RETRIES.inc(error_class=classify_error(error))
 
                 retry_delay = self.retry_delay_base * (2 ** (video_item.retry_count - 1))
                 self.logger.warning(
-                    f"Retrying download ({video_item.retry_count}/{self.max_retry_attempts}): {video_item.title}"
+                    "Retrying download (%s/%s): %s",
+                    video_item.retry_count, self.max_retry_attempts, video_item.title
                 )
 
-                QTimer.singleShot(
+                self._scheduled_retries[id(video_item)] = video_item
+                self._schedule(
                     retry_delay * 1000,
-                    lambda: self._retry_download(video_item)
+                    lambda: self._scheduled_retry(video_item)
                 )
             else:
                 if video_item.download_id in self.active_downloads:
@@ -417,21 +1954,49 @@ class SmartQueueManager:
 
                 video_item.status = DownloadState.FAILED
                 self.failed_downloads.append(video_item)
+                self._index_remove(video_item)
+                DOWNLOAD_OUTCOMES.inc(outcome='failed')
 
-                self.logger.error(f"Download failed: {video_item.title} - {error}")
+                self.logger.error("Download failed: %s - %s", video_item.title, error)
                 self._notify_listeners('download_failed', video_item)
                 self._process_queue()
 
+    def _scheduled_retry(self, video_item: VideoQueueItem):
+        """Timer callback for a retry or disk-space wait; does nothing if the item was cancelled meanwhile"""
+        self._scheduled_retries.pop(id(video_item), None)
+        if video_item.status in (DownloadState.RETRYING, DownloadState.WAITING):
+            self._retry_download(video_item)
+
+    @TRACER.traced('queue')
     def _retry_download(self, video_item: VideoQueueItem):
         """Retry a failed download"""
         with self._lock:
             video_item.progress = 0
             video_item.download_speed = ''
             video_item.eta = ''
-            self.pending_downloads.append(video_item)
-            self._sort_queue()
+            TRACER.begin_async('queued', id(video_item), 'queue', title=video_item.title,
+                               retry=video_item.retry_count)
+            self._add_pending(video_item)
             self._process_queue()
 
+    def retry_failed(self, video_item: VideoQueueItem) -> bool:
+        """Queue a failed or cancelled item again with a fresh retry budget; False if that is not possible"""
+        with self._lock:
+            if video_item.status != DownloadState.FAILED:
+                return False
+            existing = self.find_download(video_item.url, video_item.quality)
+            if existing is not None:
+                self.logger.info("Already queued: %s (%s)", video_item.title, existing.status)
+                return False
+            if video_item in self.failed_downloads:
+                self.failed_downloads.remove(video_item)
+            video_item.retry_count = 0
+            video_item.status = DownloadState.PENDING
+            self._index_add(video_item)
+            self._notify_listeners('queue_updated', video_item)
+            self._retry_download(video_item)
+            return True
+
     def pause_download(self, download_id: str):
         """Pause a specific download"""
         with self._lock:
@@ -440,6 +2005,7 @@ class SmartQueueManager:
                 video_item.status = DownloadState.PAUSED
                 self.paused_downloads.append(video_item)
                 del self.active_downloads[download_id]
+                self._release_disk_space(video_item)
                 self._notify_listeners('download_paused', video_item)
 
     def resume_download(self, download_id: str):
@@ -448,8 +2014,8 @@ class SmartQueueManager:
             for video_item in self.paused_downloads:
                 if video_item.download_id == download_id:
                     self.paused_downloads.remove(video_item)
-                    self.pending_downloads.append(video_item)
-                    self._sort_queue()
+                    TRACER.begin_async('queued', id(video_item), 'queue', title=video_item.title)
+                    self._add_pending(video_item)
                     self._notify_listeners('download_resumed', video_item)
                     break
 
@@ -457,11 +2023,32 @@ class SmartQueueManager:
         """Cancel a download"""
         with self._lock:
             if download_id in self.active_downloads:
-                video_item = self.active_downloads[download_id]
-                video_item.status = DownloadState.FAILED
-                self.failed_downloads.append(video_item)
-                del self.active_downloads[download_id]
-                self._notify_listeners('download_cancelled', video_item)
+                self.cancel_item(self.active_downloads[download_id])
+
+    def cancel_item(self, video_item: VideoQueueItem):
+        """Cancel an active, pending, waiting or retrying item"""
+        with self._lock:
+            if video_item.status in (DownloadState.COMPLETED, DownloadState.FAILED):
+                return
+            if video_item.download_id in self.active_downloads:
+                del self.active_downloads[video_item.download_id]
+                # Stops the transfer at its next chunk; the worker then emits cancelled, not finished or error
+                downloader = getattr(video_item, 'downloader', None)
+                if downloader is not None:
+                    downloader.cancel()
+            elif video_item in self.pending_downloads:
+                self.pending_downloads.remove(video_item)
+                TRACER.end_async('queued', id(video_item), 'queue')
+            elif video_item in self.paused_downloads:
+                self.paused_downloads.remove(video_item)
+            self._scheduled_retries.pop(id(video_item), None)
+            # Retrying and waiting items sit in no list; the FAILED status stops their scheduled retry
+            video_item.status = DownloadState.FAILED
+            self.failed_downloads.append(video_item)
+            self._index_remove(video_item)
+            self._release_disk_space(video_item)
+            DOWNLOAD_OUTCOMES.inc(outcome='cancelled')
+            self._notify_listeners('download_cancelled', video_item)
 
     def add_listener(self, callback):
         """Add event listener"""
@@ -474,80 +2061,693 @@ class SmartQueueManager:
 
     def _notify_listeners(self, event_type: str, data=None):
         """Notify all listeners of queue events"""
-        print(f"DEBUG: Notifying listeners of {event_type}")
+        self.logger.debug("Notifying listeners of %s", event_type)
         try:
             for callback in self.event_callbacks:
                 try:
                     callback(event_type, data)
                 except Exception as e:
-                    print(f"DEBUG: Listener callback error: {str(e)}")
-                    self.logger.error(f"Error in listener callback: {str(e)}")
+                    self.logger.error("Error in listener callback: %s", e)
         except Exception as e:
-            print(f"DEBUG: Notification error: {str(e)}")
-            self.logger.error(f"Error notifying listeners: {str(e)}")
+            self.logger.error("Error notifying listeners: %s", e)
+
+
+class VideoIndex:
+    """Local SQLite FTS5 index over every video seen in searches, playlists and downloads.
+
+    Inserts are queued and written in batches by a background thread, so callers
+    never wait on disk. Reads use one connection per thread. Where SQLite was
+    built without FTS5, search falls back to LIKE over the plain table.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS videos (
+            id INTEGER PRIMARY KEY,
+            video_key TEXT UNIQUE NOT NULL,
+            url TEXT NOT NULL,
+            title TEXT NOT NULL,
+            channel TEXT NOT NULL DEFAULT '',
+            duration TEXT NOT NULL DEFAULT '',
+            views TEXT NOT NULL DEFAULT '',
+            publish_date TEXT NOT NULL DEFAULT '',
+            thumbnail_url TEXT NOT NULL DEFAULT '',
+            seen_at REAL NOT NULL,
+            downloaded INTEGER NOT NULL DEFAULT 0
+        );
+    """
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+            title, channel, content='videos', content_rowid='id', tokenize='unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS videos_ai AFTER INSERT ON videos BEGIN
+            INSERT INTO videos_fts(rowid, title, channel) VALUES (new.id, new.title, new.channel);
+        END;
+        CREATE TRIGGER IF NOT EXISTS videos_ad AFTER DELETE ON videos BEGIN
+            INSERT INTO videos_fts(videos_fts, rowid, title, channel)
+            VALUES ('delete', old.id, old.title, old.channel);
+        END;
+        CREATE TRIGGER IF NOT EXISTS videos_au AFTER UPDATE ON videos BEGIN
+            INSERT INTO videos_fts(videos_fts, rowid, title, channel)
+            VALUES ('delete', old.id, old.title, old.channel);
+            INSERT INTO videos_fts(rowid, title, channel) VALUES (new.id, new.title, new.channel);
+        END;
+    """
+    UPSERT = """
+        INSERT INTO videos (video_key, url, title, channel, duration, views, publish_date,
+                            thumbnail_url, seen_at, downloaded)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(video_key) DO UPDATE SET
+            url = excluded.url,
+            title = excluded.title,
+            channel = CASE WHEN excluded.channel != '' THEN excluded.channel ELSE channel END,
+            duration = excluded.duration,
+            views = CASE WHEN excluded.views != '' THEN excluded.views ELSE views END,
+            publish_date = CASE WHEN excluded.publish_date != '' THEN excluded.publish_date
+                                ELSE publish_date END,
+            thumbnail_url = excluded.thumbnail_url,
+            seen_at = excluded.seen_at,
+            downloaded = MAX(downloaded, excluded.downloaded)
+    """
+
+    FTS_TRIGGERS = ('videos_ai', 'videos_ad', 'videos_au')
+
+    def __init__(self, path: str = 'video_index.db'):
+        self.path = path
+        self._queue = queue.Queue()
+        self._local = threading.local()
+        with sqlite3.connect(self.path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(self.SCHEMA)
+            self.full_text = self._setup_full_text(connection)
+        self._writer = threading.Thread(target=self._write_loop, name='VideoIndexWriter', daemon=True)
+        self._writer.start()
+
+    def _setup_full_text(self, connection: sqlite3.Connection) -> bool:
+        """Create the FTS5 table and its triggers; False if this SQLite has no FTS5"""
+        try:
+            # An existing videos_fts table would satisfy IF NOT EXISTS without loading the module
+            connection.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(text)")
+            connection.execute("DROP TABLE temp.fts5_probe")
+        except sqlite3.OperationalError as e:
+            index_log.warning("SQLite has no FTS5 (%s); video index search falls back to LIKE", e)
+            # Triggers left by an FTS5 build would make every insert fail here
+            for trigger in self.FTS_TRIGGERS:
+                connection.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            return False
+        triggers = {row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )}
+        connection.executescript(self.FTS_SCHEMA)
+        if not triggers.issuperset(self.FTS_TRIGGERS):
+            # New, or last written without FTS5: index whatever the table already holds
+            connection.execute("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')")
+        return True
 
+    def add(self, videos: List[Dict], downloaded: bool = False):
+        """Queue videos for indexing; returns immediately"""
+        now = time.time()
+        rows = [
+            (
+                video.get('video_id') or VideoURL.key(video['url']),
+                VideoURL.canonical(video['url']),
+                video.get('title', ''),
+                video.get('channel') or '',
+                video.get('duration') or '',
+                video.get('views') or '',
+                video.get('publish_date') or '',
+                video.get('thumbnail_url') or '',
+                now,
+                int(downloaded)
+            )
+            for video in videos if video.get('url')
+        ]
+        if rows:
+            self._queue.put(rows)
+
+    def _write_loop(self):
+        connection = sqlite3.connect(self.path)
+        while True:
+            rows = self._queue.get()
+            if rows is None:
+                break
+            # Coalesce whatever else is already waiting into the same transaction
+            while True:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    self._queue.put(None)
+                    break
+                rows.extend(more)
+            try:
+                with connection:
+                    connection.executemany(self.UPSERT, rows)
+            except Exception as e:
+                index_log.error("Video index write error: %s", e)
+        connection.close()
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path)
+            connection.row_factory = sqlite3.Row
+        return connection
+
+    def search(self, text: str, limit: int = 50) -> List[Dict]:
+        """Prefix search over titles and channels, best matches (and downloads) first"""
+        tokens = re.findall(r'\w+', text.lower())
+        if not tokens:
+            return []
+        rows = self._full_text_search(tokens, limit) if self.full_text else self._like_search(tokens, limit)
+        return [
+            {
+                'title': row['title'],
+                'url': row['url'],
+                'video_id': row['video_key'],
+                'duration': row['duration'] or 'Unknown',
+                'views': row['views'] or 'N/A',
+                'thumbnail_url': row['thumbnail_url'],
+                'channel': row['channel'] or 'Unknown',
+                'publish_date': row['publish_date'] or 'N/A',
+                'downloaded': bool(row['downloaded'])
+            }
+            for row in rows
+        ]
+
+    def _full_text_search(self, tokens: List[str], limit: int) -> List[sqlite3.Row]:
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return self._reader().execute(
+            """
+            SELECT v.url, v.video_key, v.title, v.channel, v.duration, v.views,
+                   v.publish_date, v.thumbnail_url, v.downloaded
+            FROM videos_fts
+            JOIN videos v ON v.id = videos_fts.rowid
+            WHERE videos_fts MATCH ?
+            ORDER BY bm25(videos_fts, 10.0, 3.0) - v.downloaded * 2.0
+            LIMIT ?
+            """,
+            (match, limit)
+        ).fetchall()
+
+    def _like_search(self, tokens: List[str], limit: int) -> List[sqlite3.Row]:
+        """Every token as a substring of title or channel; downloads, then most recently seen, first"""
+        # Tokens are word characters, so '_' is the only LIKE wildcard they can contain
+        patterns = ['%' + token.replace('_', '\\_') + '%' for token in tokens]
+        where = ' AND '.join(["(title LIKE ? ESCAPE '\\' OR channel LIKE ? ESCAPE '\\')"] * len(tokens))
+        return self._reader().execute(
+            f"""
+            SELECT url, video_key, title, channel, duration, views,
+                   publish_date, thumbnail_url, downloaded
+            FROM videos
+            WHERE {where}
+            ORDER BY downloaded DESC, seen_at DESC
+            LIMIT ?
+            """,
+            [pattern for pattern in patterns for _ in range(2)] + [limit]
+        ).fetchall()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a TTL, with an optional JSON file tier.
+
+    The file is rewritten at most once per save_delay seconds after a put,
+    and once more at exit if anything is still unsaved.
+    """
+
+    def __init__(self, max_entries: int = 200, ttl_seconds: float = 3600,
+                 path: Optional[str] = None, save_delay: float = 2.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.save_delay = save_delay
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # Held across the whole write so concurrent saves never interleave in the file
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._dirty = False
+        if path:
+            self.load()
+            atexit.register(self.flush)
 
-class YouTubeSearchManager:
-    def __init__(self):
-        self.search_history = []
-        self.max_history = 100
-        self.results_cache = {}
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if self.path:
+            self._schedule_save()
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def pop(self, key: str):
+        """Remove and return an unexpired value, or None"""
+        value = self.get(key)
+        with self._lock:
+            self._entries.pop(key, None)
+        return value
 
-    def search_videos(self, query: str, filters: Dict) -> List[Dict]:
-        """Perform YouTube search with filters"""
-        cache_key = f"{query}:{json.dumps(filters)}"
-        if cache_key in self.results_cache:
-            return self.results_cache[cache_key]
+    def keys(self) -> List[str]:
+        """Unexpired keys, most recently used last"""
+        now = time.time()
+        with self._lock:
+            return [key for key, (stored_at, _) in self._entries.items()
+                    if now - stored_at <= self.ttl_seconds]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            self.save()
 
+    def load(self):
         try:
-            search = VideosSearch(query, limit=50)
-            results = []
-            search_results = search.result()
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+        except:
+            return
 
-            for result in search_results['result']:
-                # Apply filters
-                if not self._passes_filters(result, filters):
-                    continue
+        now = time.time()
+        with self._lock:
+            # Stored oldest first, so insertion order restores LRU order
+            for key, (stored_at, value) in stored.items():
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries[key] = (stored_at, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _schedule_save(self):
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Save now if a put has not been written yet"""
+        if self._dirty:
+            self.save()
+
+    def save(self):
+        """Write the entries to a temporary file and swap it in, so the file is never partial"""
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                self._dirty = False
+                snapshot = {key: list(entry) for key, entry in self._entries.items()}
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump(snapshot, f)
+                os.replace(temp_path, self.path)
+            except Exception as e:
+                cache_log.error("Cache save error: %s", e)
+
+
+class ResultColumns:
+    """Typed columns over a result list, built once and shared by every filter run"""
+
+    def __init__(self, results: List[Dict]):
+        self.results = results
+        self.duration = [result['duration_seconds'] for result in results]
+        self.published = [result['published_ts'] for result in results]
+        self.views = [result['view_count'] for result in results]
+        self.channel = [result['channel'].lower() for result in results]
+        if np is not None:
+            self.duration_array = np.array(self.duration, dtype=np.int64)
+            # Unknown values become NaN / -1 so that any bound rejects them
+            self.published_array = np.array(
+                [np.nan if ts is None else ts for ts in self.published], dtype=np.float64
+            )
+            self.views_array = np.array(
+                [-1 if views is None else views for views in self.views], dtype=np.int64
+            )
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+class SearchFilter:
+    """Search filters compiled once into column bounds and applied to whole batches"""
+    DURATION_BUCKETS = {
+        'Short': (0, 240),        # up to 4 minutes
+        'Medium': (240, 1200),    # 4 to 20 minutes
+        'Long': (1200, None)      # 20 minutes and up
+    }
+    DATE_WINDOWS = {
+        'Today': 86400,
+        'This Week': 7 * 86400,
+        'This Month': 30 * 86400
+    }
+
+    def __init__(self, filters: Dict, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self.min_duration, self.max_duration = self.DURATION_BUCKETS.get(
+            filters.get('duration'), (None, None)
+        )
+        if filters.get('min_duration'):
+            self.min_duration = max(self.min_duration or 0, filters['min_duration'])
+        if filters.get('max_duration'):
+            self.max_duration = min(
+                self.max_duration if self.max_duration is not None else filters['max_duration'],
+                filters['max_duration']
+            )
+
+        self.min_published = None
+        date_filter = filters.get('date')
+        if date_filter in self.DATE_WINDOWS:
+            self.min_published = now - self.DATE_WINDOWS[date_filter]
+        elif date_filter == 'This Year':
+            self.min_published = datetime(datetime.fromtimestamp(now).year, 1, 1).timestamp()
+
+        self.min_views = filters.get('min_views') or None
+        self.channel = (filters.get('channel') or '').strip().lower() or None
+
+    def matching_rows(self, columns: ResultColumns) -> List[int]:
+        """Row numbers of the results that pass every filter"""
+        if np is not None and len(columns):
+            mask = np.ones(len(columns), dtype=bool)
+            if self.min_duration is not None:
+                mask &= columns.duration_array >= self.min_duration
+            if self.max_duration is not None:
+                mask &= columns.duration_array <= self.max_duration
+            if self.min_published is not None:
+                mask &= columns.published_array >= self.min_published
+            if self.min_views is not None:
+                mask &= columns.views_array >= self.min_views
+            rows = np.flatnonzero(mask).tolist()
+        else:
+            rows = range(len(columns))
+            if self.min_duration is not None:
+                rows = [row for row in rows if columns.duration[row] >= self.min_duration]
+            if self.max_duration is not None:
+                rows = [row for row in rows if columns.duration[row] <= self.max_duration]
+            if self.min_published is not None:
+                published = columns.published
+                rows = [row for row in rows
+                        if published[row] is not None and published[row] >= self.min_published]
+            if self.min_views is not None:
+                views = columns.views
+                rows = [row for row in rows if views[row] is not None and views[row] >= self.min_views]
+
+        # Substring match is not vectorizable; run it on the survivors only
+        if self.channel is not None:
+            rows = [row for row in rows if self.channel in columns.channel[row]]
+        return list(rows)
+
+    def apply(self, columns: ResultColumns) -> List[Dict]:
+        results = columns.results
+        return [results[row] for row in self.matching_rows(columns)]
 
-                video_info = {
-                    'title': result['title'],
-                    'url': result['link'],
-                    'duration': result.get('duration', 'Unknown'),
-                    'views': result.get('viewCount', {}).get('text', 'Unknown'),
-                    'thumbnail_url': result.get('thumbnails', [{}])[0].get('url', ''),
-                    'channel': result.get('channel', {}).get('name', 'Unknown'),
-                    'publish_date': result.get('publishedTime', 'Unknown')
-                }
-                results.append(video_info)
 
-            # Cache results
-            self.results_cache[cache_key] = results
-            self._add_to_history(query)
-            return results
+class YouTubeSearchManager:
+    def __init__(self, cache_path: Optional[str] = 'search_cache.json',
+                 video_index: Optional[VideoIndex] = None):
+        self.search_history = []
+        self.video_index = video_index
+        self.max_history = 100
+        self.page_size = 20
+        self.max_sessions = 8
+        # Unfiltered result pages per normalized query; filters are applied on top
+        self.results_cache = TTLCache(max_entries=200, ttl_seconds=6 * 3600, path=cache_path)
+        # Compiled filters and typed columns, reused across filter runs from several search workers
+        self._compiled_filters: OrderedDict = OrderedDict()
+        self._columns: OrderedDict = OrderedDict()
+        self._filters_lock = threading.Lock()
+        # Live searches positioned at their last fetched page, for continuation
+        self._sessions: OrderedDict = OrderedDict()
+        # query -> [lock, users]; dropped when its last user is done, so only queries in flight hold one
+        self._session_locks: Dict[str, List] = {}
+        self._sessions_lock = threading.Lock()
+
+    def search_videos(self, query: str, filters: Dict, target_count: int = 50,
+                      record_history: bool = True) -> List[Dict]:
+        """Perform YouTube search with filters"""
+        results = []
+        for _, batch in self.search_pages(query, filters, target_count, record_history=record_history):
+            results.extend(batch)
+        return results
+
+    def search_pages(self, query: str, filters: Dict, target_count: int = 50,
+                     max_pages: int = 10, start_page: int = 0, record_history: bool = True):
+        """Yield (next_page, filtered_batch) per page until target_count results pass the filters.
+
+        next_page is None once the search has no further pages. Live searches
+        pass record_history=False so partial queries stay out of the history.
+        """
+        try:
+            if start_page == 0 and record_history:
+                self._add_to_history(query)
+
+            produced = 0
+            page = start_page
+            while produced < target_count and page < start_page + max_pages:
+                raw_results = self._get_page(query, page)
+                if raw_results is None:
+                    yield None, []
+                    return
+
+                batch = self.filter_results(raw_results, filters, (self._normalize_query(query), page))
+                produced += len(batch)
+                page += 1
+                yield page, batch
 
         except Exception as e:
-            logging.error(f"Search error: {str(e)}")
+            search_log.error("Search error: %s", e)
             raise
 
+    def expand_queries(self, text: str, max_queries: int = 8) -> List[str]:
+        """Split 'a | b' into separate queries and expand {x,y} variations in each"""
+        def candidates():
+            for part in text.split('|'):
+                part = part.strip()
+                if not part:
+                    continue
+                pieces = re.split(r'\{([^{}]*)\}', part)
+                # Odd positions hold the brace contents
+                choices = [
+                    [option.strip() for option in piece.split(',')] if position % 2 else [piece]
+                    for position, piece in enumerate(pieces)
+                ]
+                for combination in itertools.product(*choices):
+                    yield ' '.join(''.join(combination).split())
+
+        seen = set()
+        # Combinations are generated lazily and only until max_queries distinct ones are found;
+        # the scan itself is capped so inputs that expand to endless duplicates stay cheap
+        unique = (query for query in itertools.islice(candidates(), max_queries * 64)
+                  if query and not (query in seen or seen.add(query)))
+        return list(itertools.islice(unique, max_queries))
+
+    def search_many(self, queries: List[str], filters: Dict, target_count: int = 50,
+                    record_history: bool = True) -> List[Dict]:
+        """Run several searches concurrently and merge them into one ranked, de-duplicated list.
+
+        Ranking uses reciprocal rank fusion, so videos that rank well under
+        several phrasings come first.
+        """
+        with ThreadPoolExecutor(max_workers=len(queries) or 1) as executor:
+            futures = [
+                executor.submit(self.search_videos, query, filters, target_count, record_history)
+                for query in queries
+            ]
+            result_lists = []
+            for future in futures:
+                try:
+                    result_lists.append(future.result())
+                except Exception as e:
+                    search_log.error("Search error: %s", e)
+            if not result_lists:
+                raise Exception("All searches failed")
+
+        scores: Dict[str, float] = {}
+        merged: Dict[str, Dict] = {}
+        for results in result_lists:
+            for rank, result in enumerate(results):
+                key = self._video_key(result)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (60 + rank)
+                merged.setdefault(key, result)
+
+        ranked = sorted(merged, key=lambda key: scores[key], reverse=True)
+        return [merged[key] for key in ranked[:target_count]]
+
+    def _video_key(self, result: Dict) -> str:
+        return result.get('video_id') or VideoURL.key(result['url'])
+
+    def cached_prefix_results(self, query: str, filters: Dict) -> Optional[List[Dict]]:
+        """Locally refine the longest cached search whose query is a prefix of this one.
+
+        Used while typing: 'lofi bea' cached means 'lofi beats' can show
+        matching titles before its own search returns.
+        """
+        normalized = self._normalize_query(query)
+        prefixes = [key for key in self.results_cache.keys() if normalized.startswith(key)]
+        if not prefixes:
+            return None
+        entry = self.results_cache.get(max(prefixes, key=len))
+        if not isinstance(entry, dict):
+            return None
+
+        tokens = normalized.split()
+        results = [result for page in entry['pages'] for result in page]
+        refined = [
+            result for result in results
+            if all(token in f"{result['title']} {result['channel']}".lower() for token in tokens)
+        ]
+        return self.filter_results(refined, filters)
+
+    def _normalize_query(self, query: str) -> str:
+        return ' '.join(query.lower().split())
+
+    def _get_page(self, query: str, page: int) -> Optional[List[Dict]]:
+        """Return unfiltered results for a page, from cache or the network; None past the end"""
+        cache_key = self._normalize_query(query)
+        with self._sessions_lock:
+            key_lock = self._session_locks.setdefault(cache_key, [threading.Lock(), 0])
+            key_lock[1] += 1
+        try:
+            with key_lock[0]:
+                return self._get_page_locked(query, cache_key, page)
+        finally:
+            with self._sessions_lock:
+                key_lock[1] -= 1
+                if not key_lock[1]:
+                    del self._session_locks[cache_key]
+
+    def _get_page_locked(self, query: str, cache_key: str, page: int) -> Optional[List[Dict]]:
+        """Cache lookup and, on a miss, the next page fetch; runs under the query's lock"""
+        entry = self.results_cache.get(cache_key)
+        if not isinstance(entry, dict):
+            entry = {'pages': [], 'exhausted': False}
+        if page < len(entry['pages']):
+            CACHE_REQUESTS.inc(cache='search', result='hit')
+            return entry['pages'][page]
+        if entry['exhausted']:
+            CACHE_REQUESTS.inc(cache='search', result='hit')
+            return None
+
+        # Pages are requested in order, so this is always the next uncached one
+        CACHE_REQUESTS.inc(cache='search', result='miss')
+        fetch_started = time.perf_counter()
+        results = self._fetch_page(query, cache_key, page)
+        SEARCH_LATENCY.observe(time.perf_counter() - fetch_started)
+        if results is not None and self.video_index is not None:
+            self.video_index.add(results)
+        if results is None:
+            entry = {'pages': entry['pages'], 'exhausted': True}
+        else:
+            entry = {'pages': entry['pages'] + [results], 'exhausted': False}
+        self.results_cache.put(cache_key, entry)
+        return results
+
+    def _fetch_page(self, query: str, cache_key: str, page: int) -> Optional[List[Dict]]:
+        """Advance (or start) the live search for query to the given page"""
+        session = self._sessions.get(cache_key)
+        if session is None or session['page'] > page:
+            session = {'search': VideosSearch(query, limit=self.page_size), 'page': 0}
+        with self._sessions_lock:
+            self._sessions[cache_key] = session
+            self._sessions.move_to_end(cache_key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+        while session['page'] < page:
+            if not session['search'].next():
+                return None
+            session['page'] += 1
+        return self._parse_results(session['search'].result())
+
+    def _parse_results(self, search_results: Dict) -> List[Dict]:
+        results = []
+        for result in search_results['result']:
+            video_info = {
+                'title': result['title'],
+                'url': VideoURL.canonical(result['link']),
+                'video_id': result.get('id') or VideoURL.video_id(result['link']) or '',
+                'duration': result.get('duration') or 'Unknown',
+                'views': (result.get('viewCount') or {}).get('text') or 'Unknown',
+                'thumbnail_url': (result.get('thumbnails') or [{}])[0].get('url', ''),
+                'channel': (result.get('channel') or {}).get('name', 'Unknown'),
+                'publish_date': result.get('publishedTime') or 'Unknown'
+            }
+            results.append(self._normalize_result(video_info))
+
+        return results
+
+    def _normalize_result(self, result: Dict) -> Dict:
+        """Add typed fields used by filtering; computed once per result"""
+        if 'duration_seconds' not in result:
+            result['duration_seconds'] = self._parse_duration(result.get('duration', ''))
+        if 'published_ts' not in result:
+            result['published_ts'] = self._parse_publish_date(result.get('publish_date', ''))
+        if 'view_count' not in result:
+            result['view_count'] = self._parse_views(result.get('views', ''))
+        return result
+
+    def filter_results(self, results: List[Dict], filters: Dict, key: Optional[Tuple] = None) -> List[Dict]:
+        """Apply filters to a whole result list using compiled predicates.
+
+        key names the list, e.g. (query, page), so its typed columns are
+        built once and reused; without one they are built for this call only.
+        """
+        return self._compile_filters(filters).apply(self._columns_for(results, key))
+
+    def _compile_filters(self, filters: Dict) -> SearchFilter:
+        # Date windows are relative to now, so compiled filters are only reused briefly
+        key = (json.dumps(filters, sort_keys=True), int(time.time() // 60))
+        with self._filters_lock:
+            compiled = self._compiled_filters.get(key)
+            if compiled is None:
+                compiled = self._compiled_filters[key] = SearchFilter(filters)
+                while len(self._compiled_filters) > 32:
+                    self._compiled_filters.popitem(last=False)
+        return compiled
+
+    def _columns_for(self, results: List[Dict], key: Optional[Tuple]) -> ResultColumns:
+        if key is not None:
+            with self._filters_lock:
+                columns = self._columns.get(key)
+            # A refetched page under the same key is a different list
+            if columns is not None and columns.results is results:
+                return columns
+        columns = ResultColumns([self._normalize_result(result) for result in results])
+        columns.results = results
+        if key is not None:
+            with self._filters_lock:
+                self._columns[key] = columns
+                self._columns.move_to_end(key)
+                while len(self._columns) > 256:
+                    self._columns.popitem(last=False)
+        return columns
+
     def _passes_filters(self, result: Dict, filters: Dict) -> bool:
         """Check if video matches specified filters"""
-        if filters.get('duration'):
-            duration = result.get('duration', '')
-            duration_seconds = self._parse_duration(duration)
-
-            if filters['duration'] == 'Short' and duration_seconds > 240:  # 4 minutes
-                return False
-            elif filters['duration'] == 'Medium' and (duration_seconds < 240 or duration_seconds > 1200):
-                return False
-            elif filters['duration'] == 'Long' and duration_seconds < 1200:  # 20 minutes
-                return False
-
-        if filters.get('date'):
-            publish_date = result.get('publishedTime', '')
-            if not self._check_date_filter(publish_date, filters['date']):
-                return False
-
-        return True
+        return bool(self.filter_results([result], filters))
 
     def _parse_duration(self, duration: str) -> int:
         """Convert duration string to seconds"""
@@ -561,76 +2761,48 @@ class YouTubeSearchManager:
         except:
             return 0
 
-    def _check_date_filter(self, publish_date: str, filter_date: str) -> bool:
-        """Check if publish date matches the filter"""
+    RELATIVE_DATE_PATTERN = re.compile(
+        r'(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago', re.IGNORECASE
+    )
+    RELATIVE_DATE_UNITS = {
+        'second': 1,
+        'minute': 60,
+        'hour': 3600,
+        'day': 86400,
+        'week': 7 * 86400,
+        'month': 30 * 86400,
+        'year': 365 * 86400
+    }
+    VIEWS_PATTERN = re.compile(r'([\d.,]+)\s*([KMB]?)', re.IGNORECASE)
+
+    def _parse_publish_date(self, publish_date: str) -> Optional[float]:
+        """Convert '3 days ago' (also 'Streamed 3 days ago') or YYYY-MM-DD to an epoch timestamp"""
+        if not publish_date or publish_date == 'Unknown':
+            return None
+        match = self.RELATIVE_DATE_PATTERN.search(publish_date)
+        if match:
+            age = int(match.group(1)) * self.RELATIVE_DATE_UNITS[match.group(2).lower()]
+            return time.time() - age
         try:
-            if filter_date == "Any Time":
-                return True
-
-            now = datetime.now()
-            if not publish_date:
-                return False
-
-            if "ago" in publish_date.lower():
-                # Handle relative dates like "1 month ago"
-                return self._check_relative_date(publish_date, filter_date)
-
-            # Handle absolute dates
-            pub_date = datetime.strptime(publish_date, "%Y-%m-%d")
-            if filter_date == "Today":
-                return pub_date.date() == now.date()
-            elif filter_date == "This Week":
-                week_ago = now - timedelta(days=7)
-                return week_ago.date() <= pub_date.date() <= now.date()
-            elif filter_date == "This Month":
-                month_ago = now - timedelta(days=30)
-                return month_ago.date() <= pub_date.date() <= now.date()
-            elif filter_date == "This Year":
-                year_start = datetime(now.year, 1, 1)
-                return year_start.date() <= pub_date.date() <= now.date()
-
-        except Exception as e:
-            logging.error(f"Date filter error: {str(e)}")
-            return True
-
-        return True
-
-    def _check_relative_date(self, publish_date: str, filter_date: str) -> bool:
-        """Check relative dates (e.g., '2 months ago')"""
+            return datetime.strptime(publish_date, "%Y-%m-%d").timestamp()
+        except ValueError:
+            return None
+
+    def _parse_views(self, views: str) -> Optional[int]:
+        """Convert '1,234 views', '1.2M views' or 'No views' to an integer"""
+        if not views or views == 'Unknown':
+            return None
+        if views.lower().startswith('no views'):
+            return 0
+        match = self.VIEWS_PATTERN.search(views)
+        if not match:
+            return None
+        multiplier = {'': 1, 'K': 1000, 'M': 1000000, 'B': 1000000000}[match.group(2).upper()]
+        number = match.group(1).replace(',', '')
         try:
-            parts = publish_date.lower().split()
-            number = int(parts[0])
-            unit = parts[1]
-
-            if filter_date == "Today":
-                return unit == "hour" or (unit == "day" and number == 0)
-            elif filter_date == "This Week":
-                return (
-                        unit == "hour" or
-                        unit == "day" and number <= 7 or
-                        unit == "week" and number == 0
-                )
-            elif filter_date == "This Month":
-                return (
-                        unit == "hour" or
-                        unit == "day" or
-                        unit == "week" and number <= 4 or
-                        unit == "month" and number == 0
-                )
-            elif filter_date == "This Year":
-                return (
-                        unit == "hour" or
-                        unit == "day" or
-                        unit == "week" or
-                        unit == "month" and number <= 12 or
-                        unit == "year" and number == 0
-                )
-
-        except Exception as e:
-            logging.error(f"Relative date filter error: {str(e)}")
-            return True
-
-        return True
+            return int(float(number) * multiplier)
+        except ValueError:
+            return None
 
     def _add_to_history(self, query: str):
         """Add search query to history"""
@@ -640,104 +2812,483 @@ class YouTubeSearchManager:
                 self.search_history.pop()
 
 
-class SearchResultWidget(QWidget):
-    download_requested = pyqtSignal(dict)
+class SearchResultModel(QAbstractListModel):
+    """List model over search results with per-row check state, quality and queued flag"""
+    VideoRole = Qt.ItemDataRole.UserRole
+    QualityRole = Qt.ItemDataRole.UserRole + 1
+    QueuedRole = Qt.ItemDataRole.UserRole + 2
 
-    def __init__(self, video_info: Dict, default_quality: str, parent=None):
+    def __init__(self, thumbnail_loader: Optional[ThumbnailLoader] = None, parent=None):
         super().__init__(parent)
-        self.video_info = video_info
-        self.default_quality = default_quality
-        self.setup_ui()
+        self._results: List[Dict] = []
+        self._qualities: List[str] = []
+        self._checked: List[bool] = []
+        self._queued: List[bool] = []
+        # thumbnail url -> rows showing it
+        self._thumbnail_rows: Dict[str, List[int]] = {}
+        self.thumbnail_loader = thumbnail_loader
+        if thumbnail_loader:
+            thumbnail_loader.thumbnail_ready.connect(self._thumbnail_ready)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._results)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._results[row]['title']
+        elif role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if self._checked[row] else Qt.CheckState.Unchecked
+        elif role == Qt.ItemDataRole.DecorationRole and self.thumbnail_loader:
+            return self.thumbnail_loader.get(self._results[row].get('thumbnail_url', ''))
+        elif role == self.VideoRole:
+            return self._results[row]
+        elif role == self.QualityRole:
+            return self._qualities[row]
+        elif role == self.QueuedRole:
+            return self._queued[row]
+        return None
+
+    def setData(self, index: QModelIndex, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid():
+            return False
+        row = index.row()
+
+        if role == Qt.ItemDataRole.CheckStateRole:
+            self._checked[row] = Qt.CheckState(value) == Qt.CheckState.Checked
+        elif role == self.QualityRole:
+            self._qualities[row] = value
+        elif role == self.QueuedRole:
+            self._queued[row] = bool(value)
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
 
-    def setup_ui(self):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(5, 5, 5, 5)
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return (Qt.ItemFlag.ItemIsEnabled |
+                Qt.ItemFlag.ItemIsSelectable |
+                Qt.ItemFlag.ItemIsUserCheckable |
+                Qt.ItemFlag.ItemIsEditable)
+
+    def set_results(self, results: List[Dict], default_quality: str):
+        """Replace all results in a single model reset"""
+        self.beginResetModel()
+        self._results = list(results)
+        self._qualities = [default_quality] * len(self._results)
+        self._checked = [False] * len(self._results)
+        self._queued = [False] * len(self._results)
+        self._thumbnail_rows = {}
+        self._index_thumbnails(0)
+        self.endResetModel()
+
+    def append_results(self, results: List[Dict], default_quality: str):
+        if not results:
+            return
+        first = len(self._results)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        self._results.extend(results)
+        self._qualities.extend([default_quality] * len(results))
+        self._checked.extend([False] * len(results))
+        self._queued.extend([False] * len(results))
+        self._index_thumbnails(first)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_results([], '')
+
+    def checked_rows(self) -> List[int]:
+        return [row for row, checked in enumerate(self._checked) if checked]
+
+    def _index_thumbnails(self, first: int):
+        for row in range(first, len(self._results)):
+            self._thumbnail_rows.setdefault(self._results[row].get('thumbnail_url'), []).append(row)
+
+    def _thumbnail_ready(self, url: str):
+        for row in self._thumbnail_rows.get(url, ()):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class SearchResultDelegate(QStyledItemDelegate):
+    """Paints a search result row on demand; only the quality editor is a real widget"""
+    queue_requested = pyqtSignal(QModelIndex)
+
+    ROW_HEIGHT = 78
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def _layout(self, rect) -> Dict:
+        """Compute sub-rectangles for the checkbox, thumbnail, text, quality and button"""
+        center_y = rect.center().y()
+        checkbox = rect.adjusted(5, 0, 0, 0)
+        checkbox.setSize(QSize(20, 20))
+        checkbox.moveTop(center_y - 10)
+
+        thumbnail = rect.adjusted(30, 5, 0, 0)
+        thumbnail.setSize(QSize(120, 68))
+
+        button = rect.adjusted(rect.width() - 125, 0, -5, 0)
+        button.setHeight(28)
+        button.moveTop(center_y - 14)
+
+        quality = rect.adjusted(rect.width() - 285, 0, -135, 0)
+        quality.setHeight(24)
+        quality.moveTop(center_y - 4)
+
+        text = rect.adjusted(160, 8, -295, -8)
+        title = text.adjusted(0, 0, 0, -text.height() // 2)
+        details = text.adjusted(0, text.height() // 2, 0, 0)
+        quality_label = quality.translated(0, -22)
+
+        return {
+            'checkbox': checkbox,
+            'thumbnail': thumbnail,
+            'title': title,
+            'details': details,
+            'quality_label': quality_label,
+            'quality': quality,
+            'button': button
+        }
 
-        # Checkbox for selection
-        self.select_checkbox = QCheckBox()
-        layout.addWidget(self.select_checkbox)
+    def paint(self, painter, option, index):
+        painter.save()
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        rects = self._layout(option.rect)
+        video = index.data(SearchResultModel.VideoRole)
+        queued = index.data(SearchResultModel.QueuedRole)
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        # Checkbox
+        check_option = QStyleOptionButton()
+        check_option.rect = rects['checkbox']
+        check_option.state = QStyle.StateFlag.State_Enabled | (
+            QStyle.StateFlag.State_On
+            if index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+            else QStyle.StateFlag.State_Off
+        )
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorCheckBox, check_option, painter, widget)
 
         # Thumbnail
-        self.thumbnail = QLabel()
-        self.thumbnail.setFixedSize(120, 68)
-        self.thumbnail.setScaledContents(True)
-        self._load_thumbnail()
-        layout.addWidget(self.thumbnail)
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if pixmap and not pixmap.isNull():
+            painter.drawPixmap(rects['thumbnail'], pixmap)
+        else:
+            painter.fillRect(rects['thumbnail'], QColor(40, 40, 40))
 
-        # Info section
-        info_layout = QVBoxLayout()
-        title_label = QLabel(self.video_info['title'])
-        title_label.setWordWrap(True)
-        title_label.setStyleSheet("font-weight: bold;")
-
-        details_label = QLabel(
-            f"Duration: {self.video_info['duration']} | "
-            f"Views: {self.video_info['views']} | "
-            f"Channel: {self.video_info['channel']}"
+        # Title and details
+        painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+        title_font = QFont(option.font)
+        title_font.setBold(True)
+        painter.setFont(title_font)
+        painter.drawText(
+            rects['title'],
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            QFontMetrics(title_font).elidedText(
+                video['title'], Qt.TextElideMode.ElideRight, rects['title'].width()
+            )
+        )
+        painter.setFont(option.font)
+        details = (f"Duration: {video['duration']} | "
+                   f"Views: {video['views']} | "
+                   f"Channel: {video['channel']}")
+        painter.drawText(
+            rects['details'],
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            option.fontMetrics.elidedText(details, Qt.TextElideMode.ElideRight, rects['details'].width())
         )
+        painter.drawText(rects['quality_label'], Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignBottom,
+                         "Quality:")
 
-        info_layout.addWidget(title_label)
-        info_layout.addWidget(details_label)
-        layout.addLayout(info_layout, stretch=1)
-
-        # Quality selection
-        quality_layout = QVBoxLayout()
-        self.quality_combo = QComboBox()
-        self.quality_combo.addItems([
-            'High Quality Pro Plus',
-            '720p',
-            '480p',
-            '360p',
-            'Audio Only'
-        ])
-        self.quality_combo.setCurrentText(self.default_quality)
-        quality_layout.addWidget(QLabel("Quality:"))
-        quality_layout.addWidget(self.quality_combo)
-        layout.addLayout(quality_layout)
+        # Quality combo (painted; a real editor opens on click)
+        combo_option = QStyleOptionComboBox()
+        combo_option.rect = rects['quality']
+        combo_option.currentText = index.data(SearchResultModel.QualityRole)
+        combo_option.state = QStyle.StateFlag.State_Enabled
+        style.drawComplexControl(QStyle.ComplexControl.CC_ComboBox, combo_option, painter, widget)
+        style.drawControl(QStyle.ControlElement.CE_ComboBoxLabel, combo_option, painter, widget)
 
         # Add to queue button
-        self.queue_btn = QPushButton("Add to Queue")
-        self.queue_btn.clicked.connect(self._add_to_queue)
-        layout.addWidget(self.queue_btn)
-
-    def _add_to_queue(self):
-        """Add video to download queue"""
-        try:
-            video_item = VideoQueueItem(
-                url=self.video_info['url'],
-                title=self.video_info['title'],
-                duration=self.video_info['duration'],
-                quality=self.quality_combo.currentText(),
-                thumbnail_url=self.video_info['thumbnail_url']
+        button_option = QStyleOptionButton()
+        button_option.rect = rects['button']
+        button_option.text = "Added to Queue" if queued else "Add to Queue"
+        button_option.state = QStyle.StateFlag.State_Raised | (
+            QStyle.StateFlag.State_None if queued else QStyle.StateFlag.State_Enabled
+        )
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button_option, painter, widget)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() != event.Type.MouseButtonRelease:
+            return False
+        rects = self._layout(option.rect)
+        pos = event.position().toPoint()
+
+        if rects['checkbox'].contains(pos):
+            checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+            model.setData(
+                index,
+                Qt.CheckState.Unchecked if checked else Qt.CheckState.Checked,
+                Qt.ItemDataRole.CheckStateRole
             )
-            MainWindow.instance().smart_queue.add_download(video_item)
-            self.queue_btn.setEnabled(False)
-            self.queue_btn.setText("Added to Queue")
+            return True
+        if rects['button'].contains(pos):
+            if not index.data(SearchResultModel.QueuedRole):
+                self.queue_requested.emit(index)
+            return True
+        if rects['quality'].contains(pos) and self.parent():
+            self.parent().edit(index)
+            return True
+        return False
 
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Could not add to queue: {str(e)}")
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(QUALITY_OPTIONS)
+        editor.activated.connect(lambda: self._commit_and_close(editor))
+        QTimer.singleShot(0, editor.showPopup)
+        return editor
 
-    def _load_thumbnail(self):
-        """Load thumbnail asynchronously"""
+    def _commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
 
-        def set_thumbnail(data):
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
-            self.thumbnail.setPixmap(pixmap)
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(SearchResultModel.QualityRole))
 
-        thread = ThreadPoolExecutor().submit(
-            requests.get, self.video_info['thumbnail_url']
-        )
-        thread.add_done_callback(
-            lambda f: set_thumbnail(f.result().content)
-        )
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), SearchResultModel.QualityRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(self._layout(option.rect)['quality'])
+
+
+class DownloadQueueModel(QAbstractListModel):
+    """Single list model behind all queue sections.
+
+    Updates may arrive from download threads, so they are collected under a lock
+    and applied on the GUI thread by a flush timer as one insert and one
+    dataChanged per contiguous run of changed rows.
+    """
+    ItemRole = Qt.ItemDataRole.UserRole
+    StatusRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, flush_interval_ms: int = 100, parent=None):
+        super().__init__(parent)
+        self._items: List[VideoQueueItem] = []
+        self._rows: Dict[int, int] = {}
+        self._pending_updates: Dict[int, VideoQueueItem] = {}
+        self._pending_lock = threading.Lock()
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(flush_interval_ms)
+        self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        video_item = self._items[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return video_item.title
+        elif role == self.ItemRole:
+            return video_item
+        elif role == self.StatusRole:
+            return video_item.status
+        return None
+
+    def status_at(self, row: int) -> str:
+        return self._items[row].status
+
+    def update_item(self, video_item: VideoQueueItem):
+        """Queue an insert or in-place update; safe to call from any thread"""
+        with self._pending_lock:
+            self._pending_updates[id(video_item)] = video_item
+
+    def flush(self):
+        """Apply queued updates: new rows in one insert, changed rows as contiguous runs"""
+        with self._pending_lock:
+            if not self._pending_updates:
+                return
+            updates = self._pending_updates
+            self._pending_updates = {}
+
+        new_items = [item for key, item in updates.items() if key not in self._rows]
+        changed_rows = [self._rows[key] for key in updates if key in self._rows]
+
+        if new_items:
+            first = len(self._items)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_items) - 1)
+            for offset, video_item in enumerate(new_items):
+                self._rows[id(video_item)] = first + offset
+                self._items.append(video_item)
+            self.endInsertRows()
+
+        # One signal per run: a single min..max range would make every section proxy
+        # re-filter nearly the whole queue when updates are scattered
+        changed_rows.sort()
+        run_start = 0
+        for position in range(1, len(changed_rows) + 1):
+            if position == len(changed_rows) or changed_rows[position] != changed_rows[position - 1] + 1:
+                self.dataChanged.emit(self.index(changed_rows[run_start]), self.index(changed_rows[position - 1]))
+                run_start = position
+
+    def remove_items(self, predicate):
+        """Drop every item matching predicate"""
+        self.flush()
+        self.beginResetModel()
+        self._items = [item for item in self._items if not predicate(item)]
+        self._rows = {id(item): row for row, item in enumerate(self._items)}
+        self.endResetModel()
+
+
+class DownloadSectionProxyModel(QSortFilterProxyModel):
+    """Shows the queue rows whose status belongs to one section"""
+
+    def __init__(self, statuses: Tuple[str, ...], parent=None):
+        super().__init__(parent)
+        self.statuses = statuses
+        self.setDynamicSortFilter(True)
+        self.setFilterRole(DownloadQueueModel.StatusRole)
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        # Read the status directly; going through index().data() triples the cost per row
+        return self.sourceModel().status_at(source_row) in self.statuses
+
+
+class DownloadItemDelegate(QStyledItemDelegate):
+    """Paints a queue row (title, status, progress, controls) without per-row widgets"""
+    control_clicked = pyqtSignal(object)
+    cancel_clicked = pyqtSignal(object)
+
+    ROW_HEIGHT = 52
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def _layout(self, rect) -> Dict:
+        center_y = rect.center().y()
+        cancel = rect.adjusted(rect.width() - 85, 0, -5, 0)
+        cancel.setHeight(28)
+        cancel.moveTop(center_y - 14)
+        control = cancel.translated(-85, 0)
+
+        progress = rect.adjusted(rect.width() - 380, 6, -180, 0)
+        progress.setHeight(18)
+        speed = progress.translated(0, 20)
+
+        info = rect.adjusted(5, 4, -390, -4)
+        title = info.adjusted(0, 0, 0, -info.height() // 2)
+        status = info.adjusted(0, info.height() // 2, 0, 0)
+
+        return {
+            'title': title,
+            'status': status,
+            'progress': progress,
+            'speed': speed,
+            'control': control,
+            'cancel': cancel
+        }
+
+    @staticmethod
+    def _status_display(video_item: VideoQueueItem) -> Tuple[str, bool, bool, str]:
+        """Return control button text, control enabled, cancel enabled and status text"""
+        if video_item.status == DownloadState.PENDING:
+            return "Start", True, True, "Pending"
+        elif video_item.status == DownloadState.ACTIVE:
+            return "Pause", True, True, "Downloading..."
+        elif video_item.status == DownloadState.PAUSED:
+            return "Resume", True, True, "Paused"
+        elif video_item.status == DownloadState.COMPLETED:
+            return "Complete", False, False, "Completed"
+        elif video_item.status == DownloadState.FAILED:
+            error_message = getattr(video_item, 'error_message', 'Unknown error')
+            return "Retry", True, False, f"Failed: {error_message}"
+        elif video_item.status == DownloadState.RETRYING:
+            return "Retrying", False, True, "Retrying download..."
+        elif video_item.status == DownloadState.WAITING:
+            return "Waiting", False, True, "Waiting for disk space"
+        return "", False, False, video_item.status
+
+    def paint(self, painter, option, index):
+        painter.save()
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        rects = self._layout(option.rect)
+        video_item = index.data(DownloadQueueModel.ItemRole)
+        control_text, control_enabled, cancel_enabled, status_text = self._status_display(video_item)
+
+        painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+        align = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        metrics = option.fontMetrics
+        painter.drawText(rects['title'], align, metrics.elidedText(
+            video_item.title, Qt.TextElideMode.ElideRight, rects['title'].width()))
+        painter.drawText(rects['status'], align, metrics.elidedText(
+            status_text, Qt.TextElideMode.ElideRight, rects['status'].width()))
+
+        progress_option = QStyleOptionProgressBar()
+        progress_option.rect = rects['progress']
+        progress_option.minimum = 0
+        progress_option.maximum = 100
+        progress_option.progress = video_item.progress
+        progress_option.text = f"{video_item.progress}%"
+        progress_option.textVisible = True
+        progress_option.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Horizontal
+        style.drawControl(QStyle.ControlElement.CE_ProgressBar, progress_option, painter, widget)
+
+        if video_item.download_speed and video_item.eta:
+            painter.drawText(rects['speed'], align,
+                             f"{video_item.download_speed} | {video_item.eta}")
+
+        for key, text, enabled in (('control', control_text, control_enabled),
+                                   ('cancel', "Cancel", cancel_enabled)):
+            button_option = QStyleOptionButton()
+            button_option.rect = rects[key]
+            button_option.text = text
+            button_option.state = QStyle.StateFlag.State_Raised | (
+                QStyle.StateFlag.State_Enabled if enabled else QStyle.StateFlag.State_None
+            )
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button_option, painter, widget)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() != event.Type.MouseButtonRelease:
+            return False
+        rects = self._layout(option.rect)
+        pos = event.position().toPoint()
+        video_item = index.data(DownloadQueueModel.ItemRole)
+        _, control_enabled, cancel_enabled, _ = self._status_display(video_item)
+
+        if rects['control'].contains(pos):
+            if control_enabled:
+                self.control_clicked.emit(video_item)
+            return True
+        if rects['cancel'].contains(pos):
+            if cancel_enabled:
+                self.cancel_clicked.emit(video_item)
+            return True
+        return False
 
 
 class DownloadQueueWidget(QWidget):
     def __init__(self, smart_queue: SmartQueueManager, parent=None):
         super().__init__(parent)
         self.smart_queue = smart_queue
-        self.download_widgets = {}
+        self.queue_model = DownloadQueueModel(parent=self)
         self.setup_ui()
 
     def setup_ui(self):
@@ -755,10 +3306,21 @@ class DownloadQueueWidget(QWidget):
         controls_layout.addWidget(self.clear_completed_btn)
         layout.addLayout(controls_layout)
 
-        # Queue sections
-        self.active_section = self._create_queue_section("Active Downloads")
-        self.pending_section = self._create_queue_section("Pending Downloads")
-        self.completed_section = self._create_queue_section("Completed Downloads")
+        # Queue sections, each a filtered view over the same model
+        self.item_delegate = DownloadItemDelegate(self)
+        self.item_delegate.control_clicked.connect(self.toggle_download)
+        self.item_delegate.cancel_clicked.connect(self.cancel_download)
+
+        self.active_section = self._create_queue_section(
+            "Active Downloads",
+            (DownloadState.ACTIVE, DownloadState.PAUSED, DownloadState.RETRYING)
+        )
+        self.pending_section = self._create_queue_section(
+            "Pending Downloads", (DownloadState.PENDING, DownloadState.WAITING)
+        )
+        self.completed_section = self._create_queue_section(
+            "Completed Downloads", (DownloadState.COMPLETED, DownloadState.FAILED)
+        )
 
         layout.addWidget(self.active_section)
         layout.addWidget(self.pending_section)
@@ -771,7 +3333,7 @@ class DownloadQueueWidget(QWidget):
 
     def _start_all(self):
         """Start all pending downloads"""
-        for video_item in self.smart_queue.pending_downloads:
+        for video_item in list(self.smart_queue.pending_downloads):
             self.smart_queue._start_download(video_item)
 
     def _pause_all(self):
@@ -783,148 +3345,50 @@ class DownloadQueueWidget(QWidget):
     def _clear_completed(self):
         """Clear all completed downloads from the list"""
         # Remove completed downloads from UI
-        for download_id, widget in list(self.download_widgets.items()):
-            if widget.video_item.status == DownloadState.COMPLETED:
-                widget.deleteLater()
-                del self.download_widgets[download_id]
+        self.queue_model.remove_items(lambda item: item.status == DownloadState.COMPLETED)
 
         # Clear completed downloads from queue
         self.smart_queue.completed_downloads.clear()
 
-    def _create_queue_section(self, title: str) -> QGroupBox:
-        """Create a collapsible section for queue items"""
+    def _create_queue_section(self, title: str, statuses: Tuple[str, ...]) -> QGroupBox:
+        """Create a section showing the queue items in the given states"""
         section = QGroupBox(title)
         layout = QVBoxLayout(section)
         layout.setSpacing(2)
-        return section
-
-    def update_queue_item(self, video_item: VideoQueueItem):
-        """Update or create queue item widget"""
-        if video_item.download_id not in self.download_widgets:
-            widget = DownloadItemWidget(video_item)
-            self.download_widgets[video_item.download_id] = widget
-
-            # Add to appropriate section
-            if video_item.status == DownloadState.ACTIVE:
-                self.active_section.layout().addWidget(widget)
-            elif video_item.status == DownloadState.PENDING:
-                self.pending_section.layout().addWidget(widget)
-            elif video_item.status == DownloadState.COMPLETED:
-                self.completed_section.layout().addWidget(widget)
-        else:
-            widget = self.download_widgets[video_item.download_id]
-            widget.update_status(video_item)
-
-            # Move widget to appropriate section if status changed
-            current_parent = widget.parent()
-            if video_item.status == DownloadState.ACTIVE and current_parent != self.active_section:
-                widget.setParent(None)
-                self.active_section.layout().addWidget(widget)
-            elif video_item.status == DownloadState.PENDING and current_parent != self.pending_section:
-                widget.setParent(None)
-                self.pending_section.layout().addWidget(widget)
-            elif video_item.status == DownloadState.COMPLETED and current_parent != self.completed_section:
-                widget.setParent(None)
-                self.completed_section.layout().addWidget(widget)
-
-
-class DownloadItemWidget(QFrame):
-    def __init__(self, video_item: VideoQueueItem, parent=None):
-        super().__init__(parent)
-        self.video_item = video_item
-        self.setup_ui()
-        self.update_status(video_item)  # Initial status update
-
-    def setup_ui(self):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(5, 5, 5, 5)
 
-        # Title and details
-        info_layout = QVBoxLayout()
-        self.title_label = QLabel(self.video_item.title)
-        self.status_label = QLabel()
-        info_layout.addWidget(self.title_label)
-        info_layout.addWidget(self.status_label)
-        layout.addLayout(info_layout, stretch=1)
-
-        # Progress section
-        progress_layout = QVBoxLayout()
-        self.progress_bar = QProgressBar()
-        self.speed_label = QLabel()
-        progress_layout.addWidget(self.progress_bar)
-        progress_layout.addWidget(self.speed_label)
-        layout.addLayout(progress_layout)
-
-        # Control buttons
-        self.control_btn = QPushButton()
-        self.cancel_btn = QPushButton("Cancel")
-        layout.addWidget(self.control_btn)
-        layout.addWidget(self.cancel_btn)
-
-        # Connect signals
-        self.cancel_btn.clicked.connect(self.cancel_download)
-        self.control_btn.clicked.connect(self.toggle_download)
+        proxy = DownloadSectionProxyModel(statuses, section)
+        proxy.setSourceModel(self.queue_model)
 
-    def update_status(self, video_item: VideoQueueItem):
-        """Update the widget based on video item status"""
-        self.video_item = video_item
-        self.title_label.setText(video_item.title)
-        self.progress_bar.setValue(video_item.progress)
+        view = QListView()
+        view.setUniformItemSizes(True)
+        view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        view.setItemDelegate(self.item_delegate)
+        view.setModel(proxy)
+        layout.addWidget(view)
 
-        # Update speed label if available
-        if video_item.download_speed and video_item.eta:
-            self.speed_label.setText(f"{video_item.download_speed} | {video_item.eta}")
-        else:
-            self.speed_label.clear()
+        section.proxy = proxy
+        section.view = view
+        return section
+
+    def update_queue_item(self, video_item: VideoQueueItem):
+        """Insert or update the row for a queue item (applied on the next flush)"""
+        self.queue_model.update_item(video_item)
 
-        # Update control button based on status
+    def toggle_download(self, video_item: VideoQueueItem):
+        """Handle control button clicks based on current state"""
         if video_item.status == DownloadState.PENDING:
-            self.control_btn.setText("Start")
-            self.control_btn.setEnabled(True)
-            self.cancel_btn.setEnabled(True)
-            self.status_label.setText("Pending")
+            self.smart_queue._start_download(video_item)
         elif video_item.status == DownloadState.ACTIVE:
-            self.control_btn.setText("Pause")
-            self.control_btn.setEnabled(True)
-            self.cancel_btn.setEnabled(True)
-            self.status_label.setText("Downloading...")
+            self.smart_queue.pause_download(video_item.download_id)
         elif video_item.status == DownloadState.PAUSED:
-            self.control_btn.setText("Resume")
-            self.control_btn.setEnabled(True)
-            self.cancel_btn.setEnabled(True)
-            self.status_label.setText("Paused")
-        elif video_item.status == DownloadState.COMPLETED:
-            self.control_btn.setText("Complete")
-            self.control_btn.setEnabled(False)
-            self.cancel_btn.setEnabled(False)
-            self.status_label.setText("Completed")
+            self.smart_queue.resume_download(video_item.download_id)
         elif video_item.status == DownloadState.FAILED:
-            self.control_btn.setText("Retry")
-            self.control_btn.setEnabled(True)
-            self.cancel_btn.setEnabled(False)
-            self.status_label.setText(
-                f"Failed: {video_item.error_message if hasattr(video_item, 'error_message') else 'Unknown error'}")
-        elif video_item.status == DownloadState.RETRYING:
-            self.control_btn.setText("Retrying")
-            self.control_btn.setEnabled(False)
-            self.cancel_btn.setEnabled(True)
-            self.status_label.setText("Retrying download...")
-
-    def toggle_download(self):
-        """Handle control button clicks based on current state"""
-        if self.video_item.status == DownloadState.PENDING:
-            MainWindow.instance().smart_queue._start_download(self.video_item)
-        elif self.video_item.status == DownloadState.ACTIVE:
-            MainWindow.instance().smart_queue.pause_download(self.video_item.download_id)
-        elif self.video_item.status == DownloadState.PAUSED:
-            MainWindow.instance().smart_queue.resume_download(self.video_item.download_id)
-        elif self.video_item.status == DownloadState.FAILED:
-            MainWindow.instance().smart_queue.retry_download(self.video_item)
+            self.smart_queue.retry_failed(video_item)
 
-    def cancel_download(self):
+    def cancel_download(self, video_item: VideoQueueItem):
         """Cancel the download"""
-        if self.video_item.download_id:
-            MainWindow.instance().smart_queue.cancel_download(self.video_item.download_id)
+        self.smart_queue.cancel_item(video_item)
 
 
 class SmartQueue:
@@ -1060,45 +3524,502 @@ class YouTubeSearch(QThread):
             self.error.emit(str(e))
 
 
+class StreamManifestCache:
+    """Process-wide and on-disk cache of player responses and player JS.
+
+    Player responses (which carry the stream list) are keyed by video ID and
+    expire with the signed stream URLs inside them. Player JS, which holds
+    the signature decipher functions, is keyed by player version. A YouTube
+    object seeded from both builds its streams without touching the network.
+
+    Files past their TTL, and the oldest beyond max_files manifests or
+    max_players players, are pruned at startup and every prune_every stores.
+    """
+    PLAYER_VERSION_PATTERN = re.compile(r'/s/player/([\w-]+)/')
+
+    def __init__(self, directory: str = 'manifest_cache', player_ttl_seconds: float = 86400,
+                 expiry_margin_seconds: float = 600, max_files: int = 500, max_players: int = 4,
+                 prune_every: int = 50):
+        self.directory = directory
+        self.expiry_margin_seconds = expiry_margin_seconds
+        self.max_files = max_files
+        self.max_players = max_players
+        self.prune_every = prune_every
+        self._manifests = TTLCache(max_entries=max_files, ttl_seconds=6 * 3600)
+        self._players = TTLCache(max_entries=max_players, ttl_seconds=player_ttl_seconds)
+        self._stores = itertools.count(1)
+        os.makedirs(os.path.join(directory, 'players'), exist_ok=True)
+        threading.Thread(target=self.prune, name='ManifestCachePrune', daemon=True).start()
+
+    @staticmethod
+    def _prune_directory(directory: str, suffix: str, ttl_seconds: float, keep: int) -> int:
+        """Delete files older than ttl_seconds, then the oldest beyond keep; return how many went"""
+        now = time.time()
+        files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(suffix):
+                    files.append((entry.stat().st_mtime, entry.path))
+        files.sort(reverse=True)
+        removed = 0
+        for index, (mtime, path) in enumerate(files):
+            if index >= keep or now - mtime > ttl_seconds:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+    def prune(self):
+        """Bound the on-disk cache; expired entries are otherwise only ignored"""
+        try:
+            removed = self._prune_directory(self.directory, '.json', self._manifests.ttl_seconds, self.max_files)
+            removed += self._prune_directory(os.path.join(self.directory, 'players'), '.js',
+                                             self._players.ttl_seconds, self.max_players)
+            if removed:
+                cache_log.debug("Pruned %s manifest cache files", removed)
+        except OSError as e:
+            cache_log.warning("Manifest cache prune failed: %s", e)
+
+    def youtube(self, url: str, on_progress_callback=None) -> YouTube:
+        """Build a YouTube object, seeded from the cache when a fresh entry exists"""
+        yt = YouTube(VideoURL.canonical(url), on_progress_callback=on_progress_callback)
+        entry = self._load_manifest(yt.video_id)
+        CACHE_REQUESTS.inc(cache='manifest', result='miss' if entry is None else 'hit')
+        if entry is not None:
+            yt.client = entry['client']
+            yt._vid_info = copy.deepcopy(entry['vid_info'])
+            if entry['js_url']:
+                js = self._load_player(self._player_version(entry['js_url']))
+                if js is not None:
+                    yt._js_url = entry['js_url']
+                    yt._js = js
+            return yt
+
+        try:
+            self._store(yt)
+        except Exception as e:
+            # Let the caller surface the error through its own access path
+            cache_log.debug("Manifest cache store skipped for %s: %s", url, e)
+        return yt
+
+    def _store(self, yt: YouTube):
+        # streaming_data may switch to a fallback client; snapshot before streams mutate it
+        yt.streaming_data
+        vid_info = copy.deepcopy(yt.vid_info)
+        js_url = None
+        if InnerTube(yt.client).require_js_player:
+            js_url = yt.js_url
+            self._store_player(self._player_version(js_url), yt.js)
+
+        expires_in = int(vid_info['streamingData'].get('expiresInSeconds', 0))
+        if expires_in <= self.expiry_margin_seconds:
+            return
+        entry = {
+            'client': yt.client,
+            'vid_info': vid_info,
+            'js_url': js_url,
+            'expires_at': time.time() + expires_in - self.expiry_margin_seconds
+        }
+        self._manifests.put(yt.video_id, entry)
+        try:
+            with open(self._manifest_path(yt.video_id), 'w') as f:
+                json.dump(entry, f)
+        except Exception as e:
+            cache_log.error("Manifest cache write error: %s", e)
+        if next(self._stores) % self.prune_every == 0:
+            self.prune()
+
+    def _load_manifest(self, video_id: str) -> Optional[Dict]:
+        entry = self._manifests.get(video_id)
+        if entry is None:
+            try:
+                with open(self._manifest_path(video_id), 'r') as f:
+                    entry = json.load(f)
+            except:
+                return None
+        if entry['expires_at'] <= time.time():
+            self._manifests.pop(video_id)
+            return None
+        self._manifests.put(video_id, entry)
+        return entry
+
+    def _store_player(self, version: str, js: str):
+        if self._players.get(version) is not None:
+            return
+        self._players.put(version, js)
+        try:
+            with open(self._player_path(version), 'w') as f:
+                f.write(js)
+        except Exception as e:
+            cache_log.error("Player cache write error: %s", e)
+
+    def _load_player(self, version: str) -> Optional[str]:
+        js = self._players.get(version)
+        if js is not None:
+            return js
+        path = self._player_path(version)
+        try:
+            if time.time() - os.path.getmtime(path) > self._players.ttl_seconds:
+                return None
+            with open(path, 'r') as f:
+                js = f.read()
+        except OSError:
+            return None
+        self._players.put(version, js)
+        return js
+
+    def _player_version(self, js_url: str) -> str:
+        match = self.PLAYER_VERSION_PATTERN.search(js_url)
+        return match.group(1) if match else uuid.uuid5(uuid.NAMESPACE_URL, js_url).hex
+
+    def _manifest_path(self, video_id: str) -> str:
+        return os.path.join(self.directory, f"{video_id}.json")
+
+    def _player_path(self, version: str) -> str:
+        return os.path.join(self.directory, 'players', f"{version}.js")
+
+
+class HostRateLimiter:
+    """Token bucket rate limiter shared by worker threads, one bucket per host"""
+
+    def __init__(self, rate_per_second: float = 4.0, burst: int = 4):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str):
+        """Block until a request to the url's host is allowed"""
+        host = urlparse(url).netloc or url
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, [self.burst, now])
+                tokens = min(self.burst, tokens + (now - last) * self.rate_per_second)
+                if tokens >= 1:
+                    self._buckets[host] = [tokens - 1, now]
+                    return
+                self._buckets[host] = [tokens, now]
+                wait = (1 - tokens) / self.rate_per_second
+            time.sleep(wait)
+
+
 class PlaylistDownloader:
-    def __init__(self, url: str, download_manager):
-        self.url = url
+    def __init__(self, url: str, download_manager, max_workers: int = 8,
+                 rate_limiter: Optional[HostRateLimiter] = None):
+        self.url = VideoURL.canonical(url)
         self.download_manager = download_manager
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or HostRateLimiter()
         self.videos = []
+        self.is_cancelled = False
+
+    def fetch_playlist_header(self) -> Tuple[Dict, List[str]]:
+        """Fetch the playlist page only: title and video URLs, no per-video metadata"""
+        playlist = Playlist(self.url)
+        video_urls = [VideoURL.canonical(url) for url in playlist.video_urls]
+        header = {
+            'title': playlist.title,
+            'total_videos': len(video_urls)
+        }
+        return header, video_urls
+
+    def resolve_videos(self, playlist_title: str, video_urls: List[str], on_video=None):
+        """Resolve video metadata on a bounded pool, calling on_video as each one completes"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._resolve_video, index, url, playlist_title)
+                for index, url in enumerate(video_urls)
+            ]
+            try:
+                for future in as_completed(futures):
+                    if self.is_cancelled:
+                        break
+                    try:
+                        video_info = future.result()
+                    except Exception as e:
+                        playlist_log.warning("Skipping playlist entry: %s", e)
+                        continue
+                    self.videos.append(video_info)
+                    if self.download_manager is not None:
+                        self.download_manager.video_index.add([video_info])
+                    if on_video:
+                        on_video(video_info)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _resolve_video(self, index: int, url: str, playlist_title: str) -> Dict:
+        if self.is_cancelled:
+            raise Exception("Playlist resolution cancelled")
+        self.rate_limiter.acquire(url)
+        # Metadata only: going through the manifest cache would fetch and store every stream manifest
+        video = YouTube(url)
+        length = video.length or 0
+        return {
+            'url': video.watch_url,
+            'video_id': video.video_id,
+            'title': video.title,
+            'channel': video.author,
+            'duration': str(timedelta(seconds=length)),
+            'length': length,
+            'thumbnail_url': video.thumbnail_url,
+            'playlist_index': index,
+            'playlist_title': playlist_title
+        }
 
     def fetch_playlist_info(self) -> Dict:
         """Fetch playlist metadata and video information"""
         try:
-            playlist = Playlist(self.url)
-            videos = []
-
-            for index, video in enumerate(playlist.videos):
-                video_info = {
-                    'url': video.watch_url,
-                    'title': video.title,
-                    'duration': str(timedelta(seconds=video.length)),
-                    'thumbnail_url': video.thumbnail_url,
-                    'playlist_index': index,
-                    'playlist_title': playlist.title
-                }
-                videos.append(video_info)
+            header, video_urls = self.fetch_playlist_header()
+            self.videos = []
+            self.resolve_videos(header['title'], video_urls)
+            videos = sorted(self.videos, key=lambda v: v['playlist_index'])
 
             return {
-                'title': playlist.title,
+                'title': header['title'],
                 'videos': videos,
                 'total_videos': len(videos),
-                'total_duration': sum(video.length for video in playlist.videos)
+                'total_duration': sum(video['length'] for video in videos)
             }
 
         except Exception as e:
             raise Exception(f"Failed to fetch playlist: {str(e)}")
 
+    def cancel(self):
+        self.is_cancelled = True
+
+
+class PlaylistResolver(QThread):
+    """Resolves a playlist in the background and streams entries as they arrive"""
+    header_ready = pyqtSignal(dict)
+    video_resolved = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, playlist_downloader: PlaylistDownloader, parent=None):
+        super().__init__(parent)
+        self.playlist_downloader = playlist_downloader
+
+    def run(self):
+        try:
+            header, video_urls = self.playlist_downloader.fetch_playlist_header()
+            self.header_ready.emit(header)
+            self.playlist_downloader.resolve_videos(
+                header['title'], video_urls, self.video_resolved.emit
+            )
+        except Exception as e:
+            if not self.playlist_downloader.is_cancelled:
+                self.error.emit(f"Failed to fetch playlist: {str(e)}")
+
+    def cancel(self):
+        self.playlist_downloader.cancel()
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, one series per operation name"""
+    BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, float('inf'))
+
+    def __init__(self):
+        self._series: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: float):
+        elapsed_ms = seconds * 1000
+        bucket = bisect.bisect_left(self.BUCKETS_MS, elapsed_ms)
+        with self._lock:
+            series = self._series.setdefault(operation, {
+                'counts': [0] * len(self.BUCKETS_MS),
+                'count': 0,
+                'sum_ms': 0.0
+            })
+            series['counts'][bucket] += 1
+            series['count'] += 1
+            series['sum_ms'] += elapsed_ms
+
+    def percentile(self, operation: str, fraction: float) -> Optional[float]:
+        """Upper bucket bound (ms) containing the given fraction of samples"""
+        with self._lock:
+            series = self._series.get(operation)
+            if not series or not series['count']:
+                return None
+            target = fraction * series['count']
+            seen = 0
+            for bound, count in zip(self.BUCKETS_MS, series['counts']):
+                seen += count
+                if seen >= target:
+                    return bound
+        return None
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                operation: {
+                    'count': series['count'],
+                    'mean_ms': series['sum_ms'] / series['count'],
+                    'buckets': dict(zip(
+                        [str(bound) for bound in self.BUCKETS_MS], series['counts']
+                    ))
+                }
+                for operation, series in self._series.items() if series['count']
+            }
+
+
+class BackgroundTaskRunner(QObject):
+    """Runs blocking calls on a worker pool and delivers results on the GUI thread.
+
+    Tasks submitted under the same key supersede each other: a newer submission
+    cancels the older one if it has not started yet, and discards its result if
+    it has.
+    """
+    _task_done = pyqtSignal(object, object, object, object)
+
+    def __init__(self, histogram: LatencyHistogram, max_workers: int = 4, parent=None):
+        super().__init__(parent)
+        self.histogram = histogram
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._generations: Dict[str, int] = {}
+        self._futures: Dict[str, object] = {}
+        self._task_done.connect(self._deliver)
+
+    def submit(self, operation: str, fn, on_result, on_error=None, key: Optional[str] = None):
+        token = None
+        if key:
+            self.cancel(key)
+            token = self._generations[key]
+        future = self._executor.submit(self._run, operation, fn, key, token, on_result, on_error)
+        if key:
+            self._futures[key] = future
+        return future
+
+    def submit_iter(self, operation: str, fn, on_item, on_done=None, on_error=None,
+                    key: Optional[str] = None):
+        """Like submit, but fn returns an iterable whose items are delivered as they arrive.
+
+        Iteration stops early once the task is superseded.
+        """
+        def consume(token_key, token):
+            for item in fn():
+                if not self.is_current(token_key, token):
+                    return None
+                self._task_done.emit(token_key, token, on_item, item)
+            return None
+
+        token = None
+        if key:
+            self.cancel(key)
+            token = self._generations[key]
+        future = self._executor.submit(
+            self._run, operation, lambda: consume(key, token), key, token,
+            lambda _: on_done() if on_done else None, on_error
+        )
+        if key:
+            self._futures[key] = future
+        return future
+
+    def cancel(self, key: str):
+        """Supersede whatever is running under key"""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        future = self._futures.pop(key, None)
+        if future:
+            future.cancel()
+
+    def is_current(self, key: Optional[str], token: Optional[int]) -> bool:
+        return key is None or self._generations.get(key) == token
+
+    def _run(self, operation, fn, key, token, on_result, on_error):
+        started = time.perf_counter()
+        try:
+            payload, callback = fn(), on_result
+        except Exception as e:
+            payload, callback = e, on_error
+        self.histogram.record(operation, time.perf_counter() - started)
+
+        if self.is_current(key, token) and callback:
+            self._task_done.emit(key, token, callback, payload)
+
+    def _deliver(self, key, token, callback, payload):
+        # Re-check on the GUI thread: a newer task may have been submitted meanwhile
+        if self.is_current(key, token):
+            if key:
+                self._futures.pop(key, None)
+            callback(payload)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ManifestPrefetcher:
+    """Resolves YouTube objects and their stream manifests ahead of time.
+
+    Resolved objects sit in a short-TTL cache; VideoDownloader takes one from
+    here first, so a prefetched download starts without the watch-page and
+    player round trips.
+    """
+
+    def __init__(self, manifest_cache: Optional[StreamManifestCache] = None, max_workers: int = 2,
+                 ttl_seconds: float = 300, max_entries: int = 100, max_pending: int = 20):
+        self.manifest_cache = manifest_cache
+        self.max_pending = max_pending
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def prefetch(self, urls: List[str]):
+        """Schedule background resolution for urls not already cached or in flight"""
+        for url in map(VideoURL.canonical, urls):
+            with self._lock:
+                if url in self._pending or len(self._pending) >= self.max_pending:
+                    continue
+                if self._cache.get(url) is not None:
+                    continue
+                self._pending.add(url)
+            self._executor.submit(self._prefetch_one, url)
+
+    def _prefetch_one(self, url: str):
+        try:
+            self.resolve(url)
+        except Exception as e:
+            cache_log.debug("Manifest prefetch failed for %s: %s", url, e)
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+
+    def resolve(self, url: str):
+        """Return a resolved YouTube object for url, from the cache or the network"""
+        url = VideoURL.canonical(url)
+        yt = self._cache.get(url)
+        if yt is None:
+            yt = self.manifest_cache.youtube(url) if self.manifest_cache else YouTube(url)
+            # Touching these fetches the watch page, player JS and stream manifest
+            yt.title
+            yt.streams
+            self._cache.put(url, yt)
+        return yt
+
+    def peek(self, url: str):
+        """Return a cached YouTube object without taking it, or None"""
+        return self._cache.get(VideoURL.canonical(url))
+
+    def take(self, url: str):
+        """Remove and return a cached YouTube object, or None; each object serves one download"""
+        yt = self._cache.pop(VideoURL.canonical(url))
+        CACHE_REQUESTS.inc(cache='prefetch', result='miss' if yt is None else 'hit')
+        return yt
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
 
 class DownloadManager:
     def __init__(self):
         self.queue = []
-        self.history = self.load_history()
+        # History is loaded off the startup path; see set_history
+        self.history = []
+        self.history_loaded = False
+        self._history_keys = set()
         self.settings = self.load_settings()
+        self.video_index = VideoIndex()
 
         # Create downloads directory if it doesn't exist
         os.makedirs(self.settings['download_path'], exist_ok=True)
@@ -1110,6 +4031,15 @@ class DownloadManager:
         except:
             return []
 
+    def set_history(self, history: List[Dict]):
+        """Install history loaded in the background, keeping entries added meanwhile"""
+        pending = self.history
+        self.history = history + pending
+        self._history_keys = {VideoURL.key(entry['url']) for entry in self.history if entry.get('url')}
+        self.history_loaded = True
+        if pending:
+            self.save_history()
+
     def save_history(self):
         with open('download_history.json', 'w') as f:
             json.dump(self.history, f)
@@ -1129,40 +4059,123 @@ class DownloadManager:
         with open('settings.json', 'w') as f:
             json.dump(self.settings, f)
 
+    def is_downloaded(self, url: str) -> bool:
+        return VideoURL.key(url) in self._history_keys
+
     def add_to_queue(self, video_info: Dict):
         self.queue.append(video_info)
 
     def add_to_history(self, video_info: Dict):
+        if video_info.get('url'):
+            video_info = {**video_info, 'url': VideoURL.canonical(video_info['url'])}
+            self._history_keys.add(VideoURL.key(video_info['url']))
         self.history.append(video_info)
-        self.save_history()
+        # Saving before the load finishes would overwrite the file with a partial history
+        if self.history_loaded:
+            self.save_history()
+        self.video_index.add([video_info], downloaded=True)
 
 
 class VideoDownloader(QThread):
     progress = pyqtSignal(int, str)
     finished = pyqtSignal(str, str)
     error = pyqtSignal(str)
+    cancelled = pyqtSignal()
 
-    def __init__(self, url: str, quality: str, download_path: str):
+    def __init__(self, url: str, quality: str, download_path: str,
+                 prefetcher: Optional[ManifestPrefetcher] = None,
+                 disk_space: Optional[DiskSpaceReservations] = None,
+                 write_options: Optional[Dict] = None, download_id: Optional[str] = None,
+                 preallocate: bool = True):
         super().__init__()
-        print(f"DEBUG: Initializing VideoDownloader for URL: {url}")
-        self.url = url
+        download_log.debug("Initializing VideoDownloader for URL: %s", url)
+        self.url = VideoURL.canonical(url)
         self.quality = quality
         self.download_path = download_path
+        self.prefetcher = prefetcher
+        self.disk_space = disk_space
+        self.write_options = write_options or {}
+        self.preallocate = preallocate
         self.is_cancelled = False
-        self.download_id = uuid.uuid4().hex[:6].upper()
+        # A retry passes its previous ID so it reuses the folder and any finished files in it
+        self.download_id = download_id or uuid.uuid4().hex[:6].upper()
         self._yt = None
         self.start_time = None
+        self._stream_started = None
+        self._stream_remaining = None
+
+    @staticmethod
+    def best_video_stream(streams):
+        return streams.filter(adaptive=True, only_video=True).order_by('resolution').desc().first()
+
+    @staticmethod
+    def best_audio_stream(streams):
+        return streams.filter(only_audio=True, mime_type="audio/mp4").order_by('abr').desc().first()
+
+    @classmethod
+    def planned_streams(cls, streams, quality: str) -> List:
+        """The streams a download at quality would fetch; empty if one is missing"""
+        if quality == 'High Quality Pro Plus':
+            planned = [cls.best_video_stream(streams), cls.best_audio_stream(streams)]
+        elif 'audio' in quality.lower():
+            planned = [cls.best_audio_stream(streams)]
+        else:
+            planned = [streams.filter(progressive=True, resolution=quality).first()]
+        return planned if all(planned) else []
+
+    def _transfer(self, stream, video_folder: str, filename: str):
+        """Fetch stream into video_folder/filename, allocating the whole file first.
+
+        Disk writes go through a WriteBehindFile so a slow disk does not hold up
+        the next network read. SABR streams go through pytubefix's own
+        downloader, which opens the file itself, so they are written inline.
+        A file already complete from an earlier attempt is kept as is.
+        """
+        path = os.path.join(video_folder, filename)
+        if os.path.isfile(path) and os.path.getsize(path) == stream.filesize:
+            download_log.info("Already downloaded, skipping: %s", path)
+            return
+        if stream.is_sabr:
+            stream.download(output_path=video_folder, filename=filename)
+            return
+        with preallocated_file(path, stream.filesize if self.preallocate else 0) as (file, allocated):
+            if self.disk_space is not None and allocated:
+                self.disk_space.consume(DiskSpaceReservations.key(self.url, self.quality), allocated)
+            with WriteBehindFile(file, **self.write_options) as writer:
+                stream.stream_to_buffer(writer)
+
+    def _begin_stream(self):
+        """Mark the start of a stream request, for TTFB and per-stream rate"""
+        self._stream_started = time.perf_counter()
+        self._stream_remaining = None
+
+    def _record_chunk(self, stream, bytes_remaining: int):
+        if self._stream_remaining is None:
+            DOWNLOAD_TTFB.observe(time.perf_counter() - self._stream_started, quality=self.quality)
+            self._stream_remaining = stream.filesize
+        DOWNLOAD_BYTES.inc(self._stream_remaining - bytes_remaining, quality=self.quality)
+        self._stream_remaining = bytes_remaining
+        elapsed = time.perf_counter() - self._stream_started
+        if elapsed > 0:
+            DOWNLOAD_RATE.set((stream.filesize - bytes_remaining) / elapsed, download_id=self.download_id)
 
     def run(self):
-        print(f"DEBUG: Starting download process for {self.url}")
+        with TRACER.span('VideoDownloader.run', 'download', download_id=self.download_id,
+                         quality=self.quality, url=self.url):
+            self._run()
+
+    def _run(self):
+        download_log.debug("Starting download process for %s", self.url)
         try:
             self.start_time = time.time()
-            print("DEBUG: Creating YouTube object")
+            download_log.debug("Creating YouTube object")
 
             def on_progress(stream, chunk, bytes_remaining):
                 if self.is_cancelled:
-                    return
+                    # Raised through stream_to_buffer, which ends the transfer
+                    raise Exception("Download cancelled")
                 try:
+                    self._record_chunk(stream, bytes_remaining)
                     total = stream.filesize
                     downloaded = total - bytes_remaining
                     progress = int((downloaded / total) * 100)
@@ -1173,37 +4186,60 @@ class VideoDownloader(QThread):
                         f"Speed: {speed / 1024 / 1024:.1f}MB/s | ETA: {eta}"
                     )
                 except Exception as e:
-                    print(f"DEBUG: Progress callback error: {str(e)}")
-
-            self._yt = YouTube(
-                self.url,
-                on_progress_callback=on_progress
-            )
-            print("DEBUG: YouTube object created successfully")
+                    download_log.error("Progress callback error: %s", e)
+
+            resolve_started = time.perf_counter()
+            with TRACER.span('construct YouTube', 'download') as span:
+                self._yt = self.prefetcher.take(self.url) if self.prefetcher else None
+                metadata_source = 'prefetched' if self._yt is not None else 'resolved'
+                if span:
+                    span.args['source'] = metadata_source
+                if self._yt is not None:
+                    download_log.debug("Using prefetched YouTube object")
+                    self._yt.register_on_progress_callback(on_progress)
+                else:
+                    manifest_cache = self.prefetcher.manifest_cache if self.prefetcher else None
+                    if manifest_cache is not None:
+                        self._yt = manifest_cache.youtube(self.url, on_progress_callback=on_progress)
+                    else:
+                        self._yt = YouTube(
+                            self.url,
+                            on_progress_callback=on_progress
+                        )
+            download_log.debug("YouTube object created successfully")
 
             # Create folder and download
-            safe_title = "".join(c for c in self._yt.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            folder_name = f"[{self.download_id}] {safe_title}"
-            video_folder = os.path.join(self.download_path, folder_name)
-            os.makedirs(video_folder, exist_ok=True)
-            print(f"DEBUG: Created folder: {video_folder}")
+            with TRACER.span('fetch metadata', 'download'):
+                title = self._yt.title
+            safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+            METADATA_LATENCY.observe(time.perf_counter() - resolve_started, source=metadata_source)
+            with TRACER.span('create folder', 'download'):
+                folder_name = f"[{self.download_id}] {safe_title}"
+                video_folder = os.path.join(self.download_path, folder_name)
+                os.makedirs(video_folder, exist_ok=True)
+            download_log.debug("Created folder: %s", video_folder)
 
             if not self.is_cancelled:
                 self._download_video(video_folder)
-                print("DEBUG: Emitting finished signal")
-                self.finished.emit(video_folder, self.download_id)
-                print("DEBUG: Download complete")
+            if not self.is_cancelled:
+                download_log.debug("Emitting finished signal")
+                with TRACER.span('finalize', 'download'):
+                    self.finished.emit(video_folder, self.download_id)
+                download_log.debug("Download complete")
 
         except Exception as e:
-            print(f"DEBUG: Download error: {str(e)}")
+            download_log.error("Download error: %s", e)
             if not self.is_cancelled:
                 self.error.emit(str(e))
         finally:
-            print("DEBUG: Download process finished")
+            DOWNLOAD_RATE.remove(download_id=self.download_id)
+            if self.is_cancelled:
+                self.cancelled.emit()
+            download_log.debug("Download process finished")
 
     def _download_video(self, video_folder):
         """Handle the actual download based on quality selection"""
-        print(f"DEBUG: Starting download with quality: {self.quality}")
+        download_log.debug("Starting download with quality: %s", self.quality)
         try:
             if self.quality == 'High Quality Pro Plus':
                 self._download_high_quality(video_folder)
@@ -1212,95 +4248,83 @@ class VideoDownloader(QThread):
             else:
                 self._download_normal_quality(video_folder)
         except Exception as e:
-            print(f"DEBUG: Download error: {str(e)}")
+            download_log.error("Download error: %s", e)
             raise
 
     def _download_high_quality(self, video_folder):
         try:
-            print("DEBUG: Starting high quality download")
+            download_log.debug("Starting high quality download")
             # Video stream
-            video_stream = (self._yt.streams
-                            .filter(adaptive=True, only_video=True)
-                            .order_by('resolution')
-                            .desc()
-                            .first())
+            with TRACER.span('select video stream', 'download'):
+                video_stream = self.best_video_stream(self._yt.streams)
 
             if not video_stream:
                 raise Exception("No suitable video stream found")
 
-            print(f"DEBUG: Downloading video: {video_stream.resolution}")
-            video_stream.download(
-                output_path=video_folder,
-                filename=f"video_{video_stream.resolution}.mp4"
-            )
+            download_log.debug("Downloading video: %s", video_stream.resolution)
+            self._begin_stream()
+            with TRACER.span('transfer video', 'download', bytes=video_stream.filesize):
+                self._transfer(video_stream, video_folder, f"video_{video_stream.resolution}.mp4")
 
             if self.is_cancelled:
                 return
 
             # Audio stream
-            audio_stream = (self._yt.streams
-                            .filter(only_audio=True, mime_type="audio/mp4")
-                            .order_by('abr')
-                            .desc()
-                            .first())
+            with TRACER.span('select audio stream', 'download'):
+                audio_stream = self.best_audio_stream(self._yt.streams)
 
             if not audio_stream:
                 raise Exception("No suitable audio stream found")
 
-            print(f"DEBUG: Downloading audio: {audio_stream.abr}")
-            audio_stream.download(
-                output_path=video_folder,
-                filename=f"audio_{audio_stream.abr}.m4a"
-            )
+            download_log.debug("Downloading audio: %s", audio_stream.abr)
+            self._begin_stream()
+            with TRACER.span('transfer audio', 'download', bytes=audio_stream.filesize):
+                self._transfer(audio_stream, video_folder, f"audio_{audio_stream.abr}.m4a")
 
         except Exception as e:
-            print(f"DEBUG: High quality download error: {str(e)}")
+            download_log.error("High quality download error: %s", e)
             raise
 
     def _download_audio_only(self, video_folder):
         try:
-            print("DEBUG: Starting audio-only download")
-            stream = (self._yt.streams
-                      .filter(only_audio=True, mime_type="audio/mp4")
-                      .order_by('abr')
-                      .desc()
-                      .first())
+            download_log.debug("Starting audio-only download")
+            with TRACER.span('select audio stream', 'download'):
+                stream = self.best_audio_stream(self._yt.streams)
 
             if not stream:
                 raise Exception("No suitable audio stream found")
 
-            print(f"DEBUG: Downloading audio: {stream.abr}")
-            stream.download(
-                output_path=video_folder,
-                filename=f"audio_{stream.abr}.m4a"
-            )
+            download_log.debug("Downloading audio: %s", stream.abr)
+            self._begin_stream()
+            with TRACER.span('transfer audio', 'download', bytes=stream.filesize):
+                self._transfer(stream, video_folder, f"audio_{stream.abr}.m4a")
 
         except Exception as e:
-            print(f"DEBUG: Audio download error: {str(e)}")
+            download_log.error("Audio download error: %s", e)
             raise
 
     def _download_normal_quality(self, video_folder):
         try:
-            print(f"DEBUG: Starting {self.quality} download")
-            stream = (self._yt.streams
-                      .filter(progressive=True, resolution=self.quality)
-                      .first())
+            download_log.debug("Starting %s download", self.quality)
+            with TRACER.span('select video stream', 'download'):
+                stream = (self._yt.streams
+                          .filter(progressive=True, resolution=self.quality)
+                          .first())
 
             if not stream:
                 raise Exception(f"No stream found for quality: {self.quality}")
 
-            print(f"DEBUG: Downloading video: {stream.resolution}")
-            stream.download(
-                output_path=video_folder,
-                filename=f"video_{stream.resolution}.mp4"
-            )
+            download_log.debug("Downloading video: %s", stream.resolution)
+            self._begin_stream()
+            with TRACER.span('transfer video', 'download', bytes=stream.filesize):
+                self._transfer(stream, video_folder, f"video_{stream.resolution}.mp4")
 
         except Exception as e:
-            print(f"DEBUG: Normal quality download error: {str(e)}")
+            download_log.error("Normal quality download error: %s", e)
             raise
 
     def cancel(self):
-        print("DEBUG: Cancelling download")
+        download_log.debug("Cancelling download")
         self.is_cancelled = True
 
 
@@ -1364,7 +4388,7 @@ class DownloadCard(QFrame):
         self.cancel_btn.clicked.connect(self.cancel_download)
 
     def start_download(self):
-        print("DEBUG: DownloadCard start_download called")
+        download_log.debug("DownloadCard start_download called")
         try:
             # Update UI
             self.download_btn.setEnabled(False)
@@ -1384,12 +4408,16 @@ class DownloadCard(QFrame):
             )
 
             # Add to queue
-            print("DEBUG: Adding to smart queue")
-            MainWindow.instance().smart_queue.add_download(video_item)
-            print("DEBUG: Successfully added to queue")
+            download_log.debug("Adding to smart queue")
+            if not MainWindow.instance().smart_queue.add_download(video_item):
+                self.status_label.setText("Already in queue")
+                self.download_btn.setEnabled(True)
+                self.cancel_btn.hide()
+                return
+            download_log.debug("Successfully added to queue")
 
         except Exception as e:
-            print(f"DEBUG: Error starting download: {str(e)}")
+            download_log.error("Error starting download: %s", e)
             self.status_label.setText(f"Error: {str(e)}")
             self.download_btn.setEnabled(True)
             self.cancel_btn.hide()
@@ -1404,29 +4432,28 @@ class DownloadCard(QFrame):
                 self.reset_ui()
                 self.status_label.setText("Download cancelled")
         except Exception as e:
-            logging.error(f"Cancel error: {str(e)}")
+            download_log.error("Cancel error: %s", e)
             self.status_label.setText(f"Cancel error: {str(e)}")
 
     def update_progress(self, progress: int, status: str):
-        print(f"DEBUG: Progress update - {progress}% - {status}")
+        download_log.debug("Progress update - %s%% - %s", progress, status)
         try:
             self.progress_bar.setValue(progress)
             self.status_label.setText(status)
         except Exception as e:
-            print(f"DEBUG: Error in update_progress: {str(e)}")
-            logging.error(f"Progress update error: {str(e)}")
+            download_log.error("Progress update error: %s", e)
 
     def download_finished(self, folder_path: str, download_id: str):
-        print(f"DEBUG: Download finished - ID: {download_id}")
+        download_log.debug("Download finished - ID: %s", download_id)
         try:
-            print("DEBUG: Cleaning up thread")
+            download_log.debug("Cleaning up thread")
             self.download_thread.quit()
             self.download_thread.wait()
-            print("DEBUG: Resetting UI")
+            download_log.debug("Resetting UI")
             self.reset_ui()
             self.status_label.setText(f"Download completed! [ID: {download_id}]")
 
-            print("DEBUG: Adding to history")
+            download_log.debug("Adding to history")
             MainWindow.instance().download_manager.add_to_history({
                 **self.video_info,
                 'downloaded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
@@ -1434,7 +4461,7 @@ class DownloadCard(QFrame):
                 'download_id': download_id
             })
 
-            print("DEBUG: Showing completion message")
+            download_log.debug("Showing completion message")
             QMessageBox.information(
                 self,
                 "Download Complete",
@@ -1442,8 +4469,7 @@ class DownloadCard(QFrame):
             )
 
         except Exception as e:
-            print(f"DEBUG: Error in download_finished: {str(e)}")
-            logging.error(f"Download finish error: {str(e)}")
+            download_log.error("Download finish error: %s", e)
             self.status_label.setText(f"Error finalizing download: {str(e)}")
 
     def download_error(self, error: str):
@@ -1462,7 +4488,7 @@ class DownloadCard(QFrame):
             )
 
         except Exception as e:
-            logging.error(f"Error handling error: {str(e)}")
+            download_log.error("Error handling error: %s", e)
 
     def reset_ui(self):
         self.download_btn.show()
@@ -1483,7 +4509,7 @@ class DownloadCard(QFrame):
                 self.load_thumbnail(thumbnail_url)
 
         except Exception as e:
-            logging.error(f"Info update error: {str(e)}")
+            download_log.error("Info update error: %s", e)
             self.status_label.setText("Error updating info")
 
     def load_thumbnail(self, url: str):
@@ -1493,7 +4519,7 @@ class DownloadCard(QFrame):
                 pixmap.loadFromData(data)
                 self.thumbnail.setPixmap(pixmap)
             except Exception as e:
-                logging.error(f"Thumbnail load error: {str(e)}")
+                download_log.error("Thumbnail load error: %s", e)
 
         try:
             # Load thumbnail in a thread pool
@@ -1501,7 +4527,7 @@ class DownloadCard(QFrame):
                 lambda: set_thumbnail(requests.get(url).content)
             )
         except Exception as e:
-            logging.error(f"Thumbnail thread error: {str(e)}")
+            download_log.error("Thumbnail thread error: %s", e)
 
 
 class MainWindow(QMainWindow):
@@ -1514,10 +4540,98 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         MainWindow._instance = self  # Set instance immediately
-        self.download_manager = DownloadManager()
-        self.search_manager = YouTubeSearchManager()
-        self.smart_queue = SmartQueueManager()
-        self.setup_enhanced_ui()
+        with STARTUP_PROFILE.measure("init DownloadManager"):
+            self.download_manager = DownloadManager()
+        apply_log_levels(self.download_manager.settings.get('log_levels', {}))
+        with STARTUP_PROFILE.measure("init YouTubeSearchManager"):
+            self.search_manager = YouTubeSearchManager(video_index=self.download_manager.video_index)
+        with STARTUP_PROFILE.measure("init SmartQueueManager"):
+            self.smart_queue = SmartQueueManager()
+        with STARTUP_PROFILE.measure("init manifest cache and prefetcher"):
+            self.manifest_cache = StreamManifestCache()
+            self.manifest_prefetcher = ManifestPrefetcher(self.manifest_cache)
+            self.smart_queue.manifest_prefetcher = self.manifest_prefetcher
+        self.latency_histogram = LatencyHistogram()
+        self.task_runner = BackgroundTaskRunner(self.latency_histogram, parent=self)
+        with STARTUP_PROFILE.measure("build UI"):
+            self.setup_enhanced_ui()
+
+        self.task_runner.submit(
+            'load_history',
+            self.download_manager.load_history,
+            self._history_loaded,
+            lambda e: ui_log.error("Error loading history: %s", e)
+        )
+        self._startup_done = False
+        self._setup_metrics()
+
+        # Hidden: start/stop a profiling session without restarting
+        self.profile_shortcut = QShortcut(QKeySequence("Ctrl+Alt+Shift+P"), self)
+        self.profile_shortcut.activated.connect(self.toggle_profiling)
+
+    def toggle_profiling(self):
+        """Start or stop PROFILER; stopping writes reports off the GUI thread"""
+        stopping = PROFILER.active
+        self.task_runner.submit(
+            'toggle_profiling',
+            PROFILER.toggle,
+            lambda result: self.status_bar.showMessage(
+                f"Profile written to {result}" if stopping else result, 10000
+            ),
+            lambda e: ui_log.error("Profiling toggle failed: %s", e)
+        )
+
+    def _setup_metrics(self):
+        """Serve /metrics on localhost and write a periodic JSON snapshot"""
+        settings = self.download_manager.settings
+        port = settings.get('metrics_port', 9464)
+        if port:
+            try:
+                host, port = METRICS.serve(port)
+                ui_log.info("Serving metrics on http://%s:%s/metrics", host, port)
+            except OSError as e:
+                ui_log.warning("Metrics endpoint disabled: %s", e)
+
+        self.metrics_snapshot_path = settings.get('metrics_snapshot_path', 'metrics_snapshot.json')
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(int(settings.get('metrics_snapshot_interval', 60) * 1000))
+        self.metrics_timer.timeout.connect(self._write_metrics_snapshot)
+        self.metrics_timer.start()
+
+    def _write_metrics_snapshot(self):
+        self.task_runner.submit(
+            'metrics_snapshot',
+            lambda: METRICS.write_snapshot(self.metrics_snapshot_path),
+            lambda _: None,
+            lambda e: ui_log.warning("Metrics snapshot failed: %s", e),
+            key='metrics_snapshot'
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._startup_done:
+            self._startup_done = True
+            # Runs on the first event loop pass after the window is mapped
+            QTimer.singleShot(0, self._after_first_show)
+
+    def _after_first_show(self):
+        window_shown_ms = (time.perf_counter() - STARTUP_STARTED) * 1000
+        if STARTUP_PROFILE.enabled:
+            print(STARTUP_PROFILE.report(window_shown_ms))
+        else:
+            ui_log.debug("Window shown %.1f ms after start", window_shown_ms)
+
+        self.task_runner.submit(
+            'warm_imports',
+            lambda: [module.resolve() for module in WARM_IMPORTS],
+            lambda _: None,
+            lambda e: ui_log.warning("Background import failed: %s", e)
+        )
+        QTimer.singleShot(0, self._build_next_deferred_tab)
+
+    def _history_loaded(self, history: List[Dict]):
+        self.download_manager.set_history(history)
+        self.update_history()
 
 
     def setup_enhanced_ui(self):
@@ -1530,14 +4644,16 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(main_widget)
 
         # Create tab widget
-        tabs = QTabWidget()
-        layout.addWidget(tabs)
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
 
-        # Add tabs
-        tabs.addTab(self.create_search_tab(), "Search")
-        tabs.addTab(self.create_downloads_tab(), "Downloads")
-        tabs.addTab(self.create_history_tab(), "History")
-        tabs.addTab(self.create_settings_tab(), "Settings")
+        # Add tabs; only Search is built up front, the rest on first view or when idle
+        self._deferred_tabs: Dict[int, object] = {}
+        self.tabs.addTab(self.create_search_tab(), "Search")
+        self._add_deferred_tab(self.create_downloads_tab, "Downloads")
+        self._add_deferred_tab(self.create_history_tab, "History")
+        self._add_deferred_tab(self.create_settings_tab, "Settings")
+        self.tabs.currentChanged.connect(self._build_tab)
 
         # Status bar
         self.status_bar = QStatusBar()
@@ -1546,6 +4662,29 @@ class MainWindow(QMainWindow):
         # Setup queue manager listeners
         self.smart_queue.add_listener(self.handle_queue_event)
 
+    def _add_deferred_tab(self, builder, title: str):
+        placeholder = QWidget()
+        QVBoxLayout(placeholder).setContentsMargins(0, 0, 0, 0)
+        self._deferred_tabs[self.tabs.addTab(placeholder, title)] = builder
+
+    def _build_tab(self, index: int):
+        """Build a deferred tab into its placeholder; no-op once built"""
+        builder = self._deferred_tabs.pop(index, None)
+        if builder is None:
+            return
+        with STARTUP_PROFILE.measure(f"build {self.tabs.tabText(index)} tab"):
+            self.tabs.widget(index).layout().addWidget(builder())
+
+    def _build_next_deferred_tab(self):
+        if self._deferred_tabs:
+            self._build_tab(min(self._deferred_tabs))
+            QTimer.singleShot(0, self._build_next_deferred_tab)
+
+    def _ensure_tab(self, builder):
+        for index, pending in list(self._deferred_tabs.items()):
+            if pending == builder:
+                self._build_tab(index)
+
     def create_search_tab(self) -> QWidget:
         """Create the enhanced search tab"""
         tab = QWidget()
@@ -1558,10 +4697,27 @@ class MainWindow(QMainWindow):
         # Search controls
         search_input_layout = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Enter YouTube URL or search for videos...")
+        self.search_input.setPlaceholderText(
+            "Enter YouTube URL or search for videos (separate queries with |, variations as {a,b})..."
+        )
         self.search_btn = QPushButton("Search/Fetch")
+        self.offline_check = QCheckBox("Offline library")
+        self.offline_check.setToolTip("Search previously seen and downloaded videos as you type")
         search_input_layout.addWidget(self.search_input)
         search_input_layout.addWidget(self.search_btn)
+        search_input_layout.addWidget(self.offline_check)
+        self.live_check = QCheckBox("Live search")
+        self.live_check.setToolTip("Search while typing, after a short pause")
+        self.live_check.setChecked(self.download_manager.settings.get('live_search', False))
+        search_input_layout.addWidget(self.live_check)
+
+        self._last_keystroke = None
+        self.live_search_timer = QTimer(self)
+        self.live_search_timer.setSingleShot(True)
+        self.live_search_timer.setInterval(
+            self.download_manager.settings.get('live_search_debounce_ms', 350)
+        )
+        self.live_search_timer.timeout.connect(self._run_live_search)
         search_layout.addLayout(search_input_layout)
 
         # Quality selection
@@ -1592,6 +4748,31 @@ class MainWindow(QMainWindow):
         ])
         filter_layout.addWidget(QLabel("Upload Date:"), 0, 2)
         filter_layout.addWidget(self.date_combo, 0, 3)
+
+        self.min_views_combo = QComboBox()
+        for label, views in (("Any Views", 0), ("1K+", 1000), ("10K+", 10000),
+                             ("100K+", 100000), ("1M+", 1000000)):
+            self.min_views_combo.addItem(label, views)
+        filter_layout.addWidget(QLabel("Views:"), 1, 0)
+        filter_layout.addWidget(self.min_views_combo, 1, 1)
+
+        self.channel_filter_input = QLineEdit()
+        self.channel_filter_input.setPlaceholderText("Any channel")
+        filter_layout.addWidget(QLabel("Channel:"), 1, 2)
+        filter_layout.addWidget(self.channel_filter_input, 1, 3)
+
+        self.min_duration_spin = QSpinBox()
+        self.min_duration_spin.setRange(0, 600)
+        self.min_duration_spin.setSuffix(" min")
+        self.min_duration_spin.setSpecialValueText("No minimum")
+        self.max_duration_spin = QSpinBox()
+        self.max_duration_spin.setRange(0, 600)
+        self.max_duration_spin.setSuffix(" min")
+        self.max_duration_spin.setSpecialValueText("No maximum")
+        filter_layout.addWidget(QLabel("Min Duration:"), 2, 0)
+        filter_layout.addWidget(self.min_duration_spin, 2, 1)
+        filter_layout.addWidget(QLabel("Max Duration:"), 2, 2)
+        filter_layout.addWidget(self.max_duration_spin, 2, 3)
         search_layout.addLayout(filter_layout)
 
         search_group.setLayout(search_layout)
@@ -1601,12 +4782,21 @@ class MainWindow(QMainWindow):
         results_group = QGroupBox("Results")
         results_layout = QVBoxLayout(results_group)
 
-        self.results_scroll = QScrollArea()
-        self.results_scroll.setWidgetResizable(True)
-        self.results_widget = QWidget()
-        self.results_layout = QVBoxLayout(self.results_widget)
-        self.results_scroll.setWidget(self.results_widget)
-        results_layout.addWidget(self.results_scroll)
+        self.thumbnail_loader = ThumbnailLoader(parent=self)
+        self.results_model = SearchResultModel(self.thumbnail_loader, self)
+        self.results_view = QListView()
+        self.results_view.setUniformItemSizes(True)
+        self.results_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.results_delegate = SearchResultDelegate(self.results_view)
+        self.results_delegate.queue_requested.connect(self._queue_result)
+        self.results_view.setItemDelegate(self.results_delegate)
+        self.results_view.setModel(self.results_model)
+        self.results_model.dataChanged.connect(self._prefetch_checked_results)
+        self.results_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.results_view.verticalScrollBar().valueChanged.connect(self._check_prefetch)
+        results_layout.addWidget(self.results_view)
+        self._search_state = None
 
         # Queue controls
         queue_controls = QHBoxLayout()
@@ -1621,6 +4811,9 @@ class MainWindow(QMainWindow):
         # Connect signals
         self.search_btn.clicked.connect(self._handle_input)
         self.search_input.returnPressed.connect(self._handle_input)
+        self.search_input.textChanged.connect(self._handle_offline_search)
+        self.search_input.textChanged.connect(self._handle_live_search_text)
+        self.offline_check.toggled.connect(lambda: self._handle_offline_search(self.search_input.text()))
         self.add_selected_btn.clicked.connect(self._add_selected_to_queue)
         self.clear_results_btn.clicked.connect(self._clear_results)
 
@@ -1633,50 +4826,134 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Please enter a search term or YouTube URL")
             return
 
-        if 'youtube.com' in query or 'youtu.be' in query:
-            self._handle_url(query)
-        else:
+        urls = VideoURL.canonical_many(query)
+        if not urls:
             self._handle_search()
+            return
+
+        playlists = [url for url in urls if VideoURL.is_playlist(url)]
+        videos = [url for url in urls if not VideoURL.is_playlist(url)]
+        if len(videos) == 1:
+            self._handle_url(videos[0])
+        elif videos:
+            self._handle_urls(videos)
+        for url in playlists:
+            self.add_playlist(url)
+        if playlists and not videos:
+            self.search_input.clear()
+
+    def _handle_offline_search(self, text: str):
+        """Search the local video index on every keystroke while offline mode is on"""
+        if not self.offline_check.isChecked():
+            return
+        text = text.strip()
+        self._search_state = None
+        if not text:
+            self.task_runner.cancel('results')
+            self.results_model.clear()
+            return
+
+        self.task_runner.submit(
+            'offline_search',
+            lambda: self.download_manager.video_index.search(text),
+            self.display_search_results,
+            lambda e: self.status_bar.showMessage(f"Offline search error: {str(e)}", 5000),
+            key='results'
+        )
 
     def _handle_url(self, url):
         """Handle YouTube URL"""
-        try:
-            yt = YouTube(url)
-            video_info = {
-                'url': url,
-                'title': yt.title,
-                'duration': str(timedelta(seconds=yt.length)),
-                'thumbnail_url': yt.thumbnail_url,
-                'views': 'N/A',
-                'channel': yt.author,
-                'publish_date': 'N/A'
-            }
-            # Clear existing results and show the video
-            self._clear_results()
-
-            # Create widget with current default quality
-            current_quality = self.default_quality_combo.currentText()
-            widget = SearchResultWidget(
-                video_info=video_info,
-                default_quality=current_quality
-            )
-            self.results_layout.addWidget(widget)
-            self.search_input.clear()
+        self._search_state = None
+        self.status_bar.showMessage("Fetching video info...")
+        self.task_runner.submit(
+            'resolve_url',
+            lambda: self._fetch_video_info(url),
+            self._show_url_result,
+            lambda e: self._show_task_error("Could not process URL", e),
+            key='results'
+        )
 
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Could not process URL: {str(e)}")
+    def _handle_urls(self, urls: List[str]):
+        """Resolve a pasted batch of video URLs, showing each as it arrives"""
+        self._search_state = None
+        self.results_model.clear()
+        self.status_bar.showMessage(f"Fetching info for {len(urls)} videos...")
+        self.task_runner.submit_iter(
+            'resolve_urls',
+            lambda: self._fetch_many_video_info(urls),
+            self._add_result,
+            on_done=lambda: (self.search_input.clear(), self.status_bar.clearMessage()),
+            on_error=lambda e: self._show_task_error("Could not process URLs", e),
+            key='results'
+        )
+
+    def _fetch_many_video_info(self, urls: List[str]):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(self._fetch_video_info, url) for url in urls]
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    ui_log.warning("Skipping pasted URL: %s", e)
+
+    def _fetch_video_info(self, url: str) -> Dict:
+        """Resolve video metadata; runs on a worker thread"""
+        # Resolved through the prefetcher so a following download reuses it
+        url = VideoURL.canonical(url)
+        yt = self.manifest_prefetcher.resolve(url)
+        return {
+            'url': url,
+            'video_id': yt.video_id,
+            'title': yt.title,
+            'duration': str(timedelta(seconds=yt.length)),
+            'thumbnail_url': yt.thumbnail_url,
+            'views': 'N/A',
+            'channel': yt.author,
+            'publish_date': 'N/A'
+        }
+
+    def _show_url_result(self, video_info: Dict):
+        # Replace existing results with the video
+        current_quality = self.default_quality_combo.currentText()
+        self.results_model.set_results([video_info], current_quality)
+        self.search_input.clear()
+        self.status_bar.clearMessage()
+
+    def _show_task_error(self, message: str, error: Exception):
+        self.status_bar.clearMessage()
+        QMessageBox.warning(self, "Error", f"{message}: {str(error)}")
 
-    def _add_result_widget(self, video_info: Dict):
-        """Add a result widget with quality selection"""
-        widget = SearchResultWidget(video_info, self.default_quality_combo.currentText())
-        self.results_layout.addWidget(widget)
+    def _add_result(self, video_info: Dict):
+        """Append a result row with the current default quality"""
+        self.results_model.append_results([video_info], self.default_quality_combo.currentText())
 
     def _clear_results(self):
         """Clear search results"""
-        while self.results_layout.count():
-            item = self.results_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        self.results_model.clear()
+
+    def _queue_result(self, index: QModelIndex):
+        """Add a single result row to the download queue"""
+        try:
+            if not self._queue_result_row(index.row()):
+                self.status_bar.showMessage("Already in queue", 2000)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Could not add to queue: {str(e)}")
+
+    def _queue_result_row(self, row: int) -> bool:
+        """Queue a result row and mark it queued; False if it was already in the queue"""
+        index = self.results_model.index(row)
+        video_info = index.data(SearchResultModel.VideoRole)
+        video_item = VideoQueueItem(
+            url=video_info['url'],
+            title=video_info['title'],
+            duration=video_info['duration'],
+            quality=index.data(SearchResultModel.QualityRole),
+            thumbnail_url=video_info['thumbnail_url']
+        )
+        if not self.smart_queue.add_download(video_item):
+            return False
+        self.results_model.setData(index, True, SearchResultModel.QueuedRole)
+        return True
 
     def _handle_url_download(self):
         """Handle direct URL download"""
@@ -1685,32 +4962,29 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Please enter a YouTube URL")
             return
 
-        try:
-            # Create video info
-            yt = YouTube(url)
-            video_info = {
-                'url': url,
-                'title': yt.title,
-                'duration': str(timedelta(seconds=yt.length)),
-                'thumbnail_url': yt.thumbnail_url
-            }
+        self.url_input.clear()
+        self.task_runner.submit(
+            'resolve_url',
+            lambda: self._fetch_video_info(url),
+            self._queue_url_download,
+            lambda e: self._show_task_error("Could not process URL", e)
+        )
 
-            # Create video item
-            video_item = VideoQueueItem(
-                url=video_info['url'],
-                title=video_info['title'],
-                duration=video_info['duration'],
-                quality=self.download_manager.settings['default_quality'],
-                thumbnail_url=video_info['thumbnail_url']
-            )
+    def _queue_url_download(self, video_info: Dict):
+        # Create video item
+        video_item = VideoQueueItem(
+            url=video_info['url'],
+            title=video_info['title'],
+            duration=video_info['duration'],
+            quality=self.download_manager.settings['default_quality'],
+            thumbnail_url=video_info['thumbnail_url']
+        )
 
-            # Add to queue
-            self.smart_queue.add_download(video_item)
+        # Add to queue
+        if self.smart_queue.add_download(video_item):
             self.status_bar.showMessage(f"Added to queue: {video_item.title}", 2000)
-            self.url_input.clear()
-
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Could not process URL: {str(e)}")
+        else:
+            self.status_bar.showMessage(f"Already in queue: {video_item.title}", 2000)
 
     def setup_search_features(self):
         """Setup the advanced search interface"""
@@ -1751,14 +5025,29 @@ class MainWindow(QMainWindow):
         """Add a playlist for download"""
         try:
             playlist_downloader = PlaylistDownloader(url, self.download_manager)
-            playlist_info = playlist_downloader.fetch_playlist_info()
-
-            # Show playlist dialog
-            dialog = PlaylistSelectionDialog(playlist_info, self)
-            if dialog.exec():
+            resolver = PlaylistResolver(playlist_downloader, self)
+
+            # Show the dialog immediately and fill it as entries resolve
+            dialog = PlaylistSelectionDialog({
+                'title': 'Loading...',
+                'videos': [],
+                'total_videos': 0,
+                'total_duration': 0
+            }, self)
+            resolver.header_ready.connect(dialog.set_playlist_header)
+            resolver.video_resolved.connect(dialog.add_video)
+            resolver.error.connect(lambda e: QMessageBox.warning(dialog, "Playlist Error", e))
+            resolver.finished.connect(resolver.deleteLater)
+            resolver.start()
+
+            accepted = dialog.exec()
+            resolver.cancel()
+            if accepted:
                 selected_videos = dialog.get_selected_videos()
-                for video in selected_videos:
-                    self.smart_queue.add_download(video)
+                skipped = sum(not self.smart_queue.add_download(video) for video in selected_videos)
+                if skipped:
+                    self.status_bar.showMessage(f"Skipped {skipped} videos already in queue", 3000)
+            dialog.deleteLater()
 
         except Exception as e:
             QMessageBox.warning(self, "Playlist Error", str(e))
@@ -1777,33 +5066,29 @@ class MainWindow(QMainWindow):
     def _add_selected_to_queue(self):
         """Add all selected videos to the download queue"""
         try:
-            selected_count = 0
-            for i in range(self.results_layout.count()):
-                widget = self.results_layout.itemAt(i).widget()
-                if isinstance(widget, SearchResultWidget) and widget.select_checkbox.isChecked():
-                    # Create video item
-                    video_item = VideoQueueItem(
-                        url=widget.video_info['url'],
-                        title=widget.video_info['title'],
-                        duration=widget.video_info['duration'],
-                        quality=widget.quality_combo.currentText(),
-                        thumbnail_url=widget.video_info['thumbnail_url']
-                    )
-                    # Add to queue
-                    self.smart_queue.add_download(video_item)
-                    # Update widget
-                    widget.queue_btn.setEnabled(False)
-                    widget.queue_btn.setText("Added to Queue")
-                    widget.select_checkbox.setChecked(False)
+            selected_count = skipped_count = 0
+            for row in self.results_model.checked_rows():
+                if self._queue_result_row(row):
                     selected_count += 1
+                else:
+                    skipped_count += 1
+                self.results_model.setData(
+                    self.results_model.index(row),
+                    Qt.CheckState.Unchecked,
+                    Qt.ItemDataRole.CheckStateRole
+                )
 
-            if selected_count > 0:
+            if skipped_count > 0:
+                self.status_bar.showMessage(
+                    f"Added {selected_count} videos to queue, skipped {skipped_count} already queued", 3000
+                )
+            elif selected_count > 0:
                 self.status_bar.showMessage(f"Added {selected_count} videos to queue", 2000)
             else:
                 QMessageBox.information(self, "No Selection", "Please select videos to add to queue")
 
         except Exception as e:
-            logging.error(f"Error adding selected videos to queue: {str(e)}")
+            ui_log.error("Error adding selected videos to queue: %s", e)
             QMessageBox.warning(self, "Error", f"Could not add videos to queue: {str(e)}")
 
     def create_history_tab(self) -> QWidget:
@@ -1825,6 +5110,7 @@ class MainWindow(QMainWindow):
         download_layout.addWidget(self.download_history_list)
         layout.addWidget(download_group)
 
+        self.update_history()
         return tab
 
     def create_settings_tab(self) -> QWidget:
@@ -1869,34 +5155,183 @@ class MainWindow(QMainWindow):
         query = self.search_input.text().strip()
         if not query:
             return
+        self.live_search_timer.stop()
+        self._start_search(query)
 
-        try:
-            self.search_btn.setEnabled(False)
-            self.status_bar.showMessage("Searching...")
+    def _handle_live_search_text(self, text: str):
+        """Debounce keystrokes in live mode; drop results of the now-stale query"""
+        if not self.live_check.isChecked() or self.offline_check.isChecked():
+            return
+        query = text.strip()
+        if len(query) < 2 or VideoURL.is_youtube(query):
+            self.live_search_timer.stop()
+            return
 
-            filters = {
-                'duration': self.duration_combo.currentText(),
-                'date': self.date_combo.currentText()
-            }
+        self._last_keystroke = time.perf_counter()
+        self.task_runner.cancel('results')
 
-            # Create event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        # Show a locally refined cached prefix right away, if there is one
+        cached = self.search_manager.cached_prefix_results(query, self._current_filters())
+        if cached:
+            self._search_state = None
+            self.results_model.set_results(cached, self.default_quality_combo.currentText())
+            self._record_first_result(cached=True)
 
-            try:
-                # Run search
-                results = self.search_manager.search_videos(query, filters)
-                # Display results
-                self.display_search_results(results)
-                self.search_input.clear()
-            finally:
-                loop.close()
+        self.live_search_timer.start()
 
-        except Exception as e:
-            QMessageBox.warning(self, "Search Error", str(e))
-        finally:
-            self.search_btn.setEnabled(True)
-            self.status_bar.clearMessage()
+    def _run_live_search(self):
+        query = self.search_input.text().strip()
+        if len(query) >= 2:
+            self._start_search(query, live=True)
+
+    def _record_first_result(self, cached: bool = False):
+        """Record keystroke-to-first-result latency for the current live query.
+
+        Cached prefix results go to their own series and leave the keystroke
+        time in place, so the network result that follows is still measured.
+        """
+        if self._last_keystroke is None:
+            return
+        operation = 'live_search_cached_result' if cached else 'live_search_first_result'
+        self.latency_histogram.record(operation, time.perf_counter() - self._last_keystroke)
+        if not cached:
+            self._last_keystroke = None
+        if search_log.isEnabledFor(logging.DEBUG):
+            search_log.debug(
+                "Live search %s p50/p90/p99 (ms): %s", operation, " / ".join(
+                    str(self.latency_histogram.percentile(operation, fraction))
+                    for fraction in (0.5, 0.9, 0.99)
+                )
+            )
+
+    def _start_search(self, query: str, live: bool = False):
+        queries = self.search_manager.expand_queries(query)
+        if not queries:
+            self.status_bar.showMessage("Nothing to search for", 3000)
+            return
+        self.status_bar.showMessage("Searching...")
+
+        filters = self._current_filters()
+        # A single expansion is the cleaned-up query, without braces or separators
+        query = queries[0] if len(queries) == 1 else query
+        self._search_state = {
+            'query': query,
+            'filters': filters,
+            'next_page': 0,
+            'loading': True,
+            'started': False,
+            'live': live
+        }
+
+        if len(queries) > 1:
+            # Fan out: merged results arrive together, no further pages
+            self._search_state['next_page'] = None
+            self.task_runner.submit(
+                'multi_search',
+                lambda: (None, self.search_manager.search_many(queries, filters, record_history=not live)),
+                lambda page: (self._append_search_page(page), self._search_finished()),
+                self._show_search_error,
+                key='results'
+            )
+            return
+
+        # Pages stream in as they are fetched; a newer search or URL lookup supersedes this one
+        self.task_runner.submit_iter(
+            'search',
+            lambda: self.search_manager.search_pages(query, filters, record_history=not live),
+            self._append_search_page,
+            self._search_finished,
+            self._show_search_error,
+            key='results'
+        )
+
+    def _current_filters(self) -> Dict:
+        return {
+            'duration': self.duration_combo.currentText(),
+            'date': self.date_combo.currentText(),
+            'min_views': self.min_views_combo.currentData(),
+            'channel': self.channel_filter_input.text().strip(),
+            'min_duration': self.min_duration_spin.value() * 60,
+            'max_duration': self.max_duration_spin.value() * 60
+        }
+
+    def _load_more_results(self):
+        """Fetch the next page(s) of the current search"""
+        state = self._search_state
+        if not state or state['loading'] or state['next_page'] is None:
+            return
+
+        state['loading'] = True
+        self.status_bar.showMessage("Loading more results...")
+        self.task_runner.submit_iter(
+            'search_page',
+            lambda: self.search_manager.search_pages(
+                state['query'], state['filters'],
+                target_count=self.search_manager.page_size,
+                start_page=state['next_page']
+            ),
+            self._append_search_page,
+            self._search_finished,
+            self._show_search_error,
+            key='results'
+        )
+
+    def _append_search_page(self, page: Tuple[Optional[int], List[Dict]]):
+        next_page, batch = page
+        state = self._search_state
+        if not state['started']:
+            # First page of a new search replaces the old results
+            state['started'] = True
+            self.results_model.clear()
+            if state['live']:
+                self._record_first_result()
+            else:
+                self.search_input.clear()
+        state['next_page'] = next_page
+        self.results_model.append_results(batch, self.default_quality_combo.currentText())
+        if self.results_model.rowCount() == len(batch):
+            self._prefetch_top_results()
+
+    def _prefetch_top_results(self, count: int = 3):
+        """Speculatively resolve manifests for the first few results"""
+        urls = [
+            self.results_model.index(row).data(SearchResultModel.VideoRole)['url']
+            for row in range(min(count, self.results_model.rowCount()))
+        ]
+        self.manifest_prefetcher.prefetch(urls)
+
+    def _prefetch_checked_results(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()):
+        if Qt.ItemDataRole.CheckStateRole not in roles:
+            return
+        urls = [
+            self.results_model.index(row).data(SearchResultModel.VideoRole)['url']
+            for row in range(top_left.row(), bottom_right.row() + 1)
+            if self.results_model.index(row).data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        ]
+        self.manifest_prefetcher.prefetch(urls)
+
+    def _search_finished(self):
+        self._search_state['loading'] = False
+        self.status_bar.clearMessage()
+        if not self._search_state['started']:
+            self.results_model.clear()
+
+    def _check_prefetch(self, value: int):
+        """Prefetch the next page when the results view nears the bottom"""
+        scroll_bar = self.results_view.verticalScrollBar()
+        if scroll_bar.maximum() and value >= scroll_bar.maximum() - 2 * SearchResultDelegate.ROW_HEIGHT:
+            self._load_more_results()
+
+    def _show_search_error(self, error: Exception):
+        live = bool(self._search_state and self._search_state['live'])
+        if self._search_state:
+            self._search_state['loading'] = False
+        if live:
+            # Don't interrupt typing with a dialog
+            self.status_bar.showMessage(f"Search error: {str(error)}", 5000)
+            return
+        self.status_bar.clearMessage()
+        QMessageBox.warning(self, "Search Error", str(error))
 
     async def perform_search(self):
         """Perform YouTube search"""
@@ -1933,31 +5368,23 @@ class MainWindow(QMainWindow):
     def display_search_results(self, results: List[Dict]):
         """Display search results"""
         try:
-            # Clear previous results
-            self._clear_results()
-
-            # Add new results
-            for result in results:
-                # Get current default quality from the combo box
-                current_quality = self.default_quality_combo.currentText()
-
-                # Create widget with the current default quality
-                widget = SearchResultWidget(
-                    video_info=result,
-                    default_quality=current_quality
-                )
-                self.results_layout.addWidget(widget)
-
-            # Add stretch at the end
-            self.results_layout.addStretch()
+            started = time.perf_counter()
+            self.results_model.set_results(results, self.default_quality_combo.currentText())
+            search_log.debug(
+                "Displayed %d search results in %.1f ms",
+                len(results), (time.perf_counter() - started) * 1000
+            )
 
         except Exception as e:
-            logging.error(f"Error displaying search results: {str(e)}")
+            search_log.error("Error displaying search results: %s", e)
             QMessageBox.warning(self, "Error", f"Could not display results: {str(e)}")
 
     def handle_queue_event(self, event_type: str, data):
         """Handle queue manager events"""
         try:
+            if QThread.currentThread() is self.thread():
+                # Queued items need the Downloads tab; the first event always comes from the GUI thread
+                self._ensure_tab(self.create_downloads_tab)
             if event_type == 'queue_updated':
                 self.queue_widget.update_queue_item(data)
                 self.status_bar.showMessage("Queue updated", 2000)
@@ -1968,6 +5395,12 @@ class MainWindow(QMainWindow):
 
             elif event_type == 'download_completed':
                 self.status_bar.showMessage(f"Download completed: {data.title}", 5000)
+                self.download_manager.video_index.add([{
+                    'url': data.url,
+                    'title': data.title,
+                    'duration': data.duration,
+                    'thumbnail_url': data.thumbnail_url
+                }], downloaded=True)
                 self.queue_widget.update_queue_item(data)
                 self.update_history()
 
@@ -2001,6 +5434,10 @@ class MainWindow(QMainWindow):
                 self.status_bar.showMessage(f"Download resumed: {data.title}", 2000)
                 self.queue_widget.update_queue_item(data)
 
+            elif event_type == 'download_waiting':
+                self.status_bar.showMessage(f"Waiting for disk space: {data.title}", 5000)
+                self.queue_widget.update_queue_item(data)
+
             elif event_type == 'progress_updated':
                 self.queue_widget.update_queue_item(data)
 
@@ -2020,7 +5457,7 @@ class MainWindow(QMainWindow):
                 self.queue_widget.update_queue_item(data)
 
         except Exception as e:
-            logging.error(f"Error handling queue event: {str(e)}")
+            ui_log.error("Error handling queue event: %s", e)
             self.status_bar.showMessage(f"Error: {str(e)}", 5000)
 
     def add_to_queue(self, video_info: Dict):
@@ -2036,11 +5473,13 @@ class MainWindow(QMainWindow):
                 playlist_title=video_info.get('playlist_title')
             )
 
-            self.smart_queue.add_download(video_item)
-            self.status_bar.showMessage(f"Added to queue: {video_item.title}", 2000)
+            if self.smart_queue.add_download(video_item):
+                self.status_bar.showMessage(f"Added to queue: {video_item.title}", 2000)
+            else:
+                self.status_bar.showMessage(f"Already in queue: {video_item.title}", 2000)
 
         except Exception as e:
-            logging.error(f"Error adding to queue: {str(e)}")
+            ui_log.error("Error adding to queue: %s", e)
             QMessageBox.warning(self, "Error", f"Could not add to queue: {str(e)}")
 
     def cancel_all_downloads(self):
@@ -2052,7 +5491,7 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("All downloads cancelled", 2000)
 
         except Exception as e:
-            logging.error(f"Error cancelling downloads: {str(e)}")
+            ui_log.error("Error cancelling downloads: %s", e)
             self.status_bar.showMessage(f"Error: {str(e)}", 5000)
 
     def setup_downloads_tab(self):
@@ -2178,24 +5617,28 @@ class MainWindow(QMainWindow):
     def fetch_videos(self):
         urls = self.url_input.text().strip().split('\n')
         for url in urls:
-            try:
-                yt = YouTube(url.strip())
-                video_info = {
-                    'url': url,
-                    'title': yt.title,
-                    'duration': str(timedelta(seconds=yt.length)),
-                    'thumbnail_url': yt.thumbnail_url
-                }
-                download_card = DownloadCard(video_info, self)
-                self.downloads_layout.addWidget(download_card)
-                self.download_manager.add_to_queue(video_info)
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Could not fetch video info: {str(e)}")
+            url = url.strip()
+            if not url:
+                continue
+            self.task_runner.submit(
+                'resolve_url',
+                lambda url=url: self._fetch_video_info(url),
+                self._add_download_card,
+                lambda e: self._show_task_error("Could not fetch video info", e)
+            )
 
         self.url_input.clear()
 
+    def _add_download_card(self, video_info: Dict):
+        download_card = DownloadCard(video_info, self)
+        self.downloads_layout.addWidget(download_card)
+        self.download_manager.add_to_queue(video_info)
+
     def update_history(self):
         """Update history lists"""
+        if not hasattr(self, 'download_history_list'):
+            # History tab not built yet; it fills itself in when it is
+            return
         # Update search history
         self.search_history_list.clear()
         for query in self.search_manager.search_history:
@@ -2224,6 +5667,7 @@ class MainWindow(QMainWindow):
         self.smart_queue.max_retry_attempts = self.max_retries_spin.value()
 
         self.download_manager.settings.update({
+            'live_search': self.live_check.isChecked(),
             'download_path': self.download_path_input.text(),
             'default_quality': self.quality_combo.currentText()
         })
@@ -2241,14 +5685,68 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.smart_queue.cancel_all_downloads()
+            self.cancel_all_downloads()
+            self.task_runner.shutdown()
+            self.thumbnail_loader.shutdown()
+            self.manifest_prefetcher.shutdown()
+            self.download_manager.video_index.close()
+            self.metrics_timer.stop()
+            try:
+                METRICS.write_snapshot(self.metrics_snapshot_path)
+            except OSError as e:
+                ui_log.warning("Metrics snapshot failed: %s", e)
+            METRICS.shutdown()
+            ui_log.info("Operation latency: %s", json.dumps(self.latency_histogram.snapshot()))
             event.accept()
         else:
             event.ignore()
 
 
+def send_profile_command(action: str, port: int) -> int:
+    """Ask a running instance to start/stop profiling through its local endpoint"""
+    import urllib.request
+    try:
+        with open(MetricsRegistry.TOKEN_PATH) as f:
+            token = f.read().strip()
+        request = urllib.request.Request(f"http://127.0.0.1:{port}/profile/{action}", data=b'', method='POST',
+                                         headers={MetricsRegistry.TOKEN_HEADER: token})
+        with urllib.request.urlopen(request, timeout=60) as response:
+            print(response.read().decode('utf-8'))
+        return 0
+    except OSError as e:
+        print(f"Could not reach SYTDL on port {port}: {e}", file=sys.stderr)
+        return 1
+
+
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(prog='SYTDL')
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="report import and init time per component once the window is shown")
+    parser.add_argument('--startup-budget-ms', type=float, default=STARTUP_PROFILE.budget_ms,
+                        help="time-to-window target checked by --startup-profile")
+    parser.add_argument('--log-level', default='',
+                        help="per-subsystem levels, e.g. 'queue=DEBUG,search=WARNING' "
+                             f"(subsystems: {', '.join(LOG_SUBSYSTEMS)})")
+    parser.add_argument('--console-log-level', default='WARNING')
+    parser.add_argument('--trace', metavar='PATH', default=os.environ.get('SYTDL_TRACE'),
+                        help="record spans and write a Chrome trace (chrome://tracing, Perfetto) on exit")
+    parser.add_argument('--profile', choices=('start', 'stop', 'toggle'),
+                        help="start/stop a profiling session in the running instance, then exit")
+    parser.add_argument('--control-port', type=int, default=9464,
+                        help="local metrics/control port of the running instance")
+    args, qt_args = parser.parse_known_args()
+    if args.profile:
+        sys.exit(send_profile_command(args.profile, args.control_port))
+    configure_logging(
+        {**parse_log_levels(os.environ.get(LOG_LEVELS_ENV, '')), **parse_log_levels(args.log_level)},
+        console_level=args.console_log_level.upper()
+    )
+    STARTUP_PROFILE.enabled = args.startup_profile
+    STARTUP_PROFILE.budget_ms = args.startup_budget_ms
+    if args.trace:
+        TRACER.start(args.trace)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle("Fusion")
 
     # Create and set the dark theme palette
@@ -2269,7 +5767,10 @@ def main():
 
     app.setPalette(palette)
 
-    window = MainWindow()
+    with STARTUP_PROFILE.measure("init MainWindow"):
+        window = MainWindow()
+    # kill -USR2 <pid> toggles profiling as well
+    profile_notifier = install_profile_signal(window.toggle_profiling)
     window.show()
     sys.exit(app.exec())
 